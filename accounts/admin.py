@@ -1,5 +1,8 @@
 """Admin registrations for accounts app (departments, titles, profiles)."""
 from django.contrib import admin
+
+from core.tc_kimlik import TCLookupAdminMixin
+
 from .models import Department, Title, Profile
 
 
@@ -18,8 +21,8 @@ class TitleAdmin(admin.ModelAdmin):
 
 
 @admin.register(Profile)
-class ProfileAdmin(admin.ModelAdmin):
-    """Kullanıcı profili yönetimi."""
+class ProfileAdmin(TCLookupAdminMixin, admin.ModelAdmin):
+    """Kullanıcı profili yönetimi (TC araması tek indeksli eşleşmedir)."""
     list_display = ("user", "department", "title", "is_active_employee")
     search_fields = ("user__username", "user__email", "tc_no")
     list_filter = ("department", "title", "is_active_employee")
@@ -1,23 +1,16 @@
 """App configuration for the `accounts` application.
 
-Registers signal handlers during app startup. Import failures are
-logged at debug level rather than re-raised to avoid breaking
-management commands or migrations when signals are not required.
+Registers signal handlers during app startup.
 """
 
-import importlib
-import logging
-
 from django.apps import AppConfig
 
 
 class AccountsConfig(AppConfig):
     """Django AppConfig for `accounts`.
 
-    The `ready` hook imports the module containing signal registrations.
-    If that import fails because the module is absent (e.g. during some
-    management operations), we log the condition at debug level instead
-    of raising an exception.
+    The `ready` hook imports the module containing signal registrations
+    (profile TC normalisation); an import failure stops startup.
     """
 
     default_auto_field = "django.db.models.BigAutoField"
@@ -25,9 +18,4 @@ class AccountsConfig(AppConfig):
     verbose_name = "Kullanıcı Yönetimi"
 
     def ready(self):
-        # Import signals to register handlers. Use importlib so pylint does
-        # not warn about an import-outside-toplevel. Only handle ImportError.
-        try:
-            importlib.import_module(f"{self.name}.signals")
-        except ImportError:
-            logging.getLogger(__name__).debug("accounts.signals not available")
+        from . import signals  # noqa: F401  # pylint: disable=import-outside-toplevel,unused-import
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-18 14:18
+# pylint: disable=invalid-name
+
+"""Normalised, indexed TC kimlik number on `Profile` (see `core.tc_kimlik`).
+
+Existing values are reduced to digits and, when ``TC_HASH_KEY`` is set,
+hashed; invalid numbers are kept (normalised) for HR to correct.
+"""
+
+import core.tc_kimlik
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_tc(apps, schema_editor):
+    """Normalise stored TC numbers and fill tc_hash."""
+    _ = schema_editor
+    core.tc_kimlik.rebuild_tc_index(apps.get_model("accounts", "Profile"))
+
+
+class Migration(migrations.Migration):
+
+    """Migration that adds tc_hash, the tc_no index and backfills both."""
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='tc_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64, verbose_name='TC Özeti'),
+        ),
+        migrations.AlterField(
+            model_name='profile',
+            name='tc_no',
+            field=models.CharField(blank=True, max_length=20, validators=[core.tc_kimlik.validate_tc], verbose_name='TC Kimlik No'),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['tc_no'], name='accounts_profile_tc_no_idx'),
+        ),
+        migrations.RunPython(backfill_tc, migrations.RunPython.noop),
+    ]
@@ -10,6 +10,8 @@ from django.db import models
 from django.db import DatabaseError
 from django.contrib.auth import get_user_model
 
+from core.tc_kimlik import validate_tc
+
 User = get_user_model()
 
 
@@ -58,7 +60,9 @@ class Profile(models.Model):
     gms = models.CharField("GMS", max_length=100, blank=True)
     phone_fixed = models.CharField("Sabit Telefon", max_length=30, blank=True)
     birth_date = models.DateField("Doğum Tarihi", null=True, blank=True)
-    tc_no = models.CharField("TC Kimlik No", max_length=20, blank=True)
+    # digits only (normalised on save), see core.tc_kimlik
+    tc_no = models.CharField("TC Kimlik No", max_length=20, blank=True, validators=[validate_tc])
+    tc_hash = models.CharField("TC Özeti", max_length=64, blank=True, editable=False, db_index=True)
     address = models.TextField("Adres", blank=True)
     photo = models.ImageField(
         "Vesikalık Resim",
@@ -98,6 +102,9 @@ class Profile(models.Model):
     class Meta:
         verbose_name = "Kullanıcı Profili"
         verbose_name_plural = "Kullanıcı Profilleri"
+        indexes = [
+            models.Index(fields=["tc_no"], name="accounts_profile_tc_no_idx"),
+        ]
 
     def __str__(self):
         # ensure we always return a native str for linters and display
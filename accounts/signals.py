@@ -2,6 +2,7 @@
 
 - create Profile when a User is created
 - sync User.is_active when Profile.is_active_employee changes
+- normalise Profile.tc_no and refresh its keyed hash
 """
 import logging
 
@@ -10,6 +11,8 @@ from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 
+from core.tc_kimlik import apply_tc
+
 from .models import Profile
 
 User = get_user_model()
@@ -67,3 +70,10 @@ def sync_user_active(sender, instance, **kwargs):
             logging.getLogger(__name__).debug(
                 "Could not set is_active for new user %r", instance.user
             )
+
+
+@receiver(pre_save, sender=Profile)
+def normalise_profile_tc(sender, instance, **kwargs):
+    """Store `tc_no` as digits only and refresh `tc_hash` (`core.tc_kimlik`)."""
+    _ = sender
+    apply_tc(instance)
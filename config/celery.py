@@ -0,0 +1,17 @@
+"""
+Celery application for the config project.
+
+Workers are started with ``celery -A config worker``. Configuration is read
+from Django settings using the ``CELERY_`` prefix, and tasks are discovered
+from each installed app's ``tasks`` module.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+app = Celery("config")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
@@ -14,6 +14,11 @@ import os
 from pathlib import Path
 from secrets import token_urlsafe
 
+from celery.schedules import crontab
+from django.core.exceptions import ImproperlyConfigured
+
+from config.database import database_from_url, pool_options
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -66,6 +71,8 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    # Periodic task schedules (celery-beat) stored in the database
+    "django_celery_beat",
     # Local apps
     "core",
     "proje",
@@ -105,12 +112,37 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# DATABASE_URL selects the backend (see config/database.py); without it the
+# local SQLite file is used. PostgreSQL production profile:
+# - DB_CONN_MAX_AGE / DB_CONN_HEALTH_CHECKS: persistent connections per thread
+# - DB_POOL=1 (+ DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_TIMEOUT): psycopg's
+#   native pool instead (needs psycopg-pool; disables CONN_MAX_AGE)
+# - DATABASE_REPLICA_URL: read replica used by the read-only list and report
+#   views (proje.replica); in tests it mirrors "default".
+DB_CONNECTION_SETTINGS = {
+    "conn_max_age": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+    "conn_health_checks": os.getenv("DB_CONN_HEALTH_CHECKS", "True").lower()
+    in ("1", "true", "yes"),
+    "pool": pool_options(
+        os.getenv("DB_POOL", "").lower() in ("1", "true", "yes"),
+        min_size=os.getenv("DB_POOL_MIN_SIZE"),
+        max_size=os.getenv("DB_POOL_MAX_SIZE"),
+        timeout=os.getenv("DB_POOL_TIMEOUT"),
+    ),
+}
+
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+    "default": database_from_url(
+        os.getenv("DATABASE_URL", "sqlite:///db.sqlite3"), BASE_DIR, **DB_CONNECTION_SETTINGS
+    ),
 }
+if os.getenv("DATABASE_REPLICA_URL"):
+    DATABASES["replica"] = database_from_url(
+        os.environ["DATABASE_REPLICA_URL"], BASE_DIR, **DB_CONNECTION_SETTINGS
+    )
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+
+DATABASE_ROUTERS = ["proje.replica.ReplicaRouter"]
 
 
 # Password validation
@@ -162,6 +194,135 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = os.getenv("DJANGO_MEDIA_URL", "/media/")
 MEDIA_ROOT = Path(os.getenv("DJANGO_MEDIA_ROOT", BASE_DIR / "media"))
 
+# Cache and session profile
+# - DJANGO_CACHE_URL (or REDIS_URL) = redis://host:6379/1 enables the shared
+#   Redis cache used by every worker process; sessions then use a separate
+#   "sessions" alias (DJANGO_SESSION_CACHE_URL, default: the same Redis
+#   database under its own key prefix). `cache.clear()` flushes the whole
+#   Redis database, so point the sessions alias at another database number
+#   to keep cached sessions across it.
+# - fakeredis://... runs the Redis backend in-process on fakeredis (tests of
+#   the production profile without a server; requires `fakeredis` from
+#   requirements-dev.txt).
+# - unset: per-process LocMem cache and database sessions (development/tests).
+# DJANGO_CACHE_VERSION is the default key version: bump it on deploys that
+# change cached data formats to ignore all previously cached entries.
+CACHE_URL = os.getenv("DJANGO_CACHE_URL") or os.getenv("REDIS_URL", "")
+CACHE_KEY_PREFIX = os.getenv("DJANGO_CACHE_KEY_PREFIX", "syncra")
+CACHE_VERSION = int(os.getenv("DJANGO_CACHE_VERSION", "1"))
+
+
+def _cache_backend(url, key_prefix, timeout=300):
+    """Return a CACHES entry for a redis://, rediss:// or fakeredis:// URL."""
+    options = {}
+    if url.startswith("fakeredis://"):
+        try:
+            from fakeredis import FakeRedisConnection  # pylint: disable=import-outside-toplevel
+        except ImportError as exc:
+            raise ImproperlyConfigured("fakeredis:// cache URLs require fakeredis") from exc
+        url = "redis://" + url[len("fakeredis://"):]
+        options["connection_class"] = FakeRedisConnection
+    return {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": url,
+        "KEY_PREFIX": key_prefix,
+        "VERSION": CACHE_VERSION,
+        "TIMEOUT": timeout,
+        "OPTIONS": options,
+    }
+
+
+if CACHE_URL:
+    CACHES = {
+        "default": _cache_backend(CACHE_URL, CACHE_KEY_PREFIX),
+        "sessions": _cache_backend(
+            os.getenv("DJANGO_SESSION_CACHE_URL") or CACHE_URL,
+            f"{CACHE_KEY_PREFIX}:sessions",
+            timeout=None,
+        ),
+    }
+    # cached_db: reads hit Redis, writes also persist to the database so a
+    # cache flush or Redis restart does not end sessions. "cache" skips the
+    # database entirely.
+    SESSION_ENGINE = os.getenv(
+        "DJANGO_SESSION_ENGINE", "django.contrib.sessions.backends.cached_db"
+    )
+    SESSION_CACHE_ALIAS = "sessions"
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "syncra-default",
+            "VERSION": CACHE_VERSION,
+        }
+    }
+PROJE_FRAGMENT_CACHE_TIMEOUT = int(os.getenv("PROJE_FRAGMENT_CACHE_TIMEOUT", str(60 * 60 * 24)))
+
+# Store document and owner uploads once per distinct content (see
+# proje.storage); blobs are deleted when no row references them any more.
+PROJE_CONTENT_ADDRESSED_UPLOADS = os.getenv(
+    "PROJE_CONTENT_ADDRESSED_UPLOADS", "False"
+).lower() in ("1", "true", "yes")
+
+# Report downloads can be handed off to the front proxy after the view's
+# permission checks: "x-accel-redirect" (nginx, files served from an
+# `internal` location mapped to MEDIA_ROOT under PROJE_DOWNLOAD_ACCEL_PREFIX)
+# or "x-sendfile" (Apache mod_xsendfile, lighttpd). Empty serves from Python.
+PROJE_DOWNLOAD_OFFLOAD = os.getenv("PROJE_DOWNLOAD_OFFLOAD", "").lower() or None
+PROJE_DOWNLOAD_ACCEL_PREFIX = os.getenv("PROJE_DOWNLOAD_ACCEL_PREFIX", "/protected-media/")
+
+# Rows fetched per server-side cursor round trip by the streaming registry
+# exports (proje.exports).
+PROJE_EXPORT_CHUNK_SIZE = int(os.getenv("PROJE_EXPORT_CHUNK_SIZE", "2000"))
+
+# Allowed distance of a unit's ownership share total from 100 before it is
+# flagged as under/over-allocated (proje.shares).
+PROJE_SHARE_TOLERANCE = os.getenv("PROJE_SHARE_TOLERANCE", "0.1")
+
+# Settlement scenarios compared on the project page (proje.settlement): the
+# offered m² per existing m² and an optional price per m² for payouts.
+PROJE_SETTLEMENT_SCENARIOS = [
+    {"name": "1:1", "ratio": 1.0},
+    {"name": "1:1,2", "ratio": 1.2},
+    {"name": "1:1,4", "ratio": 1.4},
+]
+
+# Secret key for the keyed TC kimlik hash (core.tc_kimlik); empty disables
+# tc_hash. Run `manage.py rebuild_tc_index` after setting or rotating it.
+TC_HASH_KEY = os.getenv("TC_HASH_KEY", "")
+
+# S3 uploads (reports). A shared client is built lazily by proje.utils;
+# S3_ENDPOINT_URL may point at a local stand-in such as MinIO or moto.
+REPORTS_S3_BUCKET = os.getenv("REPORTS_S3_BUCKET") or None
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL") or None
+S3_REGION_NAME = os.getenv("S3_REGION_NAME") or None
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "20"))
+S3_MULTIPART_THRESHOLD = int(os.getenv("S3_MULTIPART_THRESHOLD", str(8 * 1024 * 1024)))
+S3_MULTIPART_CHUNKSIZE = int(os.getenv("S3_MULTIPART_CHUNKSIZE", str(8 * 1024 * 1024)))
+S3_MAX_CONCURRENCY = int(os.getenv("S3_MAX_CONCURRENCY", "10"))
+S3_UPLOAD_WORKERS = int(os.getenv("S3_UPLOAD_WORKERS", "4"))
+
+# Celery (background jobs)
+# Without a broker URL tasks run eagerly in-process, which keeps local
+# development and the test suite free of a Redis/RabbitMQ dependency.
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL") or os.getenv("REDIS_URL", "")
+CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND") or None
+CELERY_TASK_ALWAYS_EAGER = (
+    os.getenv("CELERY_TASK_ALWAYS_EAGER", "").lower() in ("1", "true", "yes")
+    or not CELERY_BROKER_URL
+)
+CELERY_TASK_EAGER_PROPAGATES = True
+CELERY_TIMEZONE = TIME_ZONE
+# `celery -A config beat` syncs these entries into django-celery-beat's tables
+CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+CELERY_BEAT_SCHEDULE = {
+    "proje-daily-stats": {
+        "task": "proje.build_daily_stats",
+        # hourly at :05; today's row is upserted, so the dashboard lags <1h
+        "schedule": crontab(minute=5),
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -0,0 +1,30 @@
+"""Management command to re-normalise TC numbers and recompute their hashes.
+
+Run after setting or rotating ``TC_HASH_KEY`` (see `core.tc_kimlik`), or
+after bulk writes that bypassed the save signals.
+"""
+
+# pylint: disable=django-not-configured
+from django.core.management.base import BaseCommand
+
+from accounts.models import Profile
+from core.tc_kimlik import rebuild_tc_index
+from proje.models import Owner
+
+
+class Command(BaseCommand):
+    """Refresh tc_no/tc_hash of owners and profiles."""
+    help = "Normalise Owner/Profile TC numbers and recompute tc_hash with TC_HASH_KEY"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Rows read and updated per batch (default: %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        for model in (Owner, Profile):
+            changed = rebuild_tc_index(model, chunk_size=options["chunk_size"])
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {changed} rows updated\n")
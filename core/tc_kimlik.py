@@ -0,0 +1,108 @@
+"""T.C. kimlik numarası normalisation, validation and indexed lookup.
+
+`Owner.tc_no` (proje) and `Profile.tc_no` (accounts) are stored
+normalised: digits only, so ``"123 456 789-01"`` and ``"12345678901"`` are
+the same indexed value. Forms validate the official checksum through
+`validate_tc`; rows written in bulk are normalised but never rejected here.
+
+When ``settings.TC_HASH_KEY`` is set, each row also stores ``tc_hash``, an
+HMAC-SHA256 of the normalised number. It is indexed and supports exact
+matching without comparing the number itself (e.g. for exports or a later
+encrypted ``tc_no``); ``rebuild_tc_index`` recomputes it after the key is
+set or rotated.
+
+`TCLookupAdminMixin` gives admin changelists an exact-match fast path: a
+search term that is a valid TC number becomes one indexed equality lookup
+instead of the generic ``icontains`` scan over every search field.
+"""
+
+import hashlib
+import hmac
+import unicodedata
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+TC_LENGTH = 11
+
+
+def normalize_tc(value):
+    """Return the ASCII digits of `value` (``""`` for empty input)."""
+    value = unicodedata.normalize("NFKC", str(value or ""))
+    return "".join(char for char in value if char in "0123456789")
+
+
+def is_valid_tc(value):
+    """Return True if `value` normalises to a checksum-valid TC number."""
+    digits = normalize_tc(value)
+    if len(digits) != TC_LENGTH or digits[0] == "0":
+        return False
+    numbers = [int(char) for char in digits]
+    odd = sum(numbers[0:9:2])
+    even = sum(numbers[1:8:2])
+    if (odd * 7 - even) % 10 != numbers[9]:
+        return False
+    return sum(numbers[:10]) % 10 == numbers[10]
+
+
+def validate_tc(value):
+    """Model/form field validator for TC kimlik numbers."""
+    if value and not is_valid_tc(value):
+        raise ValidationError("Geçerli bir T.C. kimlik numarası girin.", code="invalid_tc")
+
+
+def tc_hash(value):
+    """Return the keyed hash of a TC number, or ``""`` without a key/number."""
+    key = getattr(settings, "TC_HASH_KEY", "")
+    digits = normalize_tc(value)
+    if not key or not digits:
+        return ""
+    return hmac.new(key.encode(), digits.encode(), hashlib.sha256).hexdigest()
+
+
+def apply_tc(instance):
+    """Normalise ``instance.tc_no`` and refresh ``instance.tc_hash`` in place."""
+    instance.tc_no = normalize_tc(instance.tc_no)
+    instance.tc_hash = tc_hash(instance.tc_no)
+
+
+def tc_lookup(queryset, term):
+    """Return `queryset` filtered to TC `term`, or None if `term` is no TC number.
+
+    Uses the hash column when a key is configured, the normalised column
+    otherwise; both are indexed.
+    """
+    if not is_valid_tc(term):
+        return None
+    hashed = tc_hash(term)
+    if hashed:
+        return queryset.filter(tc_hash=hashed)
+    return queryset.filter(tc_no=normalize_tc(term))
+
+
+def rebuild_tc_index(model, chunk_size=1000):
+    """Re-normalise ``tc_no`` and recompute ``tc_hash`` for `model`; return rows changed."""
+    changed = []
+    count = 0
+    queryset = model.objects.exclude(tc_no="").only("pk", "tc_no", "tc_hash").order_by("pk")
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        before = (obj.tc_no, obj.tc_hash)
+        apply_tc(obj)
+        if (obj.tc_no, obj.tc_hash) != before:
+            changed.append(obj)
+        if len(changed) >= chunk_size:
+            model.objects.bulk_update(changed, ["tc_no", "tc_hash"])
+            count += len(changed)
+            changed = []
+    model.objects.bulk_update(changed, ["tc_no", "tc_hash"])
+    return count + len(changed)
+
+
+class TCLookupAdminMixin:
+    """Answer admin searches for a TC number with one exact indexed lookup."""
+
+    def get_search_results(self, request, queryset, search_term):
+        found = tc_lookup(queryset, search_term.strip())
+        if found is not None:
+            return found, False
+        return super().get_search_results(request, queryset, search_term)
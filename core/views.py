@@ -1,14 +1,19 @@
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, redirect, render
 
+from proje.replica import replica_reads
+from proje.stats import dashboard_context
+
 
 def index(request):
     return redirect("core:dashboard")
 
 
 @login_required
+@replica_reads
 def dashboard(request):
-    return render(request, "dashboard.html")
+    # KPIs come from the daily snapshot table, see proje.stats
+    return render(request, "dashboard.html", dashboard_context(request.user))
 
 
 @login_required
@@ -7,33 +7,99 @@ and includes styling hooks for AdminLTE/Bootstrap integration.
 
 from django import forms
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
 # `Group` is not referenced directly in this module; kept import removed.
-from django.shortcuts import render, redirect
+from django.shortcuts import get_object_or_404, render, redirect
 from django.template.response import TemplateResponse
-
-from proje.models import Agreement, Document, Owner, Ownership, Project, Unit
+from django.urls import path
+
+from core.tc_kimlik import TCLookupAdminMixin
+
+from proje.models import (
+    Agreement,
+    Document,
+    Owner,
+    OwnerAssignJob,
+    Ownership,
+    Project,
+    Unit,
+)
 
 from .admin_helpers import (
     AdminBootstrapMixin,
-    perform_owner_assignment,
+    SearchIndexAdminMixin,
+    ShareStatusFilter,
+    enqueue_owner_assignment,
+    enqueue_registry_import,
     process_bulk_document_upload,
     format_file_link_html,
     format_preview_html,
 )
-from .admin_forms import GroupAssignActionForm, DocumentBulkUploadForm
+from .admin_forms import GroupAssignActionForm, DocumentBulkUploadForm, RegistryImportForm
+from .shares import recompute_share_totals
 
 
 @admin.register(Project)
 class ProjectAdmin(AdminBootstrapMixin, admin.ModelAdmin):
-    """Admin for `Project` model: list/filters and basic search configuration."""
-    list_display = ("code", "name", "status", "manager")
+    """Admin for `Project` model: list/filters, search and the registry import page."""
+    list_display = (
+        "code",
+        "name",
+        "status",
+        "manager",
+        "unit_count",
+        "owner_count",
+        "document_count",
+    )
     search_fields = ("code", "name", "location")
     list_filter = ("status", "type")
+    readonly_fields = (
+        "unit_count",
+        "owner_count",
+        "document_count",
+        "unit_beklemede_count",
+        "unit_saglandi_count",
+        "unit_istemiyor_count",
+        "unit_ulasilamadi_count",
+    )
+
+    def get_urls(self):
+        """Add the registry (CSV/XLSX) import page to the Project admin URLs."""
+        urls = [
+            path(
+                "import-registry/",
+                self.admin_site.admin_view(self.import_registry_view),
+                name="proje_project_import_registry",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def import_registry_view(self, request):
+        """Upload a land-registry file and import it (`proje.registry_import`)."""
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+        form = RegistryImportForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            enqueue_registry_import(request, form, self)
+            return redirect("admin:proje_project_changelist")
+        context = dict(
+            self.admin_site.each_context(request),
+            title="Tapu Kayıtlarını İçe Aktar",
+            form=form,
+            opts=self.model._meta,  # pylint: disable=protected-access
+        )
+        return TemplateResponse(request, "admin/proje/registry_import.html", context)
 
 
 @admin.register(Owner)
-class OwnerAdmin(AdminBootstrapMixin, admin.ModelAdmin):
-    """Admin for `Owner` model including bulk group-assign actions."""
+class OwnerAdmin(
+    TCLookupAdminMixin, SearchIndexAdminMixin, AdminBootstrapMixin, admin.ModelAdmin
+):
+    """Admin for `Owner` model including bulk group-assign actions.
+
+    A search for a valid TC number is a single exact lookup
+    (`core.tc_kimlik`); other terms use the folded search index.
+    """
     list_display = ("first_name", "last_name", "tc_no", "phone")
     search_fields = ("first_name", "last_name", "tc_no")
     actions = ["assign_group_to_owner_users"]
@@ -45,16 +111,16 @@ class OwnerAdmin(AdminBootstrapMixin, admin.ModelAdmin):
     def assign_group_to_owner_users(self, request, queryset):
         """Admin action with confirmation form. Shows a confirmation page where admin
         can choose the Group, toggle dry-run, and optionally provide a report file path.
-        On confirmation the selected owners are matched by `email` to Users and assigned.
+        On confirmation a background job is queued that matches the selected owners
+        by `email` to Users and assigns them; the admin is redirected to its status page.
         """
-        # If this is the confirmation POST, perform assignment
+        # If this is the confirmation POST, queue the assignment job
         if request.method == "POST" and request.POST.get("confirm"):
             # Delegate POST processing to helper to reduce ModelAdmin complexity
-            result = perform_owner_assignment(request, queryset, self)
-            if result is None:
+            status_url = enqueue_owner_assignment(request, queryset, self)
+            if status_url is None:
                 return None
-            template_name, context = result
-            return render(request, template_name, context)
+            return redirect(status_url)
 
         # Otherwise render confirmation page
         context = {
@@ -65,13 +131,70 @@ class OwnerAdmin(AdminBootstrapMixin, admin.ModelAdmin):
         }
         return render(request, "admin/proje/owner_assign_confirm.html", context)
 
+    def get_urls(self):
+        """Add the assignment job status page to the Owner admin URLs."""
+        urls = [
+            path(
+                "assign-jobs/<int:job_id>/",
+                self.admin_site.admin_view(self.assign_job_status_view),
+                name="proje_owner_assign_job",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def assign_job_status_view(self, request, job_id):
+        """Show progress, row counts and the report link of an assignment job."""
+        job = get_object_or_404(OwnerAssignJob.objects.select_related("group"), pk=job_id)
+        context = dict(
+            self.admin_site.each_context(request),
+            title=f"Assignment job #{job.pk}",
+            job=job,
+            opts=self.model._meta,  # pylint: disable=protected-access
+        )
+        return TemplateResponse(request, "admin/proje/owner_assign_job.html", context)
+
+
+@admin.register(OwnerAssignJob)
+class OwnerAssignJobAdmin(AdminBootstrapMixin, admin.ModelAdmin):
+    """Read-only history of background owner group assignment jobs."""
+    list_display = ("id", "group", "status", "processed", "total", "assigned", "created")
+    list_filter = ("status",)
+    fields = readonly_fields = (
+        "created_by",
+        "group",
+        "dry_run",
+        "status",
+        "total",
+        "processed",
+        "assigned",
+        "report_file",
+        "report_file_url",
+        "report_s3_url",
+        "error",
+        "created",
+        "started_at",
+        "finished_at",
+    )
+
+    def has_add_permission(self, request):
+        return False
+
 
 @admin.register(Unit)
-class UnitAdmin(AdminBootstrapMixin, admin.ModelAdmin):
-    """Admin for `Unit` model: list, filters and search configuration."""
-    list_display = ("project", "ada", "parsel", "type", "agreement_status")
-    list_filter = ("type", "agreement_status")
+class UnitAdmin(SearchIndexAdminMixin, AdminBootstrapMixin, admin.ModelAdmin):
+    """Admin for `Unit` model: list, filters (incl. share status) and search."""
+    list_display = ("project", "ada", "parsel", "type", "agreement_status", "share_total")
+    list_filter = ("type", "agreement_status", ShareStatusFilter)
     search_fields = ("ada", "parsel", "address")
+    actions = ["recompute_share_totals"]
+
+    @admin.action(description="Hisse toplamlarını yeniden hesapla")
+    def recompute_share_totals(self, request, queryset):
+        """Fix cached share totals of the selected units (`proje.shares`)."""
+        fixed = recompute_share_totals(queryset)
+        self.message_user(
+            request, f"{len(fixed)} bağımsız bölümün hisse toplamı düzeltildi"
+        )
 
 
 class DocumentInline(AdminBootstrapMixin, admin.TabularInline):
@@ -120,7 +243,7 @@ class AgreementAdmin(AdminBootstrapMixin, admin.ModelAdmin):
 
 
 @admin.register(Document)
-class DocumentAdmin(AdminBootstrapMixin, admin.ModelAdmin):
+class DocumentAdmin(SearchIndexAdminMixin, AdminBootstrapMixin, admin.ModelAdmin):
     """Admin for `Document` model with preview and bulk upload support."""
     list_display = (
         "label",
@@ -130,8 +253,16 @@ class DocumentAdmin(AdminBootstrapMixin, admin.ModelAdmin):
         "uploaded_by",
         "uploaded_at",
     )
-    readonly_fields = ("uploaded_at", "preview")
-    search_fields = ("label", "file__icontains")
+    readonly_fields = (
+        "uploaded_at",
+        "preview",
+        "size",
+        "content_type",
+        "width",
+        "height",
+        "sha256",
+    )
+    search_fields = ("label", "file")
     fields = (
         "label",
         "preview",
@@ -140,6 +271,10 @@ class DocumentAdmin(AdminBootstrapMixin, admin.ModelAdmin):
         "unit",
         "uploaded_by",
         "uploaded_at",
+        "size",
+        "content_type",
+        ("width", "height"),
+        "sha256",
     )
 
     def file_link(self, obj):
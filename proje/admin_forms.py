@@ -5,21 +5,21 @@ reused and unit-tested more easily.
 """
 
 from django import forms
+from django.contrib.admin.helpers import ActionForm
 from django.contrib.auth.models import Group
 
-from proje.models import Document
+from proje.models import Document, Project
 
 
-class GroupAssignActionForm(forms.Form):
+class GroupAssignActionForm(ActionForm):
     """Action form used by `OwnerAdmin.assign_group_to_owner_users`.
 
     Allows picking a `Group`, toggling S3 upload and providing an optional
-    report file path.
+    report file path. Extends the admin `ActionForm` so the changelist gets
+    the `action` and `select_across` fields it dispatches on.
     """
 
     group = forms.ModelChoiceField(queryset=Group.objects.all(), required=True)
-    # Admin expects an 'action' field to exist; provide an empty ChoiceField
-    action = forms.ChoiceField(choices=(), required=False)
     upload_s3 = forms.BooleanField(required=False, initial=False)
     s3_bucket = forms.CharField(required=False)
     s3_public = forms.BooleanField(required=False, initial=False)
@@ -65,3 +65,30 @@ class DocumentBulkUploadForm(forms.ModelForm):
             css = widget.attrs.get("class", "")
             classes = (css + " form-control").strip()
             widget.attrs["class"] = classes
+
+
+class RegistryImportForm(forms.Form):
+    """Upload form of the `ProjectAdmin` registry import page."""
+
+    project = forms.ModelChoiceField(queryset=Project.objects.order_by("code"), label="Proje")
+    file = forms.FileField(
+        label="Dosya",
+        help_text="CSV veya XLSX; ilk satır sütun başlıkları (ada, parsel, ad, soyad, tc, hisse ...).",
+    )
+    dry_run = forms.BooleanField(
+        required=False, label="Sadece doğrula", help_text="Hiçbir kayıt yazılmaz."
+    )
+
+    def clean_file(self):
+        """Accept only .csv and .xlsx uploads."""
+        upload = self.cleaned_data["file"]
+        if not upload.name.lower().endswith((".csv", ".xlsx")):
+            raise forms.ValidationError("Yalnızca .csv ve .xlsx dosyaları desteklenir.")
+        return upload
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name, field in self.fields.items():
+            if name != "dry_run":
+                css = field.widget.attrs.get("class", "")
+                field.widget.attrs["class"] = (css + " form-control").strip()
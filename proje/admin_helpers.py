@@ -5,23 +5,38 @@ for example widget class injection and report/upload helpers used by
 bulk actions.
 """
 
-import csv
-import json
+import uuid
 from pathlib import Path
 
 from django.conf import settings
 from django import forms
-from django.contrib import messages
+from django.contrib import admin, messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
+from django.db import transaction
+from django.db.models.functions import Lower
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.html import format_html
 
 from botocore.exceptions import BotoCoreError, ClientError
+from celery import current_app
 
-from proje.models import Document
+from proje.models import Owner, OwnerAssignJob
 
-from .utils import upload_file_to_s3, generate_report_path
+from .ingest import ingest_documents
+from .reports import REPORT_FORMATS, peek_rows, resolve_report_path, write_report
+from .search import search
+from .shares import SHARE_STATUSES, share_status_filter
+from .thumbnails import get_thumbnail_urls, is_image_name, thumbnail_sizes
+from .utils import chunked, upload_file_to_s3, generate_report_path
+
+# Owners resolved per query/insert batch in `build_owner_assign_report`.
+OWNER_ASSIGN_CHUNK_SIZE = 500
+# Columns of owner assignment CSV reports.
+OWNER_REPORT_FIELDS = ["ident", "user", "group", "status"]
+# Rows shown on the admin result page; the full report is in the file.
+OWNER_REPORT_PREVIEW_ROWS = 200
 
 
 class AdminBootstrapMixin:
@@ -71,32 +86,54 @@ class AdminBootstrapMixin:
         return form
 
 
-def save_report_rows(report_rows, report_file, report_format="csv"):
-    """Write `report_rows` to `report_file` (absolute or relative).
+class SearchIndexAdminMixin:
+    """Serve the changelist search box from the folded search index.
 
-    If `report_file` is relative, it will be placed under `settings.MEDIA_ROOT`
-    when available. Returns a `pathlib.Path` pointing to the written file.
+    Replaces the default per-field ``icontains`` scans of `search_fields`
+    with `proje.search.search`; `search_fields` must still be set for the
+    admin to show the search box.
     """
-    target_path = Path(report_file)
-    if not target_path.is_absolute():
-        media_root = getattr(settings, "MEDIA_ROOT", None)
-        if media_root:
-            target_path = Path(media_root) / report_file
-        else:
-            target_path = Path(report_file)
-
-    target_path.parent.mkdir(parents=True, exist_ok=True)
-    if report_format == "csv":
-        keys = ["ident", "user", "group", "status"]
-        with target_path.open("w", newline="", encoding="utf-8") as outfh:
-            writer = csv.DictWriter(outfh, fieldnames=keys)
-            writer.writeheader()
-            for r in report_rows:
-                writer.writerow({k: r.get(k, "") for k in keys})
-    else:
-        with target_path.open("w", encoding="utf-8") as outfh:
-            json.dump(report_rows, outfh, ensure_ascii=False, indent=2)
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return search(queryset, search_term), False
+
+
+class ShareStatusFilter(admin.SimpleListFilter):
+    """Changelist filter on the cached ownership share total of units.
+
+    Statuses and tolerance come from `proje.shares`; the filter reads the
+    indexed `Unit.share_total` column, so it costs no aggregate.
+    """
+
+    title = "Hisse Durumu"
+    parameter_name = "share_status"
+
+    def lookups(self, request, model_admin):
+        return SHARE_STATUSES
+
+    def queryset(self, request, queryset):
+        if self.value() in dict(SHARE_STATUSES):
+            return queryset.filter(share_status_filter(self.value()))
+        return queryset
+
+
+def save_report_rows(report_rows, report_file, report_format="csv", compress=False):
+    """Write `report_rows` to `report_file` (absolute or relative).
+
+    `report_rows` may be any iterable, including a generator; rows are
+    streamed to disk as they are consumed. If `report_file` is relative, it
+    will be placed under `settings.MEDIA_ROOT` when available. Returns a
+    `pathlib.Path` pointing to the written file.
+    """
+    target_path, _count = write_report(
+        report_rows,
+        report_file,
+        report_format,
+        fieldnames=OWNER_REPORT_FIELDS,
+        compress=compress,
+    )
     return target_path
 
 
@@ -114,54 +151,143 @@ def upload_report_to_s3(target_path, bucket=None, public=False):
         return None
 
 
+def iter_owner_assign_report(owners_queryset, group, dry_run=False):
+    """Yield owner->user assignment report rows, assigning chunk by chunk.
+
+    Owners are processed in chunks of `OWNER_ASSIGN_CHUNK_SIZE`: each chunk
+    resolves its users with one case-insensitive `IN` query and, unless
+    `dry_run`, writes the memberships with one
+    `bulk_create(ignore_conflicts=True)` on the `User.groups` through table
+    (so no `m2m_changed` signals are sent). Rows of a chunk are yielded
+    once its memberships are written.
+    """
+    if hasattr(owners_queryset, "iterator"):
+        owners_queryset = owners_queryset.iterator(chunk_size=OWNER_ASSIGN_CHUNK_SIZE)
+
+    for owners in chunked(owners_queryset, OWNER_ASSIGN_CHUNK_SIZE):
+        rows, user_ids = _owner_assign_chunk_rows(owners, group, dry_run)
+        if user_ids and not dry_run:
+            _add_users_to_group(group, user_ids)
+        yield from rows
+
+
 def build_owner_assign_report(owners_queryset, group, dry_run=False):
     """Build report rows for owner->user assignment and perform assignment.
 
     Given an iterable of `Owner` instances and a `Group` instance, return a
     tuple `(report_rows, assigned_count)`. If `dry_run` is False, users will
-    be added to the group's `user_set`; when True, no database changes are
-    performed and the helper only reports what would happen.
+    be added to the group; when True, no database changes are performed and
+    the helper only reports what would happen. See
+    `iter_owner_assign_report` for a streaming variant.
     """
-    # Helper split into smaller functions to reduce local variable pressure
-    # and improve readability.
-
-    def _owner_ident(o):
-        return (o.email or "").strip()
-
-    def _find_user_by_ident(ident):
-        return get_user_model().objects.filter(email__iexact=ident).first()
-
-    def _row(ident, user_obj, grp, status):
-        return {
-            "ident": ident,
-            "user": str(user_obj) if user_obj is not None else "",
-            "group": str(grp) if grp is not None else "",
-            "status": status,
-        }
-
-    report_rows = []
-    assigned = 0
-    for owner in owners_queryset:
-        ident = _owner_ident(owner)
+    report_rows = list(iter_owner_assign_report(owners_queryset, group, dry_run=dry_run))
+    assigned = sum(1 for r in report_rows if r["status"] == "assigned")
+    return report_rows, assigned
+
+
+class OwnerAssignTally:
+    """Pass-through iterator over report rows that keeps running totals.
+
+    Keeps the first `preview_limit` rows for display and counts all rows
+    and `assigned` rows, so a report can be streamed to disk while the
+    admin result page still shows a bounded preview.
+    """
+
+    def __init__(
+        self,
+        rows,
+        preview_limit=OWNER_REPORT_PREVIEW_ROWS,
+        on_progress=None,
+        progress_every=OWNER_ASSIGN_CHUNK_SIZE,
+    ):
+        self._rows = rows
+        self.preview_limit = preview_limit
+        self.preview = []
+        self.total = 0
+        self.assigned = 0
+        self._on_progress = on_progress
+        self._progress_every = max(1, progress_every)
+
+    def __iter__(self):
+        for row in self._rows:
+            self.total += 1
+            if row.get("status") == "assigned":
+                self.assigned += 1
+            if len(self.preview) < self.preview_limit:
+                self.preview.append(row)
+            if self._on_progress and self.total % self._progress_every == 0:
+                self._on_progress(self)
+            yield row
+
+    def consume(self):
+        """Exhaust the remaining rows (when no report is written)."""
+        for _row in self:
+            pass
+
+
+def _assign_row(ident, user_obj, grp, status):
+    return {
+        "ident": ident,
+        "user": str(user_obj) if user_obj is not None else "",
+        "group": str(grp) if grp is not None else "",
+        "status": status,
+    }
+
+
+def _users_by_email(emails):
+    """Return a dict mapping lowercased e-mail to the first matching user.
+
+    "First" follows primary key order, matching the previous per-owner
+    `filter(email__iexact=...).first()` lookup.
+    """
+    if not emails:
+        return {}
+    users = (
+        get_user_model()
+        .objects.annotate(email_lower=Lower("email"))
+        .filter(email_lower__in=emails)
+        .order_by("pk")
+    )
+    found = {}
+    for user in users:
+        found.setdefault(user.email_lower, user)
+    return found
+
+
+def _owner_assign_chunk_rows(owners, group, dry_run):
+    """Return `(rows, user_ids)` for one chunk of owners.
+
+    `user_ids` holds the distinct users that should join `group`.
+    """
+    idents = [(owner, (owner.email or "").strip()) for owner in owners]
+    users = _users_by_email({ident.lower() for _, ident in idents if ident})
+
+    rows = []
+    user_ids = set()
+    for owner, ident in idents:
         if not ident:
-            report_rows.append(_row(str(owner), None, None, "no_email"))
+            rows.append(_assign_row(str(owner), None, None, "no_email"))
             continue
-
-        user = _find_user_by_ident(ident)
+        user = users.get(ident.lower())
         if not user:
-            report_rows.append(_row(ident, None, None, "not_found"))
+            rows.append(_assign_row(ident, None, None, "not_found"))
             continue
-
         if dry_run:
-            report_rows.append(_row(ident, user, group, "would_assign"))
+            rows.append(_assign_row(ident, user, group, "would_assign"))
             continue
-
-        # perform the assignment and record it
-        group.user_set.add(user)
-        assigned += 1
-        report_rows.append(_row(ident, user, group, "assigned"))
-
-    return report_rows, assigned
+        user_ids.add(user.pk)
+        rows.append(_assign_row(ident, user, group, "assigned"))
+    return rows, user_ids
+
+
+def _add_users_to_group(group, user_ids):
+    """Insert `user_ids` into `group` with a single conflict-tolerant insert."""
+    through = get_user_model().groups.through
+    with transaction.atomic():
+        through.objects.bulk_create(
+            [through(user_id=pk, group_id=group.pk) for pk in sorted(user_ids)],
+            ignore_conflicts=True,
+        )
 
 
 def prepare_owner_report(
@@ -170,11 +296,14 @@ def prepare_owner_report(
     report_format,
     request_user,
     upload_options=None,
+    compress=False,
 ):
     """Prepare, write and optionally upload an owner assignment report.
 
-    `upload_options` is an optional dict with keys `upload_s3`, `s3_bucket`
-    and `s3_public` to control S3 upload behavior.
+    `report_rows` may be a list or an iterator; rows are streamed into the
+    report file. `upload_options` is an optional dict with keys `upload_s3`,
+    `s3_bucket` and `s3_public` to control S3 upload behavior. When
+    `compress` is True the report is gzip-compressed.
 
     Returns `(target_path, report_file, report_file_url, report_s3_url)`.
     """
@@ -187,8 +316,10 @@ def prepare_owner_report(
     report_file_url = None
     report_s3_url = None
 
+    has_rows, report_rows = peek_rows(report_rows)
+
     # Auto-generate filename when missing. Include username when available.
-    if not report_file and report_rows:
+    if not report_file and has_rows:
         report_file = generate_report_path(
             prefix="reports/owners_assign",
             ext=report_format,
@@ -196,7 +327,12 @@ def prepare_owner_report(
         )
 
     if report_file:
-        target_path = save_report_rows(report_rows, report_file, report_format)
+        target_path = save_report_rows(
+            report_rows, report_file, report_format, compress=compress
+        )
+        if target_path.name != Path(report_file).name:
+            # the sink appended a compression suffix
+            report_file = str(Path(report_file).with_name(target_path.name))
 
         if upload_s3:
             bucket = s3_bucket or getattr(settings, "REPORTS_S3_BUCKET", None)
@@ -221,20 +357,29 @@ def prepare_owner_report(
 def create_documents_from_files(files, labels, project, unit, uploaded_by):
     """Create Document instances from uploaded `files` and parallel `labels` list.
 
-    Returns a list of created `Document` instances.
+    Files are written to storage concurrently and inserted in one batch by
+    `proje.ingest.ingest_documents`. Returns a list of created `Document`
+    instances.
     """
-    created = []
-    for idx, f in enumerate(files):
-        label = labels[idx] if idx < len(labels) else ""
-        doc = Document.objects.create(
-            project=project,
-            unit=unit,
-            file=f,
-            label=label,
-            uploaded_by=uploaded_by,
-        )
-        created.append(doc)
-    return created
+    return ingest_documents(
+        files, labels, project=project, unit=unit, uploaded_by=uploaded_by
+    )
+
+
+def _document_meta(obj):
+    """Return `(size, uploader)` display values for a `Document`-like object.
+
+    The size comes from the stored `size` column, never from the storage.
+    """
+    size = getattr(obj, "size", None)
+    try:
+        if getattr(getattr(obj, "uploaded_by", None), "get_full_name", None):
+            uploader = obj.uploaded_by.get_full_name()
+        else:
+            uploader = getattr(obj.uploaded_by, "username", None)
+    except AttributeError:
+        uploader = None
+    return size, uploader
 
 
 def format_file_link_html(obj):
@@ -243,60 +388,64 @@ def format_file_link_html(obj):
     This small helper centralizes file-link rendering used by both inlines
     and list displays in the admin. It intentionally tolerates missing
     attributes and returns a safe HTML string via `format_html` when a
-    URL is available.
+    URL is available. Images carry their large WebP thumbnail in
+    `data-thumb` for hover previews.
     """
     if not obj or not getattr(obj, "file", None):
         return "-"
     url = getattr(obj.file, "url", None)
     name = getattr(obj, "label", None) or str(getattr(obj.file, "name", "")).rsplit("/", 1)[-1]
-    size = None
-    uploader = None
-    try:
-        size = obj.file.size
-    except (AttributeError, OSError):
-        size = None
-    try:
-        if getattr(getattr(obj, "uploaded_by", None), "get_full_name", None):
-            uploader = obj.uploaded_by.get_full_name()
-        else:
-            uploader = getattr(obj.uploaded_by, "username", None)
-    except AttributeError:
-        uploader = None
+    size, uploader = _document_meta(obj)
     if url:
+        thumb = get_thumbnail_urls(obj.file).get("lg", "")
         tpl = (
-            '<a href="{}" class="doc-thumb-link" data-full="{}" '
+            '<a href="{}" class="doc-thumb-link" data-full="{}" data-thumb="{}" '
             'data-size="{}" data-uploader="{}" target="_blank">{}</a>'
         )
-        return format_html(tpl, url, url, size or "", uploader or "", name)
+        return format_html(tpl, url, url, thumb, size or "", uploader or "", name)
     return name
 
 
+def _thumbnail_srcset(thumbs, fallback):
+    """Return `(src, srcset)` for the configured thumbnail sizes.
+
+    The smallest derivative is the `src`; the next larger ones become the
+    2x/3x... candidates, so any `PROJE_THUMBNAIL_SIZES` mapping works.
+    """
+    sizes = thumbnail_sizes()
+    keys = sorted((key for key in thumbs if key in sizes), key=sizes.get)
+    if not keys:
+        return fallback, ""
+    srcset = ", ".join(f"{thumbs[key]} {density}x" for density, key in enumerate(keys[:3], start=1))
+    return thumbs[keys[0]], srcset
+
+
 def format_preview_html(obj):
-    """Return HTML for preview (image thumbnail or link) for a Document-like obj."""
+    """Return HTML for preview (image thumbnail or link) for a Document-like obj.
+
+    Images are shown through their WebP thumbnails (see
+    `proje.thumbnails`); the original is only used when no thumbnail can be
+    derived.
+    """
     if not obj or not getattr(obj, "file", None):
         return "-"
     url = getattr(obj.file, "url", None)
     if url:
-        fname = str(getattr(obj.file, "name", "")).lower()
-        if fname.endswith((".png", ".jpg", ".jpeg", ".gif", ".webp")):
-            size = None
-            uploader = None
-            try:
-                size = obj.file.size
-            except (AttributeError, OSError):
-                size = None
-            try:
-                if getattr(getattr(obj, "uploaded_by", None), "get_full_name", None):
-                    uploader = obj.uploaded_by.get_full_name()
-                else:
-                    uploader = getattr(obj.uploaded_by, "username", None)
-            except AttributeError:
-                uploader = None
+        content_type = getattr(obj, "content_type", "")
+        if (
+            content_type.startswith("image/")
+            if content_type
+            else is_image_name(getattr(obj.file, "name", ""))
+        ):
+            size, uploader = _document_meta(obj)
+            thumbs = get_thumbnail_urls(obj.file)
+            src, srcset = _thumbnail_srcset(thumbs, url)
             tpl = (
                 '<a href="{}" class="doc-thumb-link" data-full="{}" '
-                'data-size="{}" data-uploader="{}"><img src="{}" class="doc-thumb"/></a>'
+                'data-size="{}" data-uploader="{}"><img src="{}" srcset="{}" '
+                'class="doc-thumb" loading="lazy"/></a>'
             )
-            return format_html(tpl, url, url, size or "", uploader or "", url)
+            return format_html(tpl, url, url, size or "", uploader or "", src, srcset)
     name = getattr(obj, "label", None) or str(getattr(obj.file, "name", "")).rsplit("/", 1)[-1]
     if getattr(getattr(obj, "file", None), "url", None):
         return format_html('<a href="{}" target="_blank">{}</a>', getattr(obj.file, "url"), name)
@@ -343,12 +492,15 @@ def parse_owner_assign_post(post_data):
 
     Accepts a mapping with `.get()` (e.g. `request.POST`) and returns a dict with
     keys: ``group_pk``, ``dry_run``, ``report_file``, ``report_format``,
-    ``upload_s3``, ``s3_bucket``, ``s3_public``.
+    ``report_compress``, ``upload_s3``, ``s3_bucket``, ``s3_public``.
     """
     group_pk = post_data.get("group")
     dry_run = post_data.get("dry_run") == "on"
     report_file = post_data.get("report_file") or ""
     report_format = post_data.get("report_format") or "csv"
+    if report_format not in REPORT_FORMATS:
+        report_format = "csv"
+    report_compress = post_data.get("report_compress") == "on"
     upload_s3 = post_data.get("upload_s3") == "on"
     s3_bucket = post_data.get("s3_bucket") or None
     s3_public = post_data.get("s3_public") == "on"
@@ -358,6 +510,7 @@ def parse_owner_assign_post(post_data):
         "dry_run": dry_run,
         "report_file": report_file,
         "report_format": report_format,
+        "report_compress": report_compress,
         "upload_s3": upload_s3,
         "s3_bucket": s3_bucket,
         "s3_public": s3_public,
@@ -367,13 +520,20 @@ def parse_owner_assign_post(post_data):
 def build_owner_assign_context(model_meta, report_info, group, dry_run, media_url):
     """Return context dict for the owner-assign result template.
 
-    `report_info` is a dict containing keys: ``report_file``, ``report_file_url``,
+    `report_info` is a dict containing keys: ``report_rows`` (preview rows),
+    ``report_row_count``, ``report_file``, ``report_file_url``,
     ``report_s3_url`` and ``report_format``. `model_meta` is typically
     `self.model._meta` from the calling ModelAdmin.
     """
+    report_rows = report_info.get("report_rows")
+    row_count = report_info.get("report_row_count")
+    if row_count is None and report_rows is not None:
+        row_count = len(report_rows)
     return {
         "opts": model_meta,
-        "report_rows": report_info.get("report_rows"),
+        "report_rows": report_rows,
+        "report_row_count": row_count,
+        "report_truncated": bool(report_rows is not None and row_count > len(report_rows)),
         "report_file": report_info.get("report_file"),
         "report_file_url": report_info.get("report_file_url"),
         "report_s3_url": report_info.get("report_s3_url"),
@@ -399,14 +559,14 @@ def perform_owner_assignment(request, owners_queryset, admin_instance):
         admin_instance.message_user(request, "No group selected", level=messages.ERROR)
         return None
 
-    report_rows, assigned = build_owner_assign_report(
-        owners_queryset,
-        group,
-        dry_run=params["dry_run"],
+    # Rows are streamed from the assignment pipeline straight into the report
+    # file; only a bounded preview is kept in memory for the result page.
+    tally = OwnerAssignTally(
+        iter_owner_assign_report(owners_queryset, group, dry_run=params["dry_run"])
     )
 
     _target_path, report_file, report_file_url, report_s3_url = prepare_owner_report(
-        report_rows,
+        tally,
         params["report_file"],
         params["report_format"],
         request.user,
@@ -415,17 +575,20 @@ def perform_owner_assignment(request, owners_queryset, admin_instance):
             "s3_bucket": params["s3_bucket"],
             "s3_public": params["s3_public"],
         },
+        compress=params["report_compress"],
     )
+    tally.consume()
 
     msg = (
-        f"Assigned {assigned} users to group '{group}' "
+        f"Assigned {tally.assigned} users to group '{group}' "
         f"(dry-run={params['dry_run']})"
     )
     admin_instance.message_user(request, msg)
 
     media_url = getattr(settings, "MEDIA_URL", "")
     report_info = {
-        "report_rows": report_rows,
+        "report_rows": tally.preview,
+        "report_row_count": tally.total,
         "report_file": report_file,
         "report_file_url": report_file_url,
         "report_s3_url": report_s3_url,
@@ -440,3 +603,185 @@ def perform_owner_assignment(request, owners_queryset, admin_instance):
         media_url,
     )
     return ("admin/proje/owner_assign_result.html", context)
+
+
+def enqueue_owner_assignment(request, owners_queryset, admin_instance):
+    """Create an `OwnerAssignJob` for the selected owners and enqueue it.
+
+    The job is handed to the `proje.tasks.run_owner_assign_job` Celery task
+    once the surrounding transaction commits (in-process when Celery runs
+    eagerly). Returns the admin URL of the job status page, or `None` when
+    an error already produced a message.
+    """
+    # pylint: disable=import-outside-toplevel
+    from .tasks import run_owner_assign_job
+
+    params = parse_owner_assign_post(request.POST)
+
+    group = Group.objects.filter(pk=params["group_pk"]).first()
+    if not group:
+        admin_instance.message_user(request, "No group selected", level=messages.ERROR)
+        return None
+
+    owner_ids = list(owners_queryset.order_by("pk").values_list("pk", flat=True))
+    job = OwnerAssignJob.objects.create(
+        created_by=request.user if request.user.is_authenticated else None,
+        group=group,
+        owner_ids=owner_ids,
+        dry_run=params["dry_run"],
+        total=len(owner_ids),
+        options={
+            "report_file": params["report_file"],
+            "report_format": params["report_format"],
+            "report_compress": params["report_compress"],
+            "upload_s3": params["upload_s3"],
+            "s3_bucket": params["s3_bucket"],
+            "s3_public": params["s3_public"],
+        },
+    )
+    transaction.on_commit(lambda: run_owner_assign_job.delay(job.pk))
+
+    admin_instance.message_user(
+        request, f"Assignment job #{job.pk} queued for {len(owner_ids)} owners"
+    )
+    return reverse("admin:proje_owner_assign_job", args=[job.pk])
+
+
+def _iter_job_owners(owner_ids):
+    """Yield `Owner` rows for `owner_ids` in primary-key chunks."""
+    for ids in chunked(owner_ids, OWNER_ASSIGN_CHUNK_SIZE):
+        yield from Owner.objects.filter(pk__in=ids).order_by("pk")
+
+
+def execute_owner_assign_job(job_id):
+    """Run a queued `OwnerAssignJob`: assign, write the report, record results.
+
+    Progress (`processed`, `assigned`) is saved after every chunk so the
+    status page can show it. Failures are recorded on the job rather than
+    raised, so a worker never retries a half-applied assignment blindly.
+    """
+    job = OwnerAssignJob.objects.select_related("group", "created_by").get(pk=job_id)
+    if job.is_finished:
+        return job
+
+    OwnerAssignJob.objects.filter(pk=job.pk).update(
+        status="calisiyor", started_at=timezone.now()
+    )
+
+    def _save_progress(tally):
+        OwnerAssignJob.objects.filter(pk=job.pk).update(
+            processed=tally.total, assigned=tally.assigned
+        )
+
+    options = job.options or {}
+    tally = OwnerAssignTally(
+        iter_owner_assign_report(
+            _iter_job_owners(job.owner_ids), job.group, dry_run=job.dry_run
+        ),
+        preview_limit=0,
+        on_progress=_save_progress,
+    )
+    try:
+        if job.group is None:
+            raise ValueError("The selected group no longer exists")
+        _target_path, report_file, report_file_url, report_s3_url = prepare_owner_report(
+            tally,
+            options.get("report_file") or "",
+            options.get("report_format") or "csv",
+            job.created_by,
+            upload_options={
+                "upload_s3": options.get("upload_s3"),
+                "s3_bucket": options.get("s3_bucket"),
+                "s3_public": options.get("s3_public"),
+            },
+            compress=bool(options.get("report_compress")),
+        )
+        tally.consume()
+    except Exception as exc:  # pylint: disable=broad-except
+        # record any failure on the job so the status page can show it
+        job.status = "hata"
+        job.error = f"{type(exc).__name__}: {exc}"
+    else:
+        job.status = "tamamlandi"
+        job.report_file = report_file or ""
+        job.report_file_url = report_file_url or ""
+        job.report_s3_url = report_s3_url or ""
+
+    job.processed = tally.total
+    job.assigned = tally.assigned
+    job.finished_at = timezone.now()
+    job.save(
+        update_fields=[
+            "status",
+            "error",
+            "report_file",
+            "report_file_url",
+            "report_s3_url",
+            "processed",
+            "assigned",
+            "finished_at",
+        ]
+    )
+    return job
+
+
+def save_registry_upload(uploaded):
+    """Write an uploaded registry file under MEDIA_ROOT/imports/; return its path."""
+    ext = Path(uploaded.name).suffix.lstrip(".").lower() or "csv"
+    # the random label keeps uploads made in the same second apart
+    target = resolve_report_path(
+        generate_report_path(prefix="imports/registry", ext=ext, label=uuid.uuid4().hex[:8])
+    )
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with target.open("wb") as fh:
+        for chunk in uploaded.chunks():
+            fh.write(chunk)
+    return target
+
+
+def enqueue_registry_import(request, form, admin_instance):
+    """Store the upload of a valid `RegistryImportForm` and queue its import.
+
+    The file is imported by the `proje.tasks.import_registry_task` Celery
+    task. When Celery runs eagerly the import has finished on return and the
+    summary (with a link to the rejected-row report) is shown right away;
+    otherwise only the queueing is reported, since no result backend is
+    required.
+    """
+    # pylint: disable=import-outside-toplevel
+    from .tasks import import_registry_task
+
+    project = form.cleaned_data["project"]
+    dry_run = form.cleaned_data["dry_run"]
+    path = save_registry_upload(form.cleaned_data["file"])
+    try:
+        result = import_registry_task.delay(project.pk, str(path), dry_run)
+    except (OSError, ValueError) as exc:
+        admin_instance.message_user(request, f"İçe aktarma başarısız: {exc}", level=messages.ERROR)
+        return
+    if not current_app.conf.task_always_eager:
+        admin_instance.message_user(request, f"{project.code} için içe aktarma kuyruğa alındı")
+        return
+    if not result.successful():
+        admin_instance.message_user(
+            request, f"İçe aktarma başarısız: {result.result}", level=messages.ERROR
+        )
+        return
+
+    summary = result.result
+    text = (
+        f"{'[Doğrulama] ' if dry_run else ''}{summary['processed']} satır işlendi: "
+        f"{summary['rejected']} reddedildi, {summary['units']} bağımsız bölüm, "
+        f"{summary['owners']} malik, {summary['ownerships']} hisse yazıldı"
+    )
+    report = summary.get("report_file")
+    if report:
+        relpath = Path(report).resolve().relative_to(Path(settings.MEDIA_ROOT).resolve())
+        url = reverse("proje:report_download", args=[relpath.as_posix()])
+        admin_instance.message_user(
+            request,
+            format_html('{} (<a href="{}">reddedilen satırlar</a>)', text, url),
+            level=messages.WARNING,
+        )
+    else:
+        admin_instance.message_user(request, text)
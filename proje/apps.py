@@ -20,6 +20,11 @@ class ProjeConfig(AppConfig):
     verbose_name = "Proje Yönetimi"
 
     def ready(self):
+        # Register signal handlers (membership, counters, share totals,
+        # fragment versions, search/TC columns, blob release). A failing
+        # import must stop startup rather than silently drop the handlers.
+        from . import signals  # noqa: F401  # pylint: disable=import-outside-toplevel,unused-import
+
         # Ensure groups exist when app is ready
         from django.contrib.auth.models import Group  # pylint: disable=import-outside-toplevel
         try:
@@ -0,0 +1,112 @@
+"""Denormalised per-project counters.
+
+`Project` carries the number of its units, owners and documents and the
+number of units in each `Unit.agreement_status`, so list pages and
+dashboards never need `COUNT(*) ... GROUP BY` over the large tables.
+
+The counters are adjusted incrementally with `F()` updates by the signal
+handlers in `proje.signals` (and explicitly by bulk paths that bypass
+signals, such as `proje.ingest`). Writes that skip signals altogether
+(`QuerySet.update`, raw SQL) can make them drift; `recount_projects`
+recomputes them in bulk with one correlated-subquery UPDATE.
+
+A document counts towards `Document.project`, or towards its unit's
+project when no project is set.
+"""
+
+from django.db.models import F, Func, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Document, Owner, Project, Unit
+
+# `Unit.agreement_status` -> counter field on `Project`
+AGREEMENT_COUNTER_FIELDS = {
+    "beklemede": "unit_beklemede_count",
+    "saglandi": "unit_saglandi_count",
+    "istemiyor": "unit_istemiyor_count",
+    "ulasilamadi": "unit_ulasilamadi_count",
+}
+
+COUNTER_FIELDS = (
+    "unit_count",
+    "owner_count",
+    "document_count",
+    *AGREEMENT_COUNTER_FIELDS.values(),
+)
+
+
+def bump(project_id, **deltas):
+    """Add `deltas` (field -> int) to the counters of one project.
+
+    Runs a single `UPDATE` with `F()` expressions, so concurrent writers do
+    not lose increments; counters never go below zero.
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not project_id or not deltas:
+        return
+    Project.objects.filter(pk=project_id).update(
+        **{field: Greatest(F(field) + delta, 0) for field, delta in deltas.items()}
+    )
+
+
+def unit_deltas(agreement_status, sign=1):
+    """Return the counter deltas for adding (`sign=1`) or removing a unit."""
+    deltas = {"unit_count": sign}
+    field = AGREEMENT_COUNTER_FIELDS.get(agreement_status)
+    if field:
+        deltas[field] = sign
+    return deltas
+
+
+def document_project_id(document):
+    """Return the project a document is counted under (see module docs)."""
+    if document.project_id:
+        return document.project_id
+    if document.unit_id:
+        return Unit.objects.filter(pk=document.unit_id).values_list("project_id", flat=True).first()
+    return None
+
+
+def _count_subquery(queryset):
+    """Correlated `SELECT COUNT(*)` over `queryset` (which uses `OuterRef`)."""
+    counted = queryset.order_by().annotate(n=Func(F("pk"), function="COUNT")).values("n")
+    return Coalesce(Subquery(counted[:1], output_field=IntegerField()), 0)
+
+
+def counter_expressions():
+    """Return `{counter_field: expression}` recomputing every counter."""
+    project = OuterRef("pk")
+    units = Unit.objects.filter(project=project)
+    expressions = {
+        "unit_count": _count_subquery(units),
+        "owner_count": _count_subquery(Owner.objects.filter(project=project)),
+        "document_count": _count_subquery(
+            Document.objects.filter(
+                Q(project=project) | Q(project__isnull=True, unit__project=project)
+            )
+        ),
+    }
+    for status, field in AGREEMENT_COUNTER_FIELDS.items():
+        expressions[field] = _count_subquery(units.filter(agreement_status=status))
+    return expressions
+
+
+def recount_projects(queryset=None, dry_run=False):
+    """Reconcile the counters of `queryset` (default: all projects).
+
+    Returns the primary keys of projects whose stored counters differed
+    from the recomputed values; unless `dry_run`, those rows are fixed
+    with a single `UPDATE`.
+    """
+    queryset = Project.objects.all() if queryset is None else queryset
+    expressions = counter_expressions()
+    annotated = queryset.annotate(
+        **{f"expected_{field}": expr for field, expr in expressions.items()}
+    )
+    drift = Q()
+    for field in COUNTER_FIELDS:
+        drift |= ~Q(**{field: F(f"expected_{field}")})
+    drifted = list(annotated.filter(drift).values_list("pk", flat=True))
+    if drifted and not dry_run:
+        Project.objects.filter(pk__in=drifted).update(**expressions)
+    return drifted
@@ -0,0 +1,157 @@
+"""Serving protected files from MEDIA_ROOT.
+
+`serve_protected_file` is called by views once they have checked access to
+a file. Depending on `settings.PROJE_DOWNLOAD_OFFLOAD` the transfer is
+either handed to the front proxy (``x-accel-redirect`` for nginx,
+``x-sendfile`` for Apache/lighttpd), so no worker is held for the whole
+download, or streamed from Python. The Python path answers conditional
+requests (`If-None-Match`/`If-Modified-Since`) with 304 and honours a
+single `Range` (including `If-Range`) with 206, so repeated and resumed
+downloads do not re-send bytes.
+"""
+
+import mimetypes
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import (content_disposition_header, http_date,
+                               parse_etags, parse_http_date_safe, quote_etag)
+
+OFFLOAD_MODES = ("x-accel-redirect", "x-sendfile")
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def file_etag(stat):
+    """Return a validator for a file from its size and modification time."""
+    return quote_etag(f"{stat.st_mtime_ns:x}-{stat.st_size:x}")
+
+
+def parse_range(header, size):
+    """Return `(start, end)` (inclusive) for a single-range `Range` header.
+
+    Returns None when the header is absent, malformed or asks for several
+    ranges (the full file is sent instead) and raises `ValueError` when
+    the range cannot be satisfied.
+    """
+    match = _RANGE_RE.match((header or "").strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("empty suffix range")
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("range not satisfiable")
+    return start, end
+
+
+def _if_range_matches(request, etag, mtime):
+    """Return True when a `Range` should be honoured given `If-Range`."""
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if not if_range:
+        return True
+    if if_range.startswith(('"', "W/")):
+        # strong comparison only
+        return not if_range.startswith("W/") and etag in parse_etags(if_range)
+    since = parse_http_date_safe(if_range)
+    return since is not None and int(mtime) <= since
+
+
+class _RangeFile:
+    """Read-only view of `length` bytes of `fh` starting at `start`."""
+
+    def __init__(self, fh, start, length):
+        fh.seek(start)
+        self._fh = fh
+        self._remaining = length
+
+    def read(self, size=-1):
+        """Read at most `size` bytes without passing the end of the range."""
+        if self._remaining <= 0:
+            return b""
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._fh.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        """Close the underlying file."""
+        self._fh.close()
+
+
+def _offload_response(path, relpath, mode, as_attachment):
+    response = HttpResponse()
+    content_type, encoding = mimetypes.guess_type(path.name)
+    # compressed reports (.csv.gz) are downloaded as-is, not decoded by clients
+    response["Content-Type"] = (
+        "application/octet-stream" if encoding or not content_type else content_type
+    )
+    disposition = content_disposition_header(as_attachment, path.name)
+    if disposition:
+        response["Content-Disposition"] = disposition
+    if mode == "x-accel-redirect":
+        prefix = getattr(settings, "PROJE_DOWNLOAD_ACCEL_PREFIX", "/protected-media/")
+        response["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + quote(relpath.as_posix())
+    else:
+        response["X-Sendfile"] = str(path)
+    return response
+
+
+def serve_protected_file(request, path, relpath, as_attachment=True):
+    """Return a response delivering the already-authorised file at `path`.
+
+    `relpath` is the path relative to MEDIA_ROOT, used to build the
+    `X-Accel-Redirect` location. Callers must resolve `path` and check
+    traversal and permissions before calling.
+    """
+    mode = getattr(settings, "PROJE_DOWNLOAD_OFFLOAD", None)
+    if mode in OFFLOAD_MODES:
+        return _offload_response(path, relpath, mode, as_attachment)
+
+    stat = path.stat()
+    etag = file_etag(stat)
+    last_modified = int(stat.st_mtime)
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if not_modified is not None:
+        return not_modified
+
+    size = stat.st_size
+    byte_range = None
+    if request.method in ("GET", "HEAD") and _if_range_matches(request, etag, stat.st_mtime):
+        try:
+            byte_range = parse_range(request.META.get("HTTP_RANGE"), size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    fh = open(path, "rb")  # pylint: disable=consider-using-with
+    if byte_range is None:
+        response = FileResponse(fh, as_attachment=as_attachment, filename=path.name)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = FileResponse(
+            _RangeFile(fh, start, length), as_attachment=as_attachment, filename=path.name
+        )
+        response.status_code = 206
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(length)
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    return response
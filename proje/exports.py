@@ -0,0 +1,339 @@
+"""Streaming CSV/XLSX exports of a project's registry tables.
+
+`export_response` returns a `StreamingHttpResponse` whose rows are read
+with ``values_list(...).iterator(chunk_size=...)``: a server-side cursor on
+PostgreSQL, chunked fetches elsewhere. Neither the queryset nor the file is
+ever held in memory, and the first bytes go out as soon as the first chunk
+has been fetched.
+
+XLSX is written by `xlsx_stream` without a spreadsheet library: the sheet
+XML (inline strings, no shared-string table) is compressed into a zip
+stream that is drained after every batch of rows, so memory stays constant
+however many rows are exported.
+
+Text cells that a spreadsheet would evaluate as a formula (leading ``=``,
+``+``, ``-``, ``@``, tab or carriage return) are prefixed with ``'`` in CSV;
+in XLSX every text cell is an inline string, which is never evaluated.
+
+Column headers of the ``ownerships`` export match `proje.registry_import`
+columns, so an export can be edited and imported again (the import strips
+the ``'`` prefix again).
+"""
+
+import csv
+import datetime
+import io
+import re
+import zipfile
+from decimal import Decimal
+from xml.sax.saxutils import escape, quoteattr
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import content_disposition_header
+
+from .models import Agreement, Owner, Ownership, Unit
+
+EXPORT_FORMATS = ("csv", "xlsx")
+DEFAULT_CHUNK_SIZE = 2000
+# rows serialised between two chunks handed to the response
+ROWS_PER_WRITE = 500
+
+_UNIT_COLUMNS = (
+    ("ada", "ada"),
+    ("parsel", "parsel"),
+    ("door_outside", "door_outside"),
+    ("door_inside", "door_inside"),
+    ("type", "type"),
+    ("m2", "m2"),
+    ("current_m2", "current_m2"),
+    ("share_m2", "share_m2"),
+    ("address", "address"),
+    ("occupancy", "occupancy"),
+)
+
+# kind -> (sheet title, model, project lookup, ((header, values_list lookup), ...))
+EXPORTS = {
+    "units": (
+        "Bağımsız Bölümler",
+        Unit,
+        "project",
+        (("id", "pk"),) + _UNIT_COLUMNS + (("agreement_status", "agreement_status"),),
+    ),
+    "owners": (
+        "Malikler",
+        Owner,
+        "project",
+        (
+            ("id", "pk"),
+            ("first_name", "first_name"),
+            ("last_name", "last_name"),
+            ("tc_no", "tc_no"),
+            ("phone", "phone"),
+            ("email", "email"),
+            ("landline", "landline"),
+            ("relative_phone", "relative_phone"),
+            ("address", "address"),
+            ("birth_date", "birth_date"),
+            ("residence_city", "residence_city"),
+            ("employment", "employment"),
+        ),
+    ),
+    "ownerships": (
+        "Hisseler",
+        Ownership,
+        "unit__project",
+        (("id", "pk"),)
+        + tuple((header, f"unit__{lookup}") for header, lookup in _UNIT_COLUMNS)
+        + (
+            ("first_name", "owner__first_name"),
+            ("last_name", "owner__last_name"),
+            ("tc_no", "owner__tc_no"),
+            ("share_percent", "share_percent"),
+            ("status", "status"),
+        ),
+    ),
+    "agreements": (
+        "Uzlaşmalar",
+        Agreement,
+        "unit__project",
+        (
+            ("id", "pk"),
+            ("ada", "unit__ada"),
+            ("parsel", "unit__parsel"),
+            ("door_outside", "unit__door_outside"),
+            ("door_inside", "unit__door_inside"),
+            ("date", "date"),
+            ("status", "status"),
+            ("staff", "staff__username"),
+            ("note", "note"),
+        ),
+    ),
+}
+
+
+def export_chunk_size():
+    """Rows fetched per cursor round trip (``PROJE_EXPORT_CHUNK_SIZE``)."""
+    return getattr(settings, "PROJE_EXPORT_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+
+
+def export_queryset(project, kind):
+    """Return `(headers, queryset)` of `values_list` tuples for export `kind`.
+
+    Raises `KeyError` for an unknown kind.
+    """
+    _title, model, project_lookup, columns = EXPORTS[kind]
+    queryset = (
+        model.objects.filter(**{project_lookup: project})
+        .order_by("pk")
+        .values_list(*(lookup for _header, lookup in columns))
+    )
+    return [header for header, _lookup in columns], queryset
+
+
+# leading characters that make spreadsheet applications evaluate a CSV cell
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _cell_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_cell(value):
+    text = _cell_text(value)
+    if isinstance(value, str) and text.startswith(FORMULA_PREFIXES):
+        return "'" + text
+    return text
+
+
+def csv_stream(headers, rows):
+    """Yield CSV text for `headers` and `rows`, a batch of rows at a time.
+
+    Starts with a UTF-8 byte-order mark so spreadsheet applications detect
+    the encoding of Turkish characters. Text that would be read as a
+    formula is prefixed with ``'``.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow([_csv_cell(header) for header in headers])
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([_csv_cell(value) for value in row])
+        if count % ROWS_PER_WRITE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+# characters XML 1.0 does not allow, even escaped
+_XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    "</Types>"
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name={name} sheetId="1" r:id="rId1"/></sheets>'
+    "</workbook>"
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    "</Relationships>"
+)
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    "<sheetData>"
+)
+_SHEET_TAIL = "</sheetData></worksheet>"
+
+
+class _ZipSink:
+    """Write-only, non-seekable target for `zipfile.ZipFile`.
+
+    ZipFile then writes each member with a trailing data descriptor instead
+    of seeking back, so the archive can be sent while it is being written.
+    """
+
+    def __init__(self):
+        self._parts = []
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        """Nothing to flush; data is collected until `drain`."""
+
+    def drain(self):
+        """Return and forget everything written so far."""
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _column_letters(count):
+    letters = []
+    for index in range(count):
+        name = ""
+        index += 1
+        while index:
+            index, rest = divmod(index - 1, 26)
+            name = chr(ord("A") + rest) + name
+        letters.append(name)
+    return letters
+
+
+def _xlsx_cell(ref, value):
+    if value is None or value == "":
+        return ""
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, Decimal)):
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    text = escape(_XML_ILLEGAL.sub("", _cell_text(value)))
+    space = ' xml:space="preserve"' if text != text.strip() else ""
+    return f'<c r="{ref}" t="inlineStr"><is><t{space}>{text}</t></is></c>'
+
+
+def _xlsx_row(number, letters, values):
+    cells = "".join(
+        _xlsx_cell(f"{letter}{number}", value) for letter, value in zip(letters, values)
+    )
+    return f'<row r="{number}">{cells}</row>'
+
+
+def xlsx_stream(headers, rows, sheet_title="Sheet1"):
+    """Yield the bytes of a single-sheet XLSX workbook for `headers` and `rows`."""
+    sink = _ZipSink()
+    letters = _column_letters(len(headers))
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _ROOT_RELS)
+        # sheet names: at most 31 characters, no []:*?/\
+        name = re.sub(r"[\[\]:*?/\\]", " ", sheet_title)[:31] or "Sheet1"
+        archive.writestr("xl/workbook.xml", _WORKBOOK.format(name=quoteattr(name)))
+        archive.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        with archive.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            sheet.write((_SHEET_HEAD + _xlsx_row(1, letters, headers)).encode())
+            batch = []
+            for number, row in enumerate(rows, start=2):
+                batch.append(_xlsx_row(number, letters, row))
+                if len(batch) >= ROWS_PER_WRITE:
+                    sheet.write("".join(batch).encode())
+                    batch = []
+                    yield sink.drain()
+            sheet.write(("".join(batch) + _SHEET_TAIL).encode())
+    yield sink.drain()
+
+
+def stream_response(filename, headers, rows, file_format="csv", sheet_title="Sheet1"):
+    """Return a `StreamingHttpResponse` writing `rows` as a CSV/XLSX attachment.
+
+    `filename` is given without extension. Raises `ValueError` for an
+    unsupported format.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {file_format}")
+    if file_format == "xlsx":
+        response = StreamingHttpResponse(
+            xlsx_stream(headers, rows, sheet_title),
+            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
+    else:
+        response = StreamingHttpResponse(
+            csv_stream(headers, rows), content_type="text/csv; charset=utf-8"
+        )
+    response["Content-Disposition"] = content_disposition_header(
+        True, f"{filename}.{file_format}"
+    )
+    # let reverse proxies pass chunks through instead of buffering the export
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def export_response(project, kind, file_format="csv", chunk_size=None):
+    """Return a `StreamingHttpResponse` exporting `kind` rows of `project`.
+
+    The queryset is pinned to the database chosen now, so exports started
+    inside a `proje.replica.read_replica` block keep reading from the
+    replica while the response streams. Raises `KeyError` for an unknown
+    kind and `ValueError` for an unsupported format.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {file_format}")
+    headers, queryset = export_queryset(project, kind)
+    queryset = queryset.using(queryset.db)
+    rows = queryset.iterator(chunk_size=chunk_size or export_chunk_size())
+    stamp = timezone.localtime().strftime("%Y%m%d_%H%M%S")
+    return stream_response(
+        f"{project.code}_{kind}_{stamp}", headers, rows, file_format, EXPORTS[kind][0]
+    )
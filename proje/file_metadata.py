@@ -0,0 +1,76 @@
+"""Metadata extraction for uploaded document files.
+
+`read_file_metadata` computes everything the admin needs to display a
+`Document` (size, MIME type, SHA-256 and, for images, pixel dimensions) in
+a single pass over the content, so it can be stored on the row at upload
+time instead of being fetched from storage on every render.
+"""
+
+import hashlib
+import mimetypes
+
+from PIL import Image, UnidentifiedImageError
+
+from .storage import SHA256_ATTR
+
+_READ_CHUNK = 1024 * 1024
+
+METADATA_FIELDS = ("size", "content_type", "sha256", "width", "height")
+
+
+def read_file_metadata(fileobj, name=None):
+    """Return a dict with the `METADATA_FIELDS` values for `fileobj`.
+
+    `fileobj` is a Django `File` (an upload or a `FieldFile`); it is read
+    from the start and left rewound. `width`/`height` are None unless the
+    content is an image Pillow can identify, in which case its MIME type
+    also replaces the one guessed from `name`.
+    """
+    name = str(name or getattr(fileobj, "name", "") or "")
+    digest = hashlib.sha256()
+    size = 0
+    if hasattr(fileobj, "seek"):
+        fileobj.seek(0)
+    for chunk in fileobj.chunks(_READ_CHUNK):
+        digest.update(chunk)
+        size += len(chunk)
+
+    content_type = mimetypes.guess_type(name)[0] or ""
+    width = height = None
+    try:
+        fileobj.seek(0)
+        # only the header is parsed; pixel data is not decoded
+        with Image.open(fileobj) as img:
+            width, height = img.size
+            content_type = Image.MIME.get(img.format, content_type)
+    except (UnidentifiedImageError, OSError, ValueError):
+        pass
+    finally:
+        fileobj.seek(0)
+
+    return {
+        "size": size,
+        "content_type": content_type[:100],
+        "sha256": digest.hexdigest(),
+        "width": width,
+        "height": height,
+    }
+
+
+def apply_file_metadata(document, fileobj=None):
+    """Set the metadata fields of `document` from `fileobj` (default: its file)."""
+    source = fileobj if fileobj is not None else document.file
+    closed = getattr(source, "closed", True)
+    if closed:
+        source.open("rb")
+    try:
+        meta = read_file_metadata(source, name=getattr(source, "name", None))
+    finally:
+        if closed:
+            source.close()
+    for field, value in meta.items():
+        setattr(document, field, value)
+    if fileobj is not None:
+        # lets ContentAddressedStorage reuse the digest instead of re-reading
+        setattr(fileobj, SHA256_ATTR, meta["sha256"])
+    return meta
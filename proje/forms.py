@@ -28,7 +28,6 @@ class ProjectForm(forms.ModelForm):
             "est_end_date",
             "manager",
             "staff",
-            "unit_count",
         ]
 
 
@@ -0,0 +1,55 @@
+"""Per-project versions for cached template fragments.
+
+The owners, units and documents sections of `proje/project_detail.html`
+are cached with ``{% cache %}`` under a key that includes the project's
+fragment version. Any change to a project's owners, units, ownerships or
+documents bumps the version (after commit, from `proje.signals`), so
+stale fragments are never looked up again and simply expire.
+
+Versions live in the cache itself. A missing version is seeded with the
+current time in nanoseconds rather than a small counter, so an evicted
+version can never recreate a key whose fragments are still cached.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# fragments are invalidated by version bumps; the timeout only bounds memory
+DEFAULT_FRAGMENT_TIMEOUT = 60 * 60 * 24
+
+
+def _version_key(project_id):
+    return f"proje:fragments:{project_id}"
+
+
+def fragment_timeout():
+    """Return the `{% cache %}` timeout of project fragments, in seconds."""
+    return getattr(settings, "PROJE_FRAGMENT_CACHE_TIMEOUT", DEFAULT_FRAGMENT_TIMEOUT)
+
+
+def project_fragment_version(project):
+    """Return the current fragment version string of `project`.
+
+    The project's creation time is part of the version, so a reused
+    primary key does not pick up fragments of a deleted project.
+    """
+    key = _version_key(project.pk)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key, 0)
+    created = int(project.created.timestamp() * 1_000_000) if project.created else 0
+    return f"{created}.{version}"
+
+
+def bump_project_fragments(*project_ids):
+    """Invalidate the cached fragments of `project_ids`."""
+    for project_id in {pk for pk in project_ids if pk}:
+        key = _version_key(project_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # not cached (evicted or never rendered): seed a fresh version
+            cache.set(key, time.time_ns(), None)
@@ -0,0 +1,114 @@
+"""Bulk ingestion of uploaded files as `Document` rows.
+
+Writing files to storage dominates the cost of large upload batches, so the
+writes run concurrently on a bounded thread pool (worker threads only touch
+storage, never the database). All rows are then inserted with a single
+`bulk_create` inside a transaction. If any write or the insert fails, the
+files already written for the batch are deleted again so no orphans are
+left in storage (deduplicated blobs still referenced by other rows are
+kept, see `proje.storage`).
+
+Note that `bulk_create` does not send `pre_save`/`post_save` signals; the
+project document counter (`proje.counters`) is bumped, the project's
+cached fragments (`proje.fragment_cache`) are invalidated after commit and
+the search column (`proje.search`) filled explicitly.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import transaction
+
+from .counters import bump, document_project_id
+from .file_metadata import apply_file_metadata
+from .fragment_cache import bump_project_fragments
+from .models import Document
+from .search import search_text_for
+from .storage import discard_blob, is_blob_name
+from .thumbnails import generate_thumbnails, is_image_name
+
+logger = logging.getLogger(__name__)
+
+# Concurrent storage writes per batch (override with PROJE_INGEST_WORKERS).
+DEFAULT_INGEST_WORKERS = 8
+
+
+def _store_file(field, instance, uploaded):
+    """Save `uploaded` to the storage of `field` and return the stored name.
+
+    File metadata is read into `instance` and image thumbnails are derived
+    in the same worker thread; thumbnails are content-addressed and
+    therefore left in place if the batch fails.
+    """
+    apply_file_metadata(instance, uploaded)
+    name = field.generate_filename(instance, uploaded.name)
+    name = field.storage.save(name, uploaded, max_length=field.max_length)
+    if instance.width and is_image_name(name):
+        try:
+            generate_thumbnails(field.attr_class(instance, field, name), digest=instance.sha256)
+        except (OSError, ValueError):
+            # the upload itself succeeded; the first preview retries
+            logger.warning("Thumbnail generation failed for %s", name, exc_info=True)
+    return name
+
+
+def _delete_stored(storage, names):
+    for name in names:
+        if is_blob_name(name):
+            # deduplicated blobs may be shared with rows outside this batch
+            discard_blob(storage, name)
+            continue
+        try:
+            storage.delete(name)
+        except OSError:  # pragma: no cover - best-effort cleanup
+            logger.warning("Could not remove orphaned upload %s", name, exc_info=True)
+
+
+def ingest_documents(files, labels=(), max_workers=None, **fields):
+    """Store `files` concurrently and create one `Document` per file.
+
+    `labels` is matched to `files` by position (missing labels are blank)
+    and `fields` (e.g. `project`, `unit`, `uploaded_by`) are set on every
+    document. Returns the created documents in input order.
+    """
+    files = list(files)
+    if not files:
+        return []
+    labels = list(labels)
+    field = Document._meta.get_field("file")  # pylint: disable=protected-access
+    docs = [
+        Document(label=labels[idx] if idx < len(labels) else "", **fields)
+        for idx in range(len(files))
+    ]
+    workers = max_workers or getattr(settings, "PROJE_INGEST_WORKERS", DEFAULT_INGEST_WORKERS)
+
+    stored = []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(files)))) as pool:
+        futures = [pool.submit(_store_file, field, doc, f) for doc, f in zip(docs, files)]
+        errors = []
+        for future in futures:
+            try:
+                stored.append(future.result())
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                errors.append(exc)
+    if errors:
+        _delete_stored(field.storage, stored)
+        raise errors[0]
+
+    for doc, name in zip(docs, stored):
+        doc.file = name
+        doc.search_text = search_text_for(doc)
+    try:
+        with transaction.atomic():
+            created = Document.objects.bulk_create(docs)
+            # bulk_create skips the signal handlers that maintain the counter
+            # and invalidate the project's cached sections
+            project_id = document_project_id(docs[0])
+            bump(project_id, document_count=len(created))
+            if project_id:
+                transaction.on_commit(lambda: bump_project_fragments(project_id))
+    except Exception:
+        _delete_stored(field.storage, stored)
+        raise
+    return created
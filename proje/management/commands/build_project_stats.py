@@ -0,0 +1,33 @@
+"""Management command to write `ProjectDailyStats` snapshots.
+
+Normally run by celery-beat (task ``proje.build_daily_stats``); useful to
+seed the dashboard after deployment. Only today's snapshot can be written.
+"""
+
+# pylint: disable=django-not-configured
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from proje.stats import build_daily_stats
+
+
+class Command(BaseCommand):
+    """Build the dashboard's daily project statistics snapshot."""
+    help = "Write today's ProjectDailyStats snapshot"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", type=str, help="Snapshot date (YYYY-MM-DD); must be today")
+
+    def handle(self, *args, **options):
+        day = None
+        if options.get("date"):
+            try:
+                day = datetime.date.fromisoformat(options["date"])
+            except ValueError as exc:
+                raise CommandError(f"Invalid --date: {options['date']}") from exc
+        try:
+            count = build_daily_stats(day)
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        self.stdout.write(f"Wrote {count} project snapshots\n")
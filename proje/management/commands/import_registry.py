@@ -0,0 +1,81 @@
+"""Management command to import land-registry rows from CSV or XLSX.
+
+Streams the file through `proje.registry_import`: rows are validated and
+upserted in chunks (units, owners and ownerships in bulk) and rejected
+rows are written to a report file.
+"""
+
+# pylint: disable=django-not-configured
+from django.core.management.base import BaseCommand, CommandError
+
+from proje.models import Project
+from proje.registry_import import DEFAULT_CHUNK_SIZE, import_registry_file
+from proje.reports import REPORT_FORMATS
+
+
+class Command(BaseCommand):
+    """Bulk import units, owners and ownership shares for a project."""
+    help = (
+        "Import ada/parsel/unit/owner/share rows from a CSV or XLSX file. Usage: "
+        "python manage.py import_registry tapu.xlsx --project KD-01"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("file", help="CSV or XLSX file (first sheet) with a header row")
+        parser.add_argument("--project", required=True, help="Code of the target project")
+        parser.add_argument(
+            "--format",
+            choices=("csv", "xlsx"),
+            help="File format (default: from the file extension)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate only; report rejected rows without writing anything",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Rows validated and upserted per batch/transaction (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--report-file",
+            type=str,
+            help="Write rejected rows to this file (default: reports/registry_import_<code>_<ts>)",
+        )
+        parser.add_argument(
+            "--report-format",
+            type=str,
+            choices=REPORT_FORMATS,
+            default="csv",
+            help="Rejected-row report format (csv, jsonl or json)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            project = Project.objects.get(code=options["project"])
+        except Project.DoesNotExist as exc:
+            raise CommandError(f"Project '{options['project']}' not found") from exc
+        try:
+            summary = import_registry_file(
+                project,
+                options["file"],
+                file_format=options.get("format"),
+                dry_run=options.get("dry_run"),
+                chunk_size=options.get("chunk_size") or DEFAULT_CHUNK_SIZE,
+                report_file=options.get("report_file"),
+                report_format=options.get("report_format"),
+            )
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        prefix = "[dry-run] " if options.get("dry_run") else ""
+        self.stdout.write(
+            f"{prefix}Processed {summary['processed']} rows in {summary['elapsed']:.2f}s "
+            f"({summary['rows_per_second']:.0f} rows/sec): {summary['rejected']} rejected, "
+            f"{summary['units']} units, {summary['owners']} owners, "
+            f"{summary['ownerships']} ownerships written\n"
+        )
+        if summary["report_file"]:
+            self.stdout.write(f"Rejected rows written to {summary['report_file']}\n")
@@ -1,12 +1,26 @@
 import csv
-import json
-from pathlib import Path
 
 from django.core.management.base import BaseCommand, CommandError
 
+from proje.group_assign import DEFAULT_CHUNK_SIZE, GroupAssignEngine
+from proje.reports import REPORT_FORMATS, peek_rows, write_report
 from proje.utils import generate_report_path
 
 
+def _csv_pairs(file_path, group_global):
+    """Yield `(ident, group_name)` pairs from a CSV file, row by row.
+
+    Accepts files with header 'username' or 'email' and optional 'group';
+    rows without an identifier are ignored.
+    """
+    with open(file_path, newline="", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh):
+            ident = (row.get("username") or row.get("email") or "").strip()
+            if not ident:
+                continue
+            yield ident, (row.get("group") or group_global or "").strip()
+
+
 class Command(BaseCommand):
     help = (
         "Assign a user to a project-related group. Usage: "
@@ -35,17 +49,28 @@ class Command(BaseCommand):
             type=str,
             help="Comma-separated list of usernames or emails to assign to --group",
         )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Rows resolved and inserted per batch/transaction (default: %(default)s)",
+        )
         parser.add_argument(
             "--report-file",
             type=str,
-            help="Write a report of the assignments to this file (CSV or JSON by --report-format)",
+            help="Write a report of the assignments to this file (format by --report-format)",
         )
         parser.add_argument(
             "--report-format",
             type=str,
-            choices=("csv", "json"),
+            choices=REPORT_FORMATS,
             default="csv",
-            help="Report file format when --report-file is used (csv or json)",
+            help="Report file format when --report-file is used (csv, jsonl or json)",
+        )
+        parser.add_argument(
+            "--compress",
+            action="store_true",
+            help="Gzip-compress the report file ('.gz' is appended to the name)",
         )
         parser.add_argument(
             "--upload-s3",
@@ -80,332 +105,113 @@ class Command(BaseCommand):
         file_path = options.get("file")
         users_arg = options.get("users")
         dry_run = options.get("dry_run")
-        report_file = options.get("report_file")
-        report_format = options.get("report_format")
         label = options.get("label")
-        upload_s3 = options.get("upload_s3")
-        s3_bucket = options.get("s3_bucket")
-        s3_key = options.get("s3_key")
-        s3_public = options.get("s3_public")
-
-        # helper to resolve user by username or email
-        def _find_user(User, ident: str):
-            ident = (ident or "").strip()
-            if not ident:
-                return None
-            try:
-                return User.objects.get(username=ident)
-            except User.DoesNotExist:
-                try:
-                    return User.objects.get(email=ident)
-                except User.DoesNotExist:
-                    return None
 
-        report_rows = []
+        engine = GroupAssignEngine(
+            dry_run=dry_run, chunk_size=options.get("chunk_size") or DEFAULT_CHUNK_SIZE
+        )
 
         # Determine mode: single, bulk-by-list, or bulk-by-file
         if file_path:
             # bulk via CSV file; group may be provided as global or per-row
-            from django.contrib.auth import get_user_model
-            from django.contrib.auth.models import Group
-
-            User = get_user_model()
-
-            group_global = group_name
-            assigned = 0
-            with open(file_path, newline="", encoding="utf-8") as fh:
-                reader = csv.DictReader(fh)
-                # Accept files with header 'username' or 'email' and optional 'group'
-                for row in reader:
-                    ident = (row.get("username") or row.get("email") or "").strip()
-                    if not ident:
-                        continue
-                    gname = (row.get("group") or group_global or "").strip()
-                    if not gname:
-                        report_rows.append(
-                            {
-                                "ident": ident,
-                                "group": "",
-                                "status": "skipped",
-                                "reason": "no_group",
-                            }
-                        )
-                        self.stdout.write(f"Skipping {ident}: no group provided\n")
-                        continue
-                    user = _find_user(User, ident)
-                    if not user:
-                        report_rows.append(
-                            {"ident": ident, "group": gname, "status": "not_found"}
-                        )
-                        self.stdout.write(f"User '{ident}' not found; skipping\n")
-                        continue
-                    group, _ = Group.objects.get_or_create(name=gname)
-                    if dry_run:
-                        report_rows.append(
-                            {
-                                "ident": ident,
-                                "user": str(user),
-                                "group": gname,
-                                "status": "would_assign",
-                            }
-                        )
-                        self.stdout.write(
-                            f"[dry-run] Would add {user} to group '{gname}'\n"
-                        )
-                    else:
-                        group.user_set.add(user)
-                        assigned += 1
-                        report_rows.append(
-                            {
-                                "ident": ident,
-                                "user": str(user),
-                                "group": gname,
-                                "status": "assigned",
-                            }
-                        )
-
-            # if no report_file requested but we have report_rows, auto-generate filename
-            if not report_file and report_rows:
-                report_file = generate_report_path(
-                    prefix="reports/proje_assign", ext=report_format
-                )
-
-            # if no explicit report_file provided but we have report_rows, auto-generate into MEDIA_ROOT
-            if not report_file and report_rows:
-                report_file = generate_report_path(
-                    prefix="reports/proje_assign",
-                    ext=report_format,
-                    label=label or group_global,
-                )
-
-            if report_file:
-                media_root = getattr(
-                    __import__("django.conf").conf.settings, "MEDIA_ROOT", None
-                )
-                target_path = Path(report_file)
-                if not target_path.is_absolute() and media_root:
-                    target_path = Path(media_root) / report_file
-                target_path.parent.mkdir(parents=True, exist_ok=True)
-                if report_format == "csv":
-                    keys = ["ident", "user", "group", "status", "reason"]
-                    with target_path.open("w", newline="", encoding="utf-8") as outfh:
-                        writer = csv.DictWriter(outfh, fieldnames=keys)
-                        writer.writeheader()
-                        for r in report_rows:
-                            writer.writerow({k: r.get(k, "") for k in keys})
-                else:
-                    with target_path.open("w", encoding="utf-8") as outfh:
-                        json.dump(report_rows, outfh, ensure_ascii=False, indent=2)
-
-                # Optionally upload to S3
-                if upload_s3:
-                    try:
-                        from proje.utils import upload_file_to_s3
-
-                        bucket = s3_bucket
-                        # If bucket not provided via arg, try settings
-                        if not bucket:
-                            bucket = getattr(
-                                __import__("django.conf").conf.settings,
-                                "REPORTS_S3_BUCKET",
-                                None,
-                            )
-                        res = upload_file_to_s3(
-                            target_path, bucket=bucket, key=s3_key, public=s3_public
-                        )
-                        self.stdout.write(f"Uploaded report to S3: {res.get('url')}\n")
-                    except Exception as exc:  # pragma: no cover - best-effort upload
-                        self.stderr.write(f"Failed to upload report to S3: {exc}\n")
-
-            if dry_run:
-                self.stdout.write(f"[dry-run] Processed CSV {file_path}\n")
-            else:
-                self.stdout.write(f"Assigned {assigned} users from {file_path}\n")
-            return
-
-        if users_arg:
-            # comma-separated list
-            from django.contrib.auth import get_user_model
-            from django.contrib.auth.models import Group
-
-            User = get_user_model()
+            pairs = _csv_pairs(file_path, group_name)
+            report_keys = ["ident", "user", "group", "status", "reason"]
+            label = label or group_name
+        elif users_arg:
             if not group_name:
                 raise CommandError("--group is required when using --users")
             usernames = [u.strip() for u in users_arg.split(",") if u.strip()]
-            assigned = 0
-            for ident in usernames:
-                user = _find_user(User, ident)
-                if not user:
-                    report_rows.append(
-                        {"ident": ident, "group": group_name, "status": "not_found"}
-                    )
-                    self.stdout.write(f"User '{ident}' not found; skipping\n")
-                    continue
-                group, _ = Group.objects.get_or_create(name=group_name)
-                if dry_run:
-                    report_rows.append(
-                        {
-                            "ident": ident,
-                            "user": str(user),
-                            "group": group_name,
-                            "status": "would_assign",
-                        }
-                    )
-                    self.stdout.write(
-                        f"[dry-run] Would add {user} to group '{group_name}'\n"
-                    )
-                else:
-                    group.user_set.add(user)
-                    assigned += 1
-                    report_rows.append(
-                        {
-                            "ident": ident,
-                            "user": str(user),
-                            "group": group_name,
-                            "status": "assigned",
-                        }
-                    )
-
-            # if no report_file requested but we have report_rows, auto-generate filename
-            if not report_file and report_rows:
-                report_file = generate_report_path(
-                    prefix="reports/proje_assign", ext=report_format
-                )
-
-            # write report if requested
-            # if no explicit report_file provided but we have report_rows, auto-generate into MEDIA_ROOT
-            if not report_file and report_rows:
-                report_file = generate_report_path(
-                    prefix="reports/proje_assign", ext=report_format, label=label
+            pairs = ((ident, group_name) for ident in usernames)
+            report_keys = ["ident", "user", "group", "status"]
+        else:
+            # fall back to single user mode
+            if not username or not group_name:
+                raise CommandError(
+                    "Either --username and --group, or --file, or --users and --group must be provided"
                 )
-
-            if report_file:
-                media_root = getattr(
-                    __import__("django.conf").conf.settings, "MEDIA_ROOT", None
+            if not engine.resolve_user(username.strip()):
+                raise CommandError(f"User '{username}' not found")
+            pairs = [(username.strip(), group_name)]
+            report_keys = ["ident", "user", "group", "status"]
+
+        # rows flow from the engine through the console log into the report
+        rows = self._logged_rows(engine.run(pairs), single=not (file_path or users_arg))
+        self._write_report(rows, report_keys, label, options)
+
+        self.stdout.write(
+            f"Processed {engine.processed} rows in {engine.elapsed:.2f}s "
+            f"({engine.rows_per_second:.0f} rows/sec)\n"
+        )
+        if file_path:
+            if dry_run:
+                self.stdout.write(f"[dry-run] Processed CSV {file_path}\n")
+            else:
+                self.stdout.write(f"Assigned {engine.assigned} users from {file_path}\n")
+        elif users_arg:
+            self.stdout.write(f"Assigned {engine.assigned} users from list\n")
+
+    def _logged_rows(self, rows, single=False):
+        """Yield `rows` unchanged, writing the per-row console message for each."""
+        for row in rows:
+            status = row["status"]
+            if status == "skipped":
+                self.stdout.write(f"Skipping {row['ident']}: no group provided\n")
+            elif status == "not_found":
+                self.stdout.write(f"User '{row['ident']}' not found; skipping\n")
+            elif status == "would_assign":
+                self.stdout.write(
+                    f"[dry-run] Would add {row['user']} to group '{row['group']}'\n"
                 )
-                target_path = Path(report_file)
-                if not target_path.is_absolute() and media_root:
-                    target_path = Path(media_root) / report_file
-                target_path.parent.mkdir(parents=True, exist_ok=True)
-                if report_format == "csv":
-                    keys = ["ident", "user", "group", "status"]
-                    with target_path.open("w", newline="", encoding="utf-8") as outfh:
-                        writer = csv.DictWriter(outfh, fieldnames=keys)
-                        writer.writeheader()
-                        for r in report_rows:
-                            writer.writerow({k: r.get(k, "") for k in keys})
-                else:
-                    with target_path.open("w", encoding="utf-8") as outfh:
-                        json.dump(report_rows, outfh, ensure_ascii=False, indent=2)
-
-                # Optionally upload to S3
-                if upload_s3:
-                    try:
-                        from proje.utils import upload_file_to_s3
-
-                        bucket = s3_bucket
-                        if not bucket:
-                            bucket = getattr(
-                                __import__("django.conf").conf.settings,
-                                "REPORTS_S3_BUCKET",
-                                None,
-                            )
-                        res = upload_file_to_s3(
-                            target_path, bucket=bucket, key=s3_key, public=s3_public
-                        )
-                        self.stdout.write(f"Uploaded report to S3: {res.get('url')}\n")
-                    except Exception as exc:  # pragma: no cover - best-effort upload
-                        self.stderr.write(f"Failed to upload report to S3: {exc}\n")
-
-            self.stdout.write(f"Assigned {assigned} users from list\n")
-            return
-
-        # fall back to single user mode
-        if not username or not group_name:
-            raise CommandError(
-                "Either --username and --group, or --file, or --users and --group must be provided"
-            )
-
-        from django.contrib.auth import get_user_model
-        from django.contrib.auth.models import Group
-
-        User = get_user_model()
-
-        # resolve by username or email
-        user = _find_user(User, username)
-        if not user:
-            raise CommandError(f"User '{username}' not found")
-
-        group, _ = Group.objects.get_or_create(name=group_name)
-        if dry_run:
-            report_rows.append(
-                {
-                    "ident": username,
-                    "user": str(user),
-                    "group": group_name,
-                    "status": "would_assign",
-                }
-            )
-            self.stdout.write(f"[dry-run] Would add {user} to group '{group_name}'\n")
-        else:
-            group.user_set.add(user)
-            report_rows.append(
-                {
-                    "ident": username,
-                    "user": str(user),
-                    "group": group_name,
-                    "status": "assigned",
-                }
-            )
-            # Use plain write to avoid type issues in static analysis
-            self.stdout.write(f"Added user {user} to group '{group_name}'\n")
-
-        # if no report_file requested but we have report_rows, auto-generate filename
-        if not report_file and report_rows:
-            report_file = generate_report_path(
-                prefix="reports/proje_assign", ext=report_format
-            )
+            elif status == "assigned" and single:
+                # Use plain write to avoid type issues in static analysis
+                self.stdout.write(f"Added user {row['user']} to group '{row['group']}'\n")
+            yield row
+
+    def _write_report(self, rows, keys, label, options):
+        """Stream `rows` into the requested (or auto-generated) report file.
+
+        Relative paths are placed under `MEDIA_ROOT`; the report is then
+        optionally uploaded to S3. `rows` is always fully consumed, even
+        when no report is written.
+        """
+        report_file = options.get("report_file")
+        report_format = options.get("report_format")
 
-        # if no explicit report_file provided but we have report_rows, auto-generate into MEDIA_ROOT
-        if not report_file and report_rows:
+        has_rows, rows = peek_rows(rows)
+        # if no explicit report_file provided but we have report rows, auto-generate into MEDIA_ROOT
+        if not report_file and has_rows:
             report_file = generate_report_path(
                 prefix="reports/proje_assign", ext=report_format, label=label
             )
+        if not report_file:
+            for _row in rows:
+                pass
+            return
 
-        if report_file:
-            media_root = getattr(
-                __import__("django.conf").conf.settings, "MEDIA_ROOT", None
-            )
-            target_path = Path(report_file)
-            if not target_path.is_absolute() and media_root:
-                target_path = Path(media_root) / report_file
-            target_path.parent.mkdir(parents=True, exist_ok=True)
-            if report_format == "csv":
-                keys = ["ident", "user", "group", "status"]
-                with target_path.open("w", newline="", encoding="utf-8") as outfh:
-                    writer = csv.DictWriter(outfh, fieldnames=keys)
-                    writer.writeheader()
-                    for r in report_rows:
-                        writer.writerow({k: r.get(k, "") for k in keys})
-            else:
-                with target_path.open("w", encoding="utf-8") as outfh:
-                    json.dump(report_rows, outfh, ensure_ascii=False, indent=2)
-
-            # Optionally upload to S3
-            if upload_s3:
-                try:
-                    from proje.utils import upload_file_to_s3
+        target_path, _count = write_report(
+            rows,
+            report_file,
+            report_format,
+            fieldnames=keys,
+            compress=options.get("compress"),
+        )
 
-                    bucket = s3_bucket
-                    if not bucket:
-                        bucket = getattr(
-                            __import__("django.conf").conf.settings,
-                            "REPORTS_S3_BUCKET",
-                            None,
-                        )
-                    res = upload_file_to_s3(
-                        target_path, bucket=bucket, key=s3_key, public=s3_public
-                    )
-                    self.stdout.write(f"Uploaded report to S3: {res.get('url')}\n")
-                except Exception as exc:  # pragma: no cover - best-effort upload
-                    self.stderr.write(f"Failed to upload report to S3: {exc}\n")
+        # Optionally upload to S3
+        if options.get("upload_s3"):
+            try:
+                from django.conf import settings
+                from proje.utils import upload_file_to_s3
+
+                bucket = options.get("s3_bucket")
+                # If bucket not provided via arg, try settings
+                if not bucket:
+                    bucket = getattr(settings, "REPORTS_S3_BUCKET", None)
+                res = upload_file_to_s3(
+                    target_path,
+                    bucket=bucket,
+                    key=options.get("s3_key"),
+                    public=options.get("s3_public"),
+                )
+                self.stdout.write(f"Uploaded report to S3: {res.get('url')}\n")
+            except Exception as exc:  # pragma: no cover - best-effort upload
+                self.stderr.write(f"Failed to upload report to S3: {exc}\n")
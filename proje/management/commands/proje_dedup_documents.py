@@ -0,0 +1,56 @@
+"""Management command to collapse duplicate document files.
+
+Documents with identical content (same `sha256`, see
+`proje_document_metadata`) are pointed at one stored file and the other
+copies are deleted once no row references them.
+"""
+
+# pylint: disable=django-not-configured
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from proje.models import Document
+from proje.storage import blob_reference_count
+
+
+class Command(BaseCommand):
+    """Point documents with identical content at a single stored file."""
+    help = "Deduplicate document files by content hash (run proje_document_metadata first)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report what would be merged and deleted",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options.get("dry_run")
+        storage = Document._meta.get_field("file").storage  # pylint: disable=protected-access
+        digests = (
+            Document.objects.exclude(sha256="")
+            .values("sha256")
+            .annotate(names=Count("file", distinct=True))
+            .filter(names__gt=1)
+            .values_list("sha256", flat=True)
+        )
+
+        repointed = deleted = 0
+        for digest in digests.iterator():
+            docs = Document.objects.filter(sha256=digest)
+            keep = docs.order_by("pk").values_list("file", flat=True).first()
+            duplicates = set(docs.exclude(file=keep).values_list("file", flat=True))
+            if dry_run:
+                self.stdout.write(f"[dry-run] {keep} <- {', '.join(sorted(duplicates))}\n")
+                repointed += docs.exclude(file=keep).count()
+                continue
+            with transaction.atomic():
+                repointed += docs.exclude(file=keep).update(file=keep)
+            for name in duplicates:
+                if not blob_reference_count(name) and storage.exists(name):
+                    storage.delete(name)
+                    deleted += 1
+
+        prefix = "[dry-run] " if dry_run else ""
+        self.stdout.write(f"{prefix}Repointed {repointed} documents, deleted {deleted} files\n")
@@ -0,0 +1,51 @@
+"""Management command to backfill file metadata on existing documents.
+
+Reads each stored file once and fills `size`, `content_type`, `sha256`,
+`width` and `height` on `Document` rows uploaded before these columns
+existed.
+"""
+
+# pylint: disable=django-not-configured
+from django.core.management.base import BaseCommand
+
+from proje.file_metadata import METADATA_FIELDS, apply_file_metadata
+from proje.models import Document
+from proje.utils import chunked
+
+
+class Command(BaseCommand):
+    """Fill missing file metadata columns on `Document` rows."""
+    help = "Backfill size, content type, SHA-256 and image dimensions of documents"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute metadata for every document, not only those missing it",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Rows updated per query (default: %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        docs = Document.objects.exclude(file="").order_by("pk")
+        if not options.get("all"):
+            docs = docs.filter(sha256="")
+
+        updated = missing = 0
+        for batch in chunked(docs.iterator(chunk_size=options["batch_size"]), options["batch_size"]):
+            changed = []
+            for doc in batch:
+                try:
+                    apply_file_metadata(doc)
+                except OSError as exc:
+                    missing += 1
+                    self.stderr.write(f"Skipping {doc.file.name}: {exc}\n")
+                    continue
+                changed.append(doc)
+            Document.objects.bulk_update(changed, METADATA_FIELDS)
+            updated += len(changed)
+        self.stdout.write(f"Updated metadata for {updated} documents ({missing} unreadable)\n")
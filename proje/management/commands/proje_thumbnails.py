@@ -0,0 +1,59 @@
+"""Management command to backfill WebP thumbnails for image documents.
+
+Walks every `Document` whose file has an image extension and creates the
+missing derivatives described in `proje.thumbnails`.
+"""
+
+# pylint: disable=django-not-configured
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from proje.models import Document
+from proje.thumbnails import IMAGE_EXTENSIONS, generate_thumbnails
+
+
+def _image_documents():
+    query = Q()
+    for ext in IMAGE_EXTENSIONS:
+        query |= Q(file__iendswith=ext)
+    return Document.objects.filter(query).only("pk", "file").order_by("pk")
+
+
+class Command(BaseCommand):
+    """Generate missing thumbnails for existing image documents."""
+    help = "Generate missing WebP thumbnails for existing image documents in proje_documents/"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-render thumbnails even when they already exist",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Documents processed concurrently (default: %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        force = options.get("force")
+        docs = _image_documents().iterator(chunk_size=500)
+
+        def _process(doc):
+            try:
+                return bool(generate_thumbnails(doc.file, force=force))
+            except OSError as exc:
+                self.stderr.write(f"Skipping {doc.file.name}: {exc}\n")
+                return False
+
+        done = failed = 0
+        with ThreadPoolExecutor(max_workers=max(1, options.get("workers") or 1)) as pool:
+            for ok in pool.map(_process, docs):
+                if ok:
+                    done += 1
+                else:
+                    failed += 1
+        self.stdout.write(f"Thumbnails ready for {done} documents ({failed} skipped)\n")
@@ -0,0 +1,36 @@
+"""Management command to rebuild the owner/unit/document search index.
+
+Recomputes the folded ``search_text`` column (see `proje.search`) for rows
+whose value is stale, e.g. after bulk writes that bypass signals, and
+recreates missing SQLite FTS5 tables and triggers.
+"""
+
+# pylint: disable=django-not-configured
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from proje.search import SEARCH_SOURCES, ensure_search_index, rebuild_search_text
+
+
+class Command(BaseCommand):
+    """Refresh search_text columns and the search index."""
+    help = "Recompute search_text for owners, units and documents and repair the search index"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Rows read and updated per batch (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database whose SQLite FTS index is repaired (default: %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        for model in SEARCH_SOURCES:
+            changed = rebuild_search_text(model, chunk_size=options["chunk_size"])
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {changed} rows updated\n")
+        ensure_search_index(options["database"])
@@ -0,0 +1,42 @@
+"""Management command to reconcile the denormalised project counters.
+
+Recomputes unit, owner, document and agreement-status counters (see
+`proje.counters`) with one correlated-subquery UPDATE over the drifted
+projects.
+"""
+
+# pylint: disable=django-not-configured
+from django.core.management.base import BaseCommand
+
+from proje.counters import recount_projects
+from proje.models import Project
+
+
+class Command(BaseCommand):
+    """Fix project counters that drifted from the underlying rows."""
+    help = "Recompute Project unit/owner/document/agreement counters and fix drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project",
+            action="append",
+            dest="codes",
+            metavar="CODE",
+            help="Only recount the project with this code (repeatable)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report projects whose counters drifted",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Project.objects.all()
+        if options.get("codes"):
+            queryset = queryset.filter(code__in=options["codes"])
+        dry_run = options.get("dry_run")
+        drifted = recount_projects(queryset, dry_run=dry_run)
+        if dry_run:
+            self.stdout.write(f"[dry-run] {len(drifted)} projects have drifted counters\n")
+        else:
+            self.stdout.write(f"Recounted {len(drifted)} drifted projects\n")
@@ -0,0 +1,82 @@
+"""Project membership resolution for the `proje` app.
+
+A user is a member of a project when they are its manager or one of its
+staff. Membership is resolved for all projects at once with a single query,
+memoised on the user object for the lifetime of the request and shared
+across requests through the Django cache. Signal handlers in
+`proje.signals` invalidate the cached entry when `Project.staff` or
+`Project.manager` change.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from proje.models import Project
+from proje.replica import read_primary
+
+# attribute used to memoise membership on the (per-request) user object
+_REQUEST_ATTR = "_proje_member_project_ids"
+
+
+def _cache_key(user_pk):
+    return f"proje:membership:{user_pk}"
+
+
+def _cache_timeout():
+    return getattr(settings, "PROJE_MEMBERSHIP_CACHE_TIMEOUT", 300)
+
+
+def member_project_ids(user):
+    """Return a frozenset of project ids `user` manages or is staff on.
+
+    The result is loaded with one query, stored on `user` for the rest of
+    the request and cached across requests under a per-user key.
+    """
+    if user is None or not getattr(user, "is_authenticated", False):
+        return frozenset()
+
+    ids = getattr(user, _REQUEST_ATTR, None)
+    if ids is not None:
+        return ids
+
+    key = _cache_key(user.pk)
+    ids = cache.get(key)
+    if ids is None:
+        # shared across requests: never fill it from a lagging replica
+        with read_primary():
+            ids = frozenset(
+                Project.objects.filter(Q(manager=user) | Q(staff=user))
+                .values_list("pk", flat=True)
+                .distinct()
+            )
+        cache.set(key, ids, _cache_timeout())
+
+    setattr(user, _REQUEST_ATTR, ids)
+    return ids
+
+
+def is_member(user, project_id):
+    """Return True if `user` is a manager or staff member of the project.
+
+    Superusers bypass the check. `project_id` may be an int or a string
+    primary key; invalid values are treated as non-membership.
+    """
+    if getattr(user, "is_superuser", False):
+        return True
+    try:
+        project_id = int(project_id)
+    except (TypeError, ValueError):
+        return False
+    return project_id in member_project_ids(user)
+
+
+def invalidate_membership(*user_pks):
+    """Drop cached membership for the given user primary keys.
+
+    `None` values are ignored so callers can pass nullable foreign keys
+    (e.g. `Project.manager_id`) directly.
+    """
+    keys = [_cache_key(pk) for pk in user_pks if pk is not None]
+    if keys:
+        cache.delete_many(keys)
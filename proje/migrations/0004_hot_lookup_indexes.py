@@ -0,0 +1,62 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:35
+# pylint: disable=invalid-name
+
+"""Add composite and functional indexes for hot `proje` lookups.
+
+Covers unit filters by project/status and project/ada/parsel, owner name,
+TC and case-insensitive e-mail lookups, per-project/per-unit document
+listings and agreement history per unit.
+"""
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    """Migration that adds lookup indexes to `proje` models."""
+
+    dependencies = [
+        ('proje', '0003_document_label'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='agreement',
+            index=models.Index(fields=['unit', 'date'], name='proje_agreement_unit_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['project', 'uploaded_at'], name='proje_doc_proj_uploaded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['unit', 'uploaded_at'], name='proje_doc_unit_uploaded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['uploaded_at', 'id'], name='proje_doc_uploaded_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='owner',
+            index=models.Index(fields=['project', 'last_name', 'first_name'], name='proje_owner_proj_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='owner',
+            index=models.Index(fields=['tc_no'], name='proje_owner_tc_no_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='owner',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='proje_owner_email_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='unit',
+            index=models.Index(fields=['project', 'agreement_status'], name='proje_unit_proj_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='unit',
+            index=models.Index(fields=['project', 'ada', 'parsel'], name='proje_unit_proj_ada_parsel_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:41
+# pylint: disable=invalid-name
+
+"""Add the `OwnerAssignJob` model backing background owner group assignment."""
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    """Migration that creates the `OwnerAssignJob` table."""
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('proje', '0004_hot_lookup_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OwnerAssignJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('owner_ids', models.JSONField(blank=True, default=list, verbose_name='Malikler')),
+                ('dry_run', models.BooleanField(default=False)),
+                ('options', models.JSONField(blank=True, default=dict, help_text='Rapor ve S3 yükleme seçenekleri')),
+                ('status', models.CharField(choices=[('beklemede', 'Beklemede'), ('calisiyor', 'Çalışıyor'), ('tamamlandi', 'Tamamlandı'), ('hata', 'Hata')], default='beklemede', max_length=20, verbose_name='Durum')),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('processed', models.PositiveIntegerField(default=0)),
+                ('assigned', models.PositiveIntegerField(default=0)),
+                ('report_file', models.CharField(blank=True, max_length=500)),
+                ('report_file_url', models.CharField(blank=True, max_length=500)),
+                ('report_s3_url', models.TextField(blank=True)),
+                ('error', models.TextField(blank=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='auth.group')),
+            ],
+            options={
+                'verbose_name': 'Grup Atama İşi',
+                'verbose_name_plural': 'Grup Atama İşleri',
+                'ordering': ['-created'],
+            },
+        ),
+    ]
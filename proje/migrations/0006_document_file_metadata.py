@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:53
+# pylint: disable=invalid-name
+
+"""Store file metadata on `Document` (filled by `proje_document_metadata`)."""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    """Migration that adds size, type, hash and dimension columns to `Document`."""
+
+    dependencies = [
+        ('proje', '0005_owner_assign_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='content_type',
+            field=models.CharField(blank=True, editable=False, max_length=100, verbose_name='İçerik Türü'),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Yükseklik'),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='sha256',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64, verbose_name='SHA-256'),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='size',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True, verbose_name='Boyut (bayt)'),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Genişlik'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:56
+# pylint: disable=invalid-name
+
+"""Content-addressed storage for document and owner uploads."""
+
+import proje.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    """Migration that switches upload fields to `upload_storage` and indexes them."""
+
+    dependencies = [
+        ('proje', '0006_document_file_metadata'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='document',
+            name='file',
+            field=models.FileField(db_index=True, max_length=255, storage=proje.storage.upload_storage, upload_to='proje_documents/'),
+        ),
+        migrations.AlterField(
+            model_name='owner',
+            name='id_scan',
+            field=models.FileField(blank=True, db_index=True, max_length=255, null=True, storage=proje.storage.upload_storage, upload_to='owners/id/', verbose_name='Kimlik Fotokopisi'),
+        ),
+        migrations.AlterField(
+            model_name='owner',
+            name='photo',
+            field=models.ImageField(blank=True, db_index=True, max_length=255, null=True, storage=proje.storage.upload_storage, upload_to='owners/photos/', verbose_name='Vesikalık Resim'),
+        ),
+    ]
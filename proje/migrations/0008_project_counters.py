@@ -0,0 +1,91 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:58
+# pylint: disable=invalid-name
+
+"""Denormalised counters on `Project` (see `proje.counters`)."""
+
+from django.db import migrations, models
+from django.db.models import F, Func, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+AGREEMENT_COUNTER_FIELDS = {
+    "beklemede": "unit_beklemede_count",
+    "saglandi": "unit_saglandi_count",
+    "istemiyor": "unit_istemiyor_count",
+    "ulasilamadi": "unit_ulasilamadi_count",
+}
+
+
+def _count(queryset):
+    counted = queryset.order_by().annotate(n=Func(F("pk"), function="COUNT")).values("n")
+    return Coalesce(Subquery(counted[:1], output_field=IntegerField()), 0)
+
+
+def fill_counters(apps, schema_editor):
+    """Compute the initial counters (mirrors proje.counters.counter_expressions)."""
+    _ = schema_editor
+    project_model = apps.get_model("proje", "Project")
+    unit_model = apps.get_model("proje", "Unit")
+    owner_model = apps.get_model("proje", "Owner")
+    document_model = apps.get_model("proje", "Document")
+    project = OuterRef("pk")
+    units = unit_model.objects.filter(project=project)
+    values = {
+        "unit_count": _count(units),
+        "owner_count": _count(owner_model.objects.filter(project=project)),
+        "document_count": _count(
+            document_model.objects.filter(
+                Q(project=project) | Q(project__isnull=True, unit__project=project)
+            )
+        ),
+    }
+    for status, field in AGREEMENT_COUNTER_FIELDS.items():
+        values[field] = _count(units.filter(agreement_status=status))
+    project_model.objects.update(**values)
+
+
+class Migration(migrations.Migration):
+
+    """Migration that adds the counter columns and fills them from existing rows."""
+
+    dependencies = [
+        ('proje', '0007_content_addressed_uploads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='document_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Dosya Sayısı'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='owner_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Malik Sayısı'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='unit_beklemede_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Uzlaşma Beklemede'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='unit_istemiyor_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Uzlaşma İstemiyor'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='unit_saglandi_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Uzlaşma Sağlandı'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='unit_ulasilamadi_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Ulaşılamıyor'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='unit_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Mevcut Bağımsız Bölüm Sayısı'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.8 on 2026-10-18 14:01
+# pylint: disable=invalid-name
+
+"""Add the `ProjectDailyStats` snapshot table behind the dashboard."""
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    """Migration that creates the `ProjectDailyStats` table."""
+
+    dependencies = [
+        ('proje', '0008_project_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Tarih')),
+                ('unit_count', models.PositiveIntegerField(default=0, verbose_name='Bağımsız Bölüm')),
+                ('owner_count', models.PositiveIntegerField(default=0, verbose_name='Malik')),
+                ('document_count', models.PositiveIntegerField(default=0, verbose_name='Dosya')),
+                ('documents_added', models.PositiveIntegerField(default=0, verbose_name='Eklenen Dosya')),
+                ('unit_beklemede_count', models.PositiveIntegerField(default=0, verbose_name='Uzlaşma Beklemede')),
+                ('unit_saglandi_count', models.PositiveIntegerField(default=0, verbose_name='Uzlaşma Sağlandı')),
+                ('unit_istemiyor_count', models.PositiveIntegerField(default=0, verbose_name='Uzlaşma İstemiyor')),
+                ('unit_ulasilamadi_count', models.PositiveIntegerField(default=0, verbose_name='Ulaşılamıyor')),
+                ('unit_types', models.JSONField(blank=True, default=dict, verbose_name='Tip Dağılımı')),
+                ('occupancy', models.JSONField(blank=True, default=dict, verbose_name='Oturum Dağılımı')),
+                ('member_ids', models.JSONField(blank=True, default=list, verbose_name='Ekip')),
+                ('created', models.DateTimeField(auto_now=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='proje.project')),
+            ],
+            options={
+                'verbose_name': 'Proje Günlük İstatistiği',
+                'verbose_name_plural': 'Proje Günlük İstatistikleri',
+                'indexes': [models.Index(fields=['date', 'project'], name='proje_dailystats_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('project', 'date'), name='proje_dailystats_project_date_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,121 @@
+# Generated by Django 5.2.8 on 2026-10-18 14:12
+# pylint: disable=invalid-name
+
+"""Folded ``search_text`` columns and their search indexes (see `proje.search`).
+
+On PostgreSQL the ``pg_trgm`` extension and one GIN trigram index per
+table are created; the SQLite FTS5 tables are (re)built by
+`proje.search.ensure_search_index` after ``migrate``.
+"""
+
+import unicodedata
+from pathlib import PurePosixPath
+
+from django.db import migrations, models
+
+SEARCH_SOURCES = {
+    "owner": ("first_name", "last_name", "tc_no"),
+    "unit": ("ada", "parsel", "address", "door_outside", "door_inside"),
+    "document": ("label", "file"),
+}
+
+TRIGRAM_INDEXES = {
+    "proje_owner": "proje_owner_search_trgm",
+    "proje_unit": "proje_unit_search_trgm",
+    "proje_document": "proje_doc_search_trgm",
+}
+
+_TURKISH_FOLD = str.maketrans({
+    "İ": "i", "I": "i", "ı": "i", "Ş": "s", "ş": "s", "Ğ": "g", "ğ": "g",
+    "Ü": "u", "ü": "u", "Ö": "o", "ö": "o", "Ç": "c", "ç": "c",
+})
+
+
+def _fold(text):
+    """Mirror of proje.search.fold at the time of this migration."""
+    text = unicodedata.normalize("NFKC", str(text or "")).translate(_TURKISH_FOLD).casefold()
+    text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return " ".join(text.split())
+
+
+def fill_search_text(apps, schema_editor):
+    """Compute ``search_text`` for existing rows in batches."""
+    _ = schema_editor
+    for model_name, fields in SEARCH_SOURCES.items():
+        model = apps.get_model("proje", model_name)
+        batch = []
+        for obj in model.objects.only("pk", *fields).iterator(chunk_size=1000):
+            values = []
+            for name in fields:
+                value = getattr(obj, name)
+                if name == "file":
+                    value = PurePosixPath(value.name).name if value else ""
+                values.append(value)
+            obj.search_text = _fold(" ".join(str(v) for v in values if v))
+            batch.append(obj)
+            if len(batch) >= 1000:
+                model.objects.bulk_update(batch, ["search_text"])
+                batch = []
+        model.objects.bulk_update(batch, ["search_text"])
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """GIN trigram indexes so ``LIKE '%term%'`` on search_text uses an index."""
+    _ = apps
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, index in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {index} ON {table} USING gin (search_text gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    """Reverse of `create_trigram_indexes` (the extension is left installed)."""
+    _ = apps
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for index in TRIGRAM_INDEXES.values():
+        schema_editor.execute(f"DROP INDEX IF EXISTS {index}")
+
+
+def drop_fts_index(apps, schema_editor):
+    """Drop the SQLite FTS5 tables/triggers before search_text is removed."""
+    _ = apps
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for table in TRIGRAM_INDEXES:
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {table}_fts")
+
+
+class Migration(migrations.Migration):
+
+    """Migration that adds and fills search_text and its trigram indexes."""
+
+    dependencies = [
+        ('proje', '0009_project_daily_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='owner',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='unit',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(migrations.RunPython.noop, drop_fts_index),
+        migrations.RunPython(fill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
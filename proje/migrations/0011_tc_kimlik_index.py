@@ -0,0 +1,40 @@
+# Generated by Django 5.2.8 on 2026-10-18 14:18
+# pylint: disable=invalid-name
+
+"""Normalised, indexed TC kimlik number on `Owner` (see `core.tc_kimlik`).
+
+Existing values are reduced to digits and, when ``TC_HASH_KEY`` is set,
+hashed; invalid numbers are kept (normalised) for staff to correct.
+"""
+
+import core.tc_kimlik
+from django.db import migrations, models
+
+
+def backfill_tc(apps, schema_editor):
+    """Normalise stored TC numbers and fill tc_hash."""
+    _ = schema_editor
+    core.tc_kimlik.rebuild_tc_index(apps.get_model("proje", "Owner"))
+
+
+class Migration(migrations.Migration):
+
+    """Migration that adds tc_hash and backfills it and tc_no."""
+
+    dependencies = [
+        ('proje', '0010_search_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='owner',
+            name='tc_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64, verbose_name='TC Özeti'),
+        ),
+        migrations.AlterField(
+            model_name='owner',
+            name='tc_no',
+            field=models.CharField(blank=True, max_length=20, validators=[core.tc_kimlik.validate_tc], verbose_name='TC'),
+        ),
+        migrations.RunPython(backfill_tc, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 5.2.8 on 2026-10-18 14:21
+# pylint: disable=invalid-name
+
+"""Registry import keys on `Unit` and `Owner` (see `proje.registry_import`).
+
+Existing rows are keyed where the key is unambiguous: the first unit (by
+id) of each project/ada/parsel/door combination and the first owner of
+each project/TC number. Later duplicates keep a NULL key, which never
+conflicts, so the unique constraints can be added without touching data.
+"""
+
+import unicodedata
+
+from django.db import migrations, models
+
+import core.tc_kimlik
+
+_TURKISH_FOLD = str.maketrans({
+    "İ": "i", "I": "i", "ı": "i", "Ş": "s", "ş": "s", "Ğ": "g", "ğ": "g",
+    "Ü": "u", "ü": "u", "Ö": "o", "ö": "o", "Ç": "c", "ç": "c",
+})
+
+
+def _fold(text):
+    """Mirror of proje.search.fold at the time of this migration."""
+    text = unicodedata.normalize("NFKC", str(text or "")).translate(_TURKISH_FOLD).casefold()
+    text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return " ".join(text.split())
+
+
+def _assign(model, fields, make_key):
+    seen = set()
+    batch = []
+    for obj in model.objects.only("pk", "project_id", *fields).order_by("pk").iterator(chunk_size=1000):
+        key = make_key(obj)
+        if not key or (obj.project_id, key) in seen:
+            continue
+        seen.add((obj.project_id, key))
+        obj.import_key = key
+        batch.append(obj)
+        if len(batch) >= 1000:
+            model.objects.bulk_update(batch, ["import_key"])
+            batch = []
+    model.objects.bulk_update(batch, ["import_key"])
+
+
+def fill_import_keys(apps, schema_editor):
+    """Key existing units and owners (mirrors proje.registry_import)."""
+    _ = schema_editor
+
+    def unit_key(unit):
+        if not (unit.ada.strip() and unit.parsel.strip()):
+            return None
+        parts = (unit.ada, unit.parsel, unit.door_outside, unit.door_inside)
+        return "|".join(_fold(part) for part in parts)
+
+    def owner_key(owner):
+        return owner.tc_no if core.tc_kimlik.is_valid_tc(owner.tc_no) else None
+
+    _assign(
+        apps.get_model("proje", "Unit"),
+        ("ada", "parsel", "door_outside", "door_inside"),
+        unit_key,
+    )
+    _assign(apps.get_model("proje", "Owner"), ("tc_no",), owner_key)
+
+
+class Migration(migrations.Migration):
+
+    """Migration that adds, fills and constrains the registry import keys."""
+
+    dependencies = [
+        ('proje', '0011_tc_kimlik_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='owner',
+            name='import_key',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, verbose_name='Aktarım Anahtarı'),
+        ),
+        migrations.AddField(
+            model_name='unit',
+            name='import_key',
+            field=models.CharField(blank=True, editable=False, max_length=200, null=True, verbose_name='Aktarım Anahtarı'),
+        ),
+        migrations.RunPython(fill_import_keys, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='owner',
+            constraint=models.UniqueConstraint(fields=('project', 'import_key'), name='proje_owner_import_key_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='unit',
+            constraint=models.UniqueConstraint(fields=('project', 'import_key'), name='proje_unit_import_key_uniq'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.8 on 2026-10-18 14:30
+# pylint: disable=invalid-name
+
+"""Cached ownership share total on `Unit` (see `proje.shares`).
+
+Existing units are filled with one correlated-subquery UPDATE.
+"""
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_share_totals(apps, schema_editor):
+    """Sum each unit's shares (mirrors proje.shares.share_total_expression)."""
+    _ = schema_editor
+    Unit = apps.get_model("proje", "Unit")
+    Ownership = apps.get_model("proje", "Ownership")
+    total = (
+        Ownership.objects.filter(unit=OuterRef("pk"))
+        .order_by()
+        .values("unit")
+        .annotate(total=Sum("share_percent"))
+        .values("total")
+    )
+    Unit.objects.update(
+        share_total=Coalesce(
+            Subquery(total[:1], output_field=models.DecimalField(max_digits=8, decimal_places=2)),
+            Value(Decimal(0)),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    """Migration that adds, fills and indexes `Unit.share_total`."""
+
+    dependencies = [
+        ('proje', '0012_registry_import_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='unit',
+            name='share_total',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=8, verbose_name='Hisse Toplamı'),
+        ),
+        migrations.RunPython(fill_share_totals, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='unit',
+            index=models.Index(fields=['project', 'share_total'], name='proje_unit_proj_share_idx'),
+        ),
+    ]
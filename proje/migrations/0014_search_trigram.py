@@ -0,0 +1,76 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:05
+# pylint: disable=invalid-name
+
+"""Substring matching on SQLite and no TC numbers in ``search_text``.
+
+The SQLite FTS5 tables are dropped here and recreated with the ``trigram``
+tokenizer by `proje.search.ensure_search_index` after ``migrate``. Owner
+``search_text`` is refilled from the names only.
+"""
+
+import unicodedata
+
+from django.db import migrations
+
+FTS_TABLES = ("proje_owner", "proje_unit", "proje_document")
+
+_TURKISH_FOLD = str.maketrans({
+    "İ": "i", "I": "i", "ı": "i", "Ş": "s", "ş": "s", "Ğ": "g", "ğ": "g",
+    "Ü": "u", "ü": "u", "Ö": "o", "ö": "o", "Ç": "c", "ç": "c",
+})
+
+
+def _fold(text):
+    """Mirror of proje.search.fold at the time of this migration."""
+    text = unicodedata.normalize("NFKC", str(text or "")).translate(_TURKISH_FOLD).casefold()
+    text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return " ".join(text.split())
+
+
+def drop_fts_index(apps, schema_editor):
+    """Drop the SQLite FTS5 tables/triggers so they are rebuilt after migrate."""
+    _ = apps
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for table in FTS_TABLES:
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {table}_fts")
+
+
+def _fill_owner_search_text(apps, fields):
+    Owner = apps.get_model("proje", "Owner")
+    batch = []
+    for owner in Owner.objects.only("pk", *fields).iterator(chunk_size=1000):
+        owner.search_text = _fold(" ".join(str(v) for v in (getattr(owner, f) for f in fields) if v))
+        batch.append(owner)
+        if len(batch) >= 1000:
+            Owner.objects.bulk_update(batch, ["search_text"])
+            batch = []
+    Owner.objects.bulk_update(batch, ["search_text"])
+
+
+def drop_tc_from_search_text(apps, schema_editor):
+    """Refill owner ``search_text`` from first and last name."""
+    _ = schema_editor
+    _fill_owner_search_text(apps, ("first_name", "last_name"))
+
+
+def restore_tc_in_search_text(apps, schema_editor):
+    """Reverse of `drop_tc_from_search_text` (as filled by migration 0010)."""
+    _ = schema_editor
+    _fill_owner_search_text(apps, ("first_name", "last_name", "tc_no"))
+
+
+class Migration(migrations.Migration):
+
+    """Migration that rebuilds the SQLite search index and owner search text."""
+
+    dependencies = [
+        ('proje', '0013_unit_share_total'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_fts_index, drop_fts_index),
+        migrations.RunPython(drop_tc_from_search_text, restore_tc_in_search_text),
+    ]
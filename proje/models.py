@@ -6,6 +6,11 @@ application. Model field definitions and choice lists live here.
 
 from django.conf import settings
 from django.db import models
+from django.db.models.functions import Lower
+
+from core.tc_kimlik import validate_tc
+
+from .storage import upload_storage
 
 
 class Project(models.Model):
@@ -55,7 +60,24 @@ class Project(models.Model):
     staff = models.ManyToManyField(
         settings.AUTH_USER_MODEL, blank=True, related_name="projects"
     )
-    unit_count = models.PositiveIntegerField("Mevcut Bağımsız Bölüm Sayısı", default=0)
+    # denormalised counters maintained by proje.counters / proje.signals
+    unit_count = models.PositiveIntegerField(
+        "Mevcut Bağımsız Bölüm Sayısı", default=0, editable=False
+    )
+    owner_count = models.PositiveIntegerField("Malik Sayısı", default=0, editable=False)
+    document_count = models.PositiveIntegerField("Dosya Sayısı", default=0, editable=False)
+    unit_beklemede_count = models.PositiveIntegerField(
+        "Uzlaşma Beklemede", default=0, editable=False
+    )
+    unit_saglandi_count = models.PositiveIntegerField(
+        "Uzlaşma Sağlandı", default=0, editable=False
+    )
+    unit_istemiyor_count = models.PositiveIntegerField(
+        "Uzlaşma İstemiyor", default=0, editable=False
+    )
+    unit_ulasilamadi_count = models.PositiveIntegerField(
+        "Ulaşılamıyor", default=0, editable=False
+    )
     created = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
 
@@ -83,7 +105,16 @@ class Owner(models.Model):
     first_name = models.CharField("Ad", max_length=100)
     last_name = models.CharField("Soyad", max_length=100)
     birth_date = models.DateField("Doğum Tarihi", null=True, blank=True)
-    tc_no = models.CharField("TC", max_length=20, blank=True)
+    # digits only (normalised on save) and checksum-validated in forms; see
+    # core.tc_kimlik for the keyed hash and the exact-lookup fast path
+    tc_no = models.CharField("TC", max_length=20, blank=True, validators=[validate_tc])
+    tc_hash = models.CharField("TC Özeti", max_length=64, blank=True, editable=False, db_index=True)
+    # registry identity (normalised TC, or name and unit for owners without
+    # one) used by proje.registry_import upserts; NULL for owners that were
+    # never imported or keyed
+    import_key = models.CharField(
+        "Aktarım Anahtarı", max_length=64, null=True, blank=True, editable=False
+    )
     phone = models.CharField("Telefon", max_length=30, blank=True)
     email = models.EmailField("E-Posta", blank=True)
     landline = models.CharField("Sabit Tel", max_length=30, blank=True)
@@ -97,15 +128,43 @@ class Owner(models.Model):
     )
     residence_city = models.CharField("İkamet İli", max_length=100, blank=True)
     photo = models.ImageField(
-        "Vesikalık Resim", upload_to="owners/photos/", null=True, blank=True
+        "Vesikalık Resim",
+        upload_to="owners/photos/",
+        storage=upload_storage,
+        max_length=255,
+        null=True,
+        blank=True,
+        db_index=True,
     )
     id_scan = models.FileField(
-        "Kimlik Fotokopisi", upload_to="owners/id/", null=True, blank=True
+        "Kimlik Fotokopisi",
+        upload_to="owners/id/",
+        storage=upload_storage,
+        max_length=255,
+        null=True,
+        blank=True,
+        db_index=True,
     )
+    # folded copy of the searchable fields, see proje.search
+    search_text = models.TextField(blank=True, default="", editable=False)
 
     class Meta:
         verbose_name = "Malik"
         verbose_name_plural = "Malikler"
+        indexes = [
+            models.Index(
+                fields=["project", "last_name", "first_name"],
+                name="proje_owner_proj_name_idx",
+            ),
+            models.Index(fields=["tc_no"], name="proje_owner_tc_no_idx"),
+            # case-insensitive e-mail matching (owner -> user assignment)
+            models.Index(Lower("email"), name="proje_owner_email_lower_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["project", "import_key"], name="proje_owner_import_key_uniq"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -162,10 +221,38 @@ class Unit(models.Model):
     owners = models.ManyToManyField(
         Owner, through="Ownership", blank=True, related_name="units"
     )
+    # cached sum of the ownership shares, maintained by proje.signals; see
+    # proje.shares for validation and reconciliation
+    share_total = models.DecimalField(
+        "Hisse Toplamı", max_digits=8, decimal_places=2, default=0, editable=False
+    )
+    # folded "ada|parsel|door_outside|door_inside" used by
+    # proje.registry_import upserts; NULL for units never imported or keyed
+    import_key = models.CharField(
+        "Aktarım Anahtarı", max_length=200, null=True, blank=True, editable=False
+    )
+    # folded copy of the searchable fields, see proje.search
+    search_text = models.TextField(blank=True, default="", editable=False)
 
     class Meta:
         verbose_name = "Bağımsız Bölüm"
         verbose_name_plural = "Bağımsız Bölümler"
+        indexes = [
+            models.Index(
+                fields=["project", "agreement_status"], name="proje_unit_proj_status_idx"
+            ),
+            models.Index(
+                fields=["project", "ada", "parsel"], name="proje_unit_proj_ada_parsel_idx"
+            ),
+            models.Index(
+                fields=["project", "share_total"], name="proje_unit_proj_share_idx"
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["project", "import_key"], name="proje_unit_import_key_uniq"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.project.code} - {self.ada}/{self.parsel}"
@@ -201,6 +288,9 @@ class Agreement(models.Model):
     class Meta:
         verbose_name = "Uzlaşma"
         verbose_name_plural = "Uzlaşmalar"
+        indexes = [
+            models.Index(fields=["unit", "date"], name="proje_agreement_unit_date_idx"),
+        ]
 
 
 class Document(models.Model):
@@ -215,16 +305,148 @@ class Document(models.Model):
     unit = models.ForeignKey(
         Unit, on_delete=models.CASCADE, related_name="documents", null=True, blank=True
     )
-    file = models.FileField(upload_to="proje_documents/")
+    # content-addressed when PROJE_CONTENT_ADDRESSED_UPLOADS is on; indexed
+    # for the blob reference counts in proje.storage
+    file = models.FileField(
+        upload_to="proje_documents/", storage=upload_storage, max_length=255, db_index=True
+    )
     label = models.CharField("Dosya Adı", max_length=200, blank=True)
     uploaded_by = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True
     )
     uploaded_at = models.DateTimeField(auto_now_add=True)
+    # file metadata captured at upload (see proje.file_metadata) so lists
+    # and previews never have to stat or HEAD the stored file
+    size = models.PositiveBigIntegerField("Boyut (bayt)", null=True, blank=True, editable=False)
+    content_type = models.CharField("İçerik Türü", max_length=100, blank=True, editable=False)
+    sha256 = models.CharField("SHA-256", max_length=64, blank=True, editable=False, db_index=True)
+    width = models.PositiveIntegerField("Genişlik", null=True, blank=True, editable=False)
+    height = models.PositiveIntegerField("Yükseklik", null=True, blank=True, editable=False)
+    # folded copy of the searchable fields, see proje.search
+    search_text = models.TextField(blank=True, default="", editable=False)
 
     class Meta:
         verbose_name = "Proje Dosyası"
         verbose_name_plural = "Proje Dosyaları"
+        indexes = [
+            models.Index(
+                fields=["project", "uploaded_at"], name="proje_doc_proj_uploaded_idx"
+            ),
+            models.Index(fields=["unit", "uploaded_at"], name="proje_doc_unit_uploaded_idx"),
+            # keyset pagination of DocumentListView on (uploaded_at, id)
+            models.Index(fields=["uploaded_at", "id"], name="proje_doc_uploaded_id_idx"),
+        ]
 
     def __str__(self):
         return self.file.name.split("/")[-1]
+
+
+class OwnerAssignJob(models.Model):
+    """Background run of the owner -> user group assignment admin action.
+
+    Stores the selected owners and report options, and tracks progress and
+    the resulting report while a worker processes the job.
+    """
+    STATUS = [
+        ("beklemede", "Beklemede"),
+        ("calisiyor", "Çalışıyor"),
+        ("tamamlandi", "Tamamlandı"),
+        ("hata", "Hata"),
+    ]
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    group = models.ForeignKey(
+        "auth.Group", on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    owner_ids = models.JSONField("Malikler", default=list, blank=True)
+    dry_run = models.BooleanField(default=False)
+    options = models.JSONField(
+        default=dict, blank=True, help_text="Rapor ve S3 yükleme seçenekleri"
+    )
+    status = models.CharField(
+        "Durum", max_length=20, choices=STATUS, default="beklemede"
+    )
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    assigned = models.PositiveIntegerField(default=0)
+    report_file = models.CharField(max_length=500, blank=True)
+    report_file_url = models.CharField(max_length=500, blank=True)
+    report_s3_url = models.TextField(blank=True)
+    error = models.TextField(blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Grup Atama İşi"
+        verbose_name_plural = "Grup Atama İşleri"
+        ordering = ["-created"]
+
+    def __str__(self):
+        return f"#{self.pk} {self.group} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        """True once the job has completed or failed."""
+        return self.status in ("tamamlandi", "hata")
+
+    @property
+    def progress_percent(self):
+        """Processed owners as an integer percentage of the selection."""
+        if not self.total:
+            return 100 if self.is_finished else 0
+        return min(100, int(self.processed * 100 / self.total))
+
+
+class ProjectDailyStats(models.Model):
+    """Daily KPI snapshot of one project, written by `proje.stats`.
+
+    The dashboard reads the latest snapshot rows instead of aggregating the
+    operational tables on every request.
+    """
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="daily_stats"
+    )
+    date = models.DateField("Tarih")
+    unit_count = models.PositiveIntegerField("Bağımsız Bölüm", default=0)
+    owner_count = models.PositiveIntegerField("Malik", default=0)
+    document_count = models.PositiveIntegerField("Dosya", default=0)
+    documents_added = models.PositiveIntegerField("Eklenen Dosya", default=0)
+    unit_beklemede_count = models.PositiveIntegerField("Uzlaşma Beklemede", default=0)
+    unit_saglandi_count = models.PositiveIntegerField("Uzlaşma Sağlandı", default=0)
+    unit_istemiyor_count = models.PositiveIntegerField("Uzlaşma İstemiyor", default=0)
+    unit_ulasilamadi_count = models.PositiveIntegerField("Ulaşılamıyor", default=0)
+    # {Unit.type: count} and {Unit.occupancy: count}
+    unit_types = models.JSONField("Tip Dağılımı", default=dict, blank=True)
+    occupancy = models.JSONField("Oturum Dağılımı", default=dict, blank=True)
+    # manager and staff user ids at snapshot time (staff workload)
+    member_ids = models.JSONField("Ekip", default=list, blank=True)
+    created = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Proje Günlük İstatistiği"
+        verbose_name_plural = "Proje Günlük İstatistikleri"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["project", "date"], name="proje_dailystats_project_date_uniq"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["date", "project"], name="proje_dailystats_date_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} @ {self.date}"
+
+    @property
+    def agreement_percent(self):
+        """Units with an agreement as an integer percentage of all units."""
+        if not self.unit_count:
+            return 0
+        return int(self.unit_saglandi_count * 100 / self.unit_count)
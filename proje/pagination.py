@@ -0,0 +1,188 @@
+"""Keyset (cursor) pagination for `proje` list views.
+
+Offset pagination (`LIMIT/OFFSET` plus a `COUNT(*)`) gets slower the deeper
+a user pages into large tables. Keyset pagination instead filters on the
+ordering key of the last row seen, e.g. ``(code, id) > (last_code, last_id)``,
+so every page is an index range scan of `page_size` rows.
+
+Cursors are opaque URL-safe strings encoding the boundary row's key values
+and the paging direction.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+@dataclass
+class KeysetPage:
+    """A page of results with cursors for the neighbouring pages.
+
+    Mirrors the parts of Django's `Page` API used by templates
+    (`object_list`, `has_next`, `has_previous`, iteration).
+    """
+
+    object_list: list
+    next_cursor: str | None = None
+    previous_cursor: str | None = None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        """Return True when a following page exists."""
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        """Return True when a preceding page exists."""
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        """Return True when either neighbouring page exists."""
+        return self.has_next() or self.has_previous()
+
+
+def encode_cursor(values, direction="next"):
+    """Encode key `values` and `direction` into an opaque cursor string."""
+    payload = json.dumps({"k": values, "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by `encode_cursor`.
+
+    Returns `(values, direction)` or `(None, "next")` when the cursor is
+    missing or malformed, so tampered URLs simply show the first page.
+    """
+    if not cursor:
+        return None, "next"
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values, direction = data["k"], data.get("d", "next")
+    except (ValueError, TypeError, KeyError, binascii.Error, UnicodeError):
+        return None, "next"
+    if not isinstance(values, list) or direction not in ("next", "prev"):
+        return None, "next"
+    return values, direction
+
+
+def _keyset_filter(ordering, values, forward):
+    """Build the lexicographic "row comes after `values`" filter for `ordering`.
+
+    For ``ordering=("code", "id")`` and forward paging this yields
+    ``code > v0 OR (code = v0 AND id > v1)``; descending fields flip the
+    comparison, as does paging backwards.
+    """
+    condition = Q()
+    for idx, term in enumerate(ordering):
+        name = term.lstrip("-")
+        ascending = not term.startswith("-")
+        op = "gt" if ascending == forward else "lt"
+        clause = Q(**{f"{name}__{op}": values[idx]})
+        for prev_idx in range(idx):
+            clause &= Q(**{ordering[prev_idx].lstrip("-"): values[prev_idx]})
+        condition |= clause
+    return condition
+
+
+def _clean_values(model, ordering, values):
+    """Return cursor `values` converted by each ordering field, or None.
+
+    Decoded cursors are untrusted input: values of the wrong count, type
+    or shape (including nulls, lists and objects) yield None so the caller
+    falls back to the first page instead of failing in the query.
+    """
+    if len(values) != len(ordering):
+        return None
+    cleaned = []
+    for term, value in zip(ordering, values):
+        if value is None or not isinstance(value, (str, int, float)):
+            return None
+        field = model._meta.get_field(term.lstrip("-"))  # pylint: disable=protected-access
+        try:
+            value = field.to_python(value)
+            field.get_prep_value(value)
+        except (ValueError, TypeError, ValidationError):
+            return None
+        if value is None:
+            return None
+        cleaned.append(value)
+    return cleaned
+
+
+def _reverse_ordering(ordering):
+    return [term[1:] if term.startswith("-") else f"-{term}" for term in ordering]
+
+
+def _key_values(obj, ordering):
+    values = []
+    for term in ordering:
+        field = obj._meta.get_field(term.lstrip("-"))  # pylint: disable=protected-access
+        values.append(field.value_to_string(obj))
+    return values
+
+
+def paginate_keyset(queryset, ordering, page_size, cursor=None):
+    """Return a `KeysetPage` of `queryset` ordered by `ordering`.
+
+    `ordering` must end with a unique field (typically ``"id"``) so the key
+    is a total order. Each page costs a single query fetching
+    ``page_size + 1`` rows; the extra row only signals whether another page
+    exists in the paging direction.
+    """
+    ordering = list(ordering)
+    values, direction = decode_cursor(cursor)
+    forward = direction == "next"
+    if values is not None:
+        values = _clean_values(queryset.model, ordering, values)
+        if values is None:
+            forward = True
+
+    qs = queryset.order_by(*(ordering if forward else _reverse_ordering(ordering)))
+    if values is not None:
+        qs = qs.filter(_keyset_filter(ordering, values, forward))
+
+    rows = list(qs[: page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if not forward:
+        rows.reverse()
+
+    page = KeysetPage(object_list=rows)
+    if rows:
+        first_key = _key_values(rows[0], ordering)
+        last_key = _key_values(rows[-1], ordering)
+        if (forward and has_more) or (not forward and values is not None):
+            page.next_cursor = encode_cursor(last_key, "next")
+        if (not forward and has_more) or (forward and values is not None):
+            page.previous_cursor = encode_cursor(first_key, "prev")
+    return page
+
+
+class KeysetPaginationMixin:
+    """ListView mixin replacing offset pagination with keyset pagination.
+
+    Set `keyset_ordering` (ending with a unique field) and `paginate_by`.
+    The cursor is read from the `cursor` query parameter; the resulting
+    `KeysetPage` is exposed as `page_obj` in the template context.
+    """
+
+    keyset_ordering = ("id",)
+    cursor_kwarg = "cursor"
+
+    def paginate_queryset(self, queryset, page_size):
+        page = paginate_keyset(
+            queryset,
+            self.keyset_ordering,
+            page_size,
+            cursor=self.request.GET.get(self.cursor_kwarg),
+        )
+        return (None, page, page.object_list, page.has_other_pages())
@@ -0,0 +1,493 @@
+"""Bulk import of land-registry (tapu) rows into units, owners and ownerships.
+
+Input rows are dicts keyed by column name, streamed from CSV or XLSX files
+by `read_registry_rows`. Each row describes one unit (``ada``, ``parsel``,
+optional door numbers and unit fields) and optionally one owner of it
+(``first_name``, ``last_name``, ``tc_no`` ...) with a ``share_percent``.
+Turkish headers such as ``Ad``, ``Soyad``, ``TC``, ``Hisse`` or ``Dış Kapı``
+are accepted as aliases (`COLUMN_ALIASES`).
+
+`RegistryImportEngine` processes rows in chunks, each in its own
+transaction. A chunk is validated first; valid rows are then upserted with
+``bulk_create(update_conflicts=True)`` keyed on ``(project, import_key)``:
+
+- units: folded ``ada|parsel|door_outside|door_inside``
+- owners: the normalised TC kimlik number; owners listed without one
+  (legal entities, the treasury) are keyed on their folded name together
+  with the unit of the row, so such an owner gets one record per unit
+
+Only the columns present in the file are overwritten on existing rows.
+Ownerships are matched on ``(unit, owner)``: existing ones get the new
+share, missing ones are created in bulk. Rejected rows are yielded with
+their line number in the file (blank lines included) and error so the
+caller can stream them into a report.
+
+Bulk writes skip the model signals, so the folded search column and TC
+hash are computed here, the share totals of touched units
+(`proje.shares`) are recomputed per chunk, and the project counters
+(`proje.counters`) and cached fragments are refreshed once at the end of a
+run.
+"""
+
+import csv
+import datetime
+import hashlib
+import io
+import time
+from decimal import Decimal, InvalidOperation
+from fractions import Fraction
+from pathlib import Path
+
+from django.db import transaction
+
+from core.tc_kimlik import apply_tc, is_valid_tc, normalize_tc
+
+from .counters import recount_projects
+from .exports import FORMULA_PREFIXES
+from .fragment_cache import bump_project_fragments
+from .models import Owner, Ownership, Project, Unit
+from .reports import peek_rows, write_report
+from .search import fold, search_text_for
+from .shares import recompute_share_totals
+from .utils import chunked, generate_report_path
+
+DEFAULT_CHUNK_SIZE = 2000
+
+UNIT_COLUMNS = (
+    "ada", "parsel", "door_outside", "door_inside", "type", "m2", "current_m2",
+    "share_m2", "address", "occupancy",
+)
+OWNER_COLUMNS = (
+    "first_name", "last_name", "tc_no", "phone", "email", "address_owner",
+    "birth_date", "residence_city",
+)
+COLUMNS = UNIT_COLUMNS + OWNER_COLUMNS + ("share_percent",)
+
+# folded header -> column
+COLUMN_ALIASES = {
+    "dis_kapi": "door_outside",
+    "dis_kapi_no": "door_outside",
+    "ic_kapi": "door_inside",
+    "ic_kapi_no": "door_inside",
+    "tip": "type",
+    "metrekare": "m2",
+    "mevcut_m2": "current_m2",
+    "arsa_payi_m2": "share_m2",
+    "adres": "address",
+    "oturum_durumu": "occupancy",
+    "ad": "first_name",
+    "adi": "first_name",
+    "soyad": "last_name",
+    "soyadi": "last_name",
+    "tc": "tc_no",
+    "tc_kimlik_no": "tc_no",
+    "telefon": "phone",
+    "e_posta": "email",
+    "malik_adresi": "address_owner",
+    "dogum_tarihi": "birth_date",
+    "ikamet_ili": "residence_city",
+    "hisse": "share_percent",
+    "hisse_orani": "share_percent",
+}
+
+DECIMAL_COLUMNS = ("m2", "current_m2", "share_m2")
+DATE_FORMATS = ("%d.%m.%Y", "%Y-%m-%d", "%d/%m/%Y")
+# owner column -> Owner field where the names differ
+OWNER_FIELD_NAMES = {"address_owner": "address"}
+
+REPORT_FIELDS = ("line", "error") + COLUMNS
+
+# prefix of owner keys derived from name and unit (owners without a TC)
+NAME_KEY_PREFIX = "ad:"
+
+
+class RowError(ValueError):
+    """A row failed validation; the message is written to the report."""
+
+
+def normalize_header(name):
+    """Map a file header to a column name (Turkish aliases included)."""
+    key = fold(name).replace(" ", "_").replace("-", "_").replace(".", "")
+    return COLUMN_ALIASES.get(key, key)
+
+
+def unit_import_key(ada, parsel, door_outside="", door_inside=""):
+    """Return the registry key of a unit, or None without ada and parsel."""
+    if not (str(ada or "").strip() and str(parsel or "").strip()):
+        return None
+    return "|".join(fold(part) for part in (ada, parsel, door_outside, door_inside))
+
+
+def owner_import_key(tc_no, first_name="", last_name="", unit_key=None):
+    """Return the registry key of an owner, or None when it cannot be keyed.
+
+    A valid TC number is the key. Without any TC number, the folded name
+    and `unit_key` (the unit the owner is listed on) are hashed into a
+    ``NAME_KEY_PREFIX`` key; that needs a name and a `unit_key`. An invalid
+    TC number never produces a key.
+    """
+    if is_valid_tc(tc_no):
+        return normalize_tc(tc_no)
+    name = fold(f"{first_name or ''} {last_name or ''}")
+    if normalize_tc(tc_no) or not name or unit_key is None:
+        return None
+    digest = hashlib.sha256(f"{name}|{unit_key}".encode()).hexdigest()[:40]
+    return f"{NAME_KEY_PREFIX}{digest}"
+
+
+def _text(value):
+    if value is None:
+        return ""
+    text = str(value)
+    # undo the formula guard of proje.exports CSV cells ("'=..." -> "=...")
+    if text.startswith("'") and text[1:].startswith(FORMULA_PREFIXES):
+        text = text[1:]
+    return text.strip()
+
+
+def _decimal(value, column):
+    text = _text(value).replace(" ", "")
+    if not text:
+        return None
+    if "," in text:
+        # Turkish number format: 1.234,56
+        text = text.replace(".", "").replace(",", ".")
+    try:
+        return Decimal(text)
+    except InvalidOperation as exc:
+        raise RowError(f"{column}: invalid number {value!r}") from exc
+
+
+def parse_share(value):
+    """Return an ownership share in percent from ``25``, ``%25,5`` or ``1/4``."""
+    text = _text(value).replace("%", "").replace(" ", "")
+    if not text:
+        return Decimal(100)
+    try:
+        if "/" in text:
+            share = Fraction(text) * 100
+            percent = Decimal(share.numerator) / Decimal(share.denominator)
+        else:
+            percent = Decimal(text.replace(",", "."))
+    except (ValueError, ZeroDivisionError, InvalidOperation) as exc:
+        raise RowError(f"share_percent: invalid share {value!r}") from exc
+    if not Decimal(0) < percent <= Decimal(100):
+        raise RowError(f"share_percent: {value!r} is outside 0-100%")
+    return percent.quantize(Decimal("0.01"))
+
+
+def _choice(value, choices, column):
+    text = _text(value)
+    if not text:
+        return None
+    folded = fold(text)
+    for key, label in choices:
+        if folded in (key, fold(label)):
+            return key
+    raise RowError(f"{column}: unknown value {value!r}")
+
+
+def _birth_date(value):
+    if value in (None, ""):
+        return None
+    if isinstance(value, datetime.datetime):
+        # XLSX date cells
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(_text(value), fmt).date()
+        except ValueError:
+            continue
+    raise RowError(f"birth_date: invalid date {value!r}")
+
+
+class RegistryImportEngine:
+    """Validate and upsert registry rows for one project in bulk.
+
+    Iterate over `run(rows)` to receive one report row per rejected input
+    row as each chunk completes. Counters (`processed`, `rejected`,
+    `units`, `owners`, `ownerships`) and timing are available afterwards.
+    `columns` lists the columns present in the input; only those are
+    updated on existing rows.
+    """
+
+    def __init__(self, project, columns=COLUMNS, dry_run=False, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.project = project
+        self.columns = set(columns)
+        self.dry_run = dry_run
+        self.chunk_size = max(1, int(chunk_size))
+        self.processed = 0
+        self.rejected = 0
+        self.units = 0
+        self.owners = 0
+        self.ownerships = 0
+        self.elapsed = 0.0
+        # ada/parsel/doors form the key; without an address column the stored
+        # search text (key parts plus address) is still current
+        self.unit_update_fields = [name for name in UNIT_COLUMNS if name in self.columns]
+        if "address" in self.columns:
+            self.unit_update_fields.append("search_text")
+        self.owner_update_fields = [
+            OWNER_FIELD_NAMES.get(name, name) for name in OWNER_COLUMNS if name in self.columns
+        ] + ["tc_hash", "search_text"]
+
+    @property
+    def rows_per_second(self):
+        """Processing rate of the last `run`, in input rows per second."""
+        if not self.elapsed:
+            return float(self.processed)
+        return self.processed / self.elapsed
+
+    def run(self, rows, first_line=2):
+        """Yield report rows for rejected `rows`, importing the rest chunk by chunk.
+
+        Line numbers start at `first_line` (the row after a header line).
+        """
+        return self.run_numbered(enumerate(rows, start=first_line))
+
+    def run_numbered(self, numbered_rows):
+        """Like `run`, for `(line, row)` pairs such as `read_registry_rows` yields."""
+        started = time.monotonic()
+        try:
+            for chunk in chunked(numbered_rows, self.chunk_size):
+                with transaction.atomic():
+                    rejected = self._process_chunk(chunk)
+                yield from rejected
+        finally:
+            self.elapsed = time.monotonic() - started
+            if not self.dry_run and self.processed > self.rejected:
+                recount_projects(Project.objects.filter(pk=self.project.pk))
+                bump_project_fragments(self.project.pk)
+
+    # validation --------------------------------------------------------
+
+    def _build_unit(self, row):
+        values = {name: _text(row.get(name)) for name in ("ada", "parsel", "door_outside", "door_inside")}
+        key = unit_import_key(**values)
+        if key is None:
+            raise RowError("ada and parsel are required")
+        unit = Unit(project=self.project, import_key=key, address=_text(row.get("address")), **values)
+        for name in DECIMAL_COLUMNS:
+            setattr(unit, name, _decimal(row.get(name), name))
+        unit.type = _choice(row.get("type"), Unit.TYPE, "type") or unit.type
+        unit.occupancy = _choice(row.get("occupancy"), Unit.OCCUPANCY, "occupancy") or unit.occupancy
+        unit.search_text = search_text_for(unit)
+        return unit
+
+    def _build_owner(self, row, unit_key):
+        tc_no = _text(row.get("tc_no"))
+        first_name, last_name = _text(row.get("first_name")), _text(row.get("last_name"))
+        if not (tc_no or first_name or last_name):
+            return None
+        key = owner_import_key(tc_no, first_name, last_name, unit_key)
+        if key is None:
+            raise RowError(f"tc_no: invalid TC kimlik number {tc_no!r}")
+        if tc_no and not (first_name and last_name):
+            # a name alone is enough for owners without a TC (legal entities)
+            raise RowError("first_name and last_name are required for owners")
+        owner = Owner(
+            project=self.project,
+            import_key=key,
+            first_name=first_name,
+            last_name=last_name,
+            tc_no=normalize_tc(tc_no),
+            phone=_text(row.get("phone")),
+            email=_text(row.get("email")),
+            address=_text(row.get("address_owner")),
+            birth_date=_birth_date(row.get("birth_date")),
+            residence_city=_text(row.get("residence_city")),
+        )
+        apply_tc(owner)
+        owner.search_text = search_text_for(owner)
+        return owner
+
+    def _validate(self, chunk):
+        """Return `(units, owners, shares, rejected)` for a chunk of `(line, row)`."""
+        units, owners, shares, rejected = {}, {}, {}, []
+        for line, row in chunk:
+            self.processed += 1
+            try:
+                unit = self._build_unit(row)
+                owner = self._build_owner(row, unit.import_key)
+                share = parse_share(row.get("share_percent")) if owner else None
+            except RowError as exc:
+                self.rejected += 1
+                report = {name: _text(row.get(name)) for name in COLUMNS}
+                rejected.append({"line": line, "error": str(exc), **report})
+                continue
+            # later rows for the same unit/owner win
+            units[unit.import_key] = unit
+            if owner:
+                owners[owner.import_key] = owner
+                shares[(unit.import_key, owner.import_key)] = share
+        return units, owners, shares, rejected
+
+    # writes --------------------------------------------------------------
+
+    def _upsert(self, model, objs, update_fields):
+        if not objs:
+            return {}
+        model.objects.bulk_create(
+            objs,
+            update_conflicts=True,
+            unique_fields=["project", "import_key"],
+            update_fields=update_fields,
+        )
+        return dict(
+            model.objects.filter(project=self.project, import_key__in=[o.import_key for o in objs])
+            .values_list("import_key", "pk")
+        )
+
+    def _process_chunk(self, chunk):
+        units, owners, shares, rejected = self._validate(chunk)
+        if self.dry_run:
+            return rejected
+
+        unit_ids = self._upsert(Unit, list(units.values()), self.unit_update_fields)
+        owner_ids = self._upsert(Owner, list(owners.values()), self.owner_update_fields)
+        self.units += len(unit_ids)
+        self.owners += len(owner_ids)
+
+        wanted = {
+            (unit_ids[unit_key], owner_ids[owner_key]): share
+            for (unit_key, owner_key), share in shares.items()
+        }
+        if not wanted:
+            return rejected
+        keys = list(wanted)
+        existing = Ownership.objects.filter(
+            unit_id__in={unit_id for unit_id, _ in wanted},
+            owner_id__in={owner_id for _, owner_id in wanted},
+        ).only("pk", "unit_id", "owner_id", "share_percent")
+        changed = []
+        for ownership in existing:
+            share = wanted.pop((ownership.unit_id, ownership.owner_id), None)
+            if share is not None and ownership.share_percent != share:
+                ownership.share_percent = share
+                changed.append(ownership)
+        Ownership.objects.bulk_update(changed, ["share_percent"])
+        Ownership.objects.bulk_create(
+            Ownership(unit_id=unit_id, owner_id=owner_id, share_percent=share)
+            for (unit_id, owner_id), share in wanted.items()
+        )
+        self.ownerships += len(changed) + len(wanted)
+        recompute_share_totals(Unit.objects.filter(pk__in={unit_id for unit_id, _ in keys}))
+        return rejected
+
+
+# readers -------------------------------------------------------------------
+
+
+def _dict_rows(header, numbered_values):
+    """Yield `(line, row dict)` for `(line, values)` pairs, skipping blank rows."""
+    columns = [normalize_header(name) if name is not None else "" for name in header]
+    for line, values in numbered_values:
+        if not any(value not in (None, "") for value in values):
+            continue
+        yield line, dict(zip(columns, values))
+
+
+def _csv_rows(fh):
+    sample = fh.read(4096)
+    fh.seek(0)
+    # blank lines make the sniffer give up on the delimiter
+    sample = "\n".join(line for line in sample.splitlines() if line.strip())
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.reader(fh, dialect)
+    header = next(reader, [])
+    # line_num is the physical line a record ends on (quoted fields may span lines)
+    return header, ((reader.line_num, values) for values in reader)
+
+
+def _xlsx_rows(path_or_file):
+    try:
+        from openpyxl import load_workbook  # pylint: disable=import-outside-toplevel
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise ValueError("XLSX imports require openpyxl") from exc
+    workbook = load_workbook(path_or_file, read_only=True, data_only=True)
+    rows = workbook.worksheets[0].iter_rows(values_only=True)
+    header = next(rows, ())
+    return workbook, header, enumerate(rows, start=2)
+
+
+def read_registry_rows(source, file_format=None):
+    """Return `(columns, rows)` for a CSV or XLSX registry file.
+
+    `source` is a path or a binary file object. `file_format` (``csv`` or
+    ``xlsx``) defaults to the file extension. `columns` is the list of
+    recognised column names in the header; `rows` is a lazy iterator of
+    `(line, row dict)` pairs, where `line` is the line (CSV) or sheet row
+    (XLSX) number, so large files are never loaded whole.
+    """
+    name = str(getattr(source, "name", source))
+    file_format = (file_format or Path(name).suffix.lstrip(".") or "csv").lower()
+    if file_format == "xlsx":
+        workbook, header, values = _xlsx_rows(source)
+
+        def rows():
+            try:
+                yield from _dict_rows(header, values)
+            finally:
+                workbook.close()
+
+    elif file_format == "csv":
+        if isinstance(source, (str, Path)):
+            fh = open(source, newline="", encoding="utf-8-sig")  # pylint: disable=consider-using-with
+        else:
+            fh = io.TextIOWrapper(source, newline="", encoding="utf-8-sig")
+        header, values = _csv_rows(fh)
+
+        def rows():
+            try:
+                yield from _dict_rows(header, values)
+            finally:
+                fh.close()
+
+    else:
+        raise ValueError(f"Unsupported registry file format: {file_format}")
+    columns = [normalize_header(h) for h in header if h is not None]
+    return [c for c in columns if c in COLUMNS], rows()
+
+
+def import_registry_file(
+    project,
+    source,
+    file_format=None,
+    dry_run=False,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    report_file=None,
+    report_format="csv",
+):
+    """Import a registry file into `project` and return a summary dict.
+
+    Rejected rows are streamed into `report_file` (relative paths go under
+    MEDIA_ROOT); when it is not given and rows are rejected, a timestamped
+    file under ``reports/`` is used. The summary holds the engine counters
+    and ``report_file`` (None without rejections).
+    """
+    columns, rows = read_registry_rows(source, file_format)
+    engine = RegistryImportEngine(project, columns, dry_run=dry_run, chunk_size=chunk_size)
+    has_rejected, rejected = peek_rows(engine.run_numbered(rows))
+    report_path = None
+    if has_rejected:
+        report_file = report_file or generate_report_path(
+            prefix="reports/registry_import", ext=report_format, label=project.code
+        )
+        report_path, _count = write_report(
+            rejected, report_file, report_format, fieldnames=REPORT_FIELDS
+        )
+    return {
+        "processed": engine.processed,
+        "rejected": engine.rejected,
+        "units": engine.units,
+        "owners": engine.owners,
+        "ownerships": engine.ownerships,
+        "elapsed": engine.elapsed,
+        "rows_per_second": engine.rows_per_second,
+        "report_file": str(report_path) if report_path else None,
+    }
@@ -0,0 +1,97 @@
+"""Read-replica routing for read-only views.
+
+When a ``replica`` database is configured (``DATABASE_REPLICA_URL``), reads
+made inside a `read_replica()` block go to it; everything else, including
+all writes and any read outside such a block, stays on ``default``. Routing
+is opt-in per view rather than global so that a request never reads its own
+write from a lagging replica: only safe (GET/HEAD) requests of the list
+and report views are routed.
+
+Results stored in shared caches (membership, settlement results, template
+fragments) must not come from the replica: a lagging replica would cache
+stale data under a key that is already current, and it would stay there
+until the next invalidation. Such cache fills run inside `read_primary()`.
+
+The active state lives in a context variable, so it is per-thread and
+per-asyncio-task.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.utils.decorators import method_decorator
+
+REPLICA_ALIAS = "replica"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_use_replica = ContextVar("proje_use_replica", default=False)
+
+
+def replica_configured():
+    """Return True when a read replica is present in `DATABASES`."""
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def read_replica():
+    """Route ORM reads in this block to the replica (when configured)."""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+@contextmanager
+def read_primary():
+    """Route ORM reads in this block to ``default``, even inside `read_replica()`."""
+    token = _use_replica.set(False)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def replica_reads(view_func):
+    """View decorator: serve safe requests with replica reads."""
+
+    @wraps(view_func)
+    def _wrapped(request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return view_func(request, *args, **kwargs)
+        with read_replica():
+            return view_func(request, *args, **kwargs)
+
+    return _wrapped
+
+
+class ReplicaReadMixin:
+    """Class-based view mixin equivalent of `replica_reads`."""
+
+    @method_decorator(replica_reads)
+    def dispatch(self, request, *args, **kwargs):
+        return super().dispatch(request, *args, **kwargs)
+
+
+class ReplicaRouter:
+    """Send reads to the replica inside `read_replica()`; writes to default."""
+
+    def db_for_read(self, model, **hints):  # pylint: disable=unused-argument
+        if _use_replica.get() and replica_configured():
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):  # pylint: disable=unused-argument
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):  # pylint: disable=unused-argument
+        # both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):  # pylint: disable=unused-argument
+        # the replica receives schema changes through replication
+        if db == REPLICA_ALIAS:
+            return False
+        return None
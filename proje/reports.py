@@ -0,0 +1,141 @@
+"""Streaming report writers for `proje` assignment reports.
+
+Reports are written row by row as they are produced, so memory stays flat
+regardless of report size. Supported formats:
+
+- ``csv``: header plus one line per row, restricted to `fieldnames`
+- ``jsonl``: one JSON object per line (JSON Lines)
+- ``json``: a single JSON array, streamed one element at a time
+
+Any format can be gzip-compressed; a ``.gz`` suffix is appended to the
+target path when missing.
+"""
+
+import csv
+import gzip
+import json
+from itertools import chain
+from pathlib import Path
+
+from django.conf import settings
+
+REPORT_FORMATS = ("csv", "jsonl", "json")
+
+# rows written between explicit flushes of the underlying file
+DEFAULT_FLUSH_EVERY = 500
+
+
+def resolve_report_path(report_file):
+    """Return a `Path` for `report_file`, placing relative paths under MEDIA_ROOT."""
+    target_path = Path(report_file)
+    if not target_path.is_absolute():
+        media_root = getattr(settings, "MEDIA_ROOT", None)
+        if media_root:
+            target_path = Path(media_root) / report_file
+    return target_path
+
+
+def peek_rows(rows):
+    """Return `(has_rows, rows)` without losing the first row of an iterator.
+
+    Lists are returned unchanged; iterators are re-chained with the peeked
+    row so callers can still consume every row exactly once.
+    """
+    if isinstance(rows, list):
+        return bool(rows), rows
+    iterator = iter(rows)
+    try:
+        first = next(iterator)
+    except StopIteration:
+        return False, iter(())
+    return True, chain((first,), iterator)
+
+
+class ReportSink:
+    """Incremental writer for report rows (use as a context manager).
+
+    `fieldnames` is required for CSV output and ignored otherwise. Rows are
+    flushed to disk every `flush_every` rows and on close.
+    """
+
+    def __init__(
+        self,
+        report_file,
+        report_format="csv",
+        fieldnames=None,
+        compress=False,
+        flush_every=DEFAULT_FLUSH_EVERY,
+    ):
+        if report_format not in REPORT_FORMATS:
+            raise ValueError(f"Unsupported report format: {report_format}")
+        if report_format == "csv" and not fieldnames:
+            raise ValueError("fieldnames are required for CSV reports")
+
+        path = resolve_report_path(report_file)
+        if compress and path.suffix != ".gz":
+            path = path.with_name(path.name + ".gz")
+        self.path = path
+        self.report_format = report_format
+        self.fieldnames = list(fieldnames or ())
+        self.compress = compress
+        self.flush_every = max(1, flush_every)
+        self.count = 0
+        self._fh = None
+        self._csv = None
+
+    def open(self):
+        """Create parent directories, open the file and write any header."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.compress:
+            self._fh = gzip.open(self.path, "wt", newline="", encoding="utf-8")
+        else:
+            self._fh = self.path.open("w", newline="", encoding="utf-8")
+        if self.report_format == "csv":
+            self._csv = csv.DictWriter(
+                self._fh, fieldnames=self.fieldnames, extrasaction="ignore"
+            )
+            self._csv.writeheader()
+        elif self.report_format == "json":
+            self._fh.write("[")
+        return self
+
+    def write(self, row):
+        """Append a single row to the report."""
+        if self.report_format == "csv":
+            self._csv.writerow({k: row.get(k, "") for k in self.fieldnames})
+        else:
+            encoded = json.dumps(row, ensure_ascii=False)
+            if self.report_format == "json":
+                self._fh.write(("\n" if self.count == 0 else ",\n") + encoded)
+            else:
+                self._fh.write(encoded + "\n")
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self._fh.flush()
+
+    def close(self):
+        """Finish the document (closing JSON arrays) and close the file."""
+        if self._fh is None:
+            return
+        if self.report_format == "json":
+            self._fh.write("\n]\n" if self.count else "]\n")
+        self._fh.close()
+        self._fh = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def write_report(rows, report_file, report_format="csv", fieldnames=None, compress=False):
+    """Stream `rows` (any iterable, e.g. a generator) into a report file.
+
+    Returns `(path, row_count)`.
+    """
+    with ReportSink(report_file, report_format, fieldnames, compress=compress) as sink:
+        for row in rows:
+            sink.write(row)
+    return sink.path, sink.count
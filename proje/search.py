@@ -0,0 +1,285 @@
+"""Indexed search over owners, units and documents.
+
+Every searchable model carries a ``search_text`` column: its searchable
+fields folded by `fold` (lower case, Turkish letters mapped to ASCII -
+``İ/I/ı`` -> ``i``, ``ş`` -> ``s``, ``ğ`` -> ``g``, ``ü``, ``ö``, ``ç`` -
+and other diacritics removed). It is filled on save by a signal handler
+and by the bulk writers (`proje.ingest`), and can be rebuilt with the
+``rebuild_search_index`` command. Queries are folded the same way, so
+"ISIK", "ışık" and "Işık" all find each other.
+
+How the column is searched depends on the database:
+
+- PostgreSQL: ``pg_trgm`` GIN indexes on ``search_text`` (migration 0010)
+  turn every ``LIKE '%term%'`` into an index scan; results of the global
+  search are ranked by trigram word similarity.
+- SQLite: an external-content FTS5 table per model with the ``trigram``
+  tokenizer, kept in sync by triggers (`ensure_search_index`, run after
+  every ``migrate``). Terms shorter than three characters cannot be
+  answered by a trigram index and are matched with ``LIKE``.
+- anything else: plain ``LIKE`` on the folded column.
+
+On every backend a term matches anywhere inside the folded text, so
+"sikli" finds "Işıklı" whichever database serves the query.
+
+Owner TC numbers are not part of ``search_text``: they would otherwise be
+copied in clear into another column and the FTS index. `global_search`
+answers a query that is a valid TC number with the exact indexed lookup
+of `core.tc_kimlik`, as the owner admin does.
+
+`search` filters any queryset of a searchable model (used by the admin
+changelists through `proje.admin_helpers.SearchIndexAdminMixin`);
+`global_search` backs the ``proje:search`` endpoint.
+"""
+
+import logging
+import unicodedata
+from pathlib import PurePosixPath
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from core.tc_kimlik import tc_lookup
+
+from .membership import member_project_ids
+from .models import Document, Owner, Unit
+
+logger = logging.getLogger(__name__)
+
+SEARCH_FIELD = "search_text"
+
+# model -> fields folded into `search_text`
+SEARCH_SOURCES = {
+    Owner: ("first_name", "last_name"),
+    Unit: ("ada", "parsel", "address", "door_outside", "door_inside"),
+    Document: ("label", "file"),
+}
+
+# terms beyond this are ignored (each one is an extra index probe)
+MAX_TERMS = 8
+
+# shortest term the FTS5 trigram tokenizer can match
+TRIGRAM_LENGTH = 3
+
+_TURKISH_FOLD = str.maketrans({
+    "İ": "i", "I": "i", "ı": "i",
+    "Ş": "s", "ş": "s",
+    "Ğ": "g", "ğ": "g",
+    "Ü": "u", "ü": "u",
+    "Ö": "o", "ö": "o",
+    "Ç": "c", "ç": "c",
+})
+
+
+def fold(text):
+    """Return `text` lower-cased, Turkish-folded, without accents or extra spaces."""
+    text = unicodedata.normalize("NFKC", str(text or "")).translate(_TURKISH_FOLD).casefold()
+    text = "".join(
+        char for char in unicodedata.normalize("NFKD", text) if not unicodedata.combining(char)
+    )
+    return " ".join(text.split())
+
+
+def search_terms(query):
+    """Split a user query into distinct folded terms (at most `MAX_TERMS`)."""
+    return list(dict.fromkeys(fold(query).split()))[:MAX_TERMS]
+
+
+def search_text_for(instance):
+    """Return the ``search_text`` value for a searchable model instance."""
+    values = []
+    for name in SEARCH_SOURCES[type(instance)]:
+        value = getattr(instance, name)
+        if name == "file":
+            # content-addressed names end with the original file name
+            value = PurePosixPath(value.name).name if value else ""
+        values.append(value)
+    return fold(" ".join(str(value) for value in values if value))
+
+
+def _fts_table(model):
+    return f"{model._meta.db_table}_fts"
+
+
+def _fts_match(terms):
+    # every term as a quoted substring query: "ahm" "yil"
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def search(queryset, query):
+    """Filter `queryset` (of a searchable model) to rows matching all terms of `query`."""
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+    model = queryset.model
+    vendor = connections[queryset.db].vendor
+    if vendor == "sqlite" and fts_available(queryset.db, model):
+        indexed = [term for term in terms if len(term) >= TRIGRAM_LENGTH]
+        terms = [term for term in terms if len(term) < TRIGRAM_LENGTH]
+        if indexed:
+            table = _fts_table(model)
+            queryset = queryset.filter(
+                pk__in=RawSQL(
+                    f"SELECT rowid FROM {table} WHERE {table} MATCH %s", [_fts_match(indexed)]
+                )
+            )
+    # on PostgreSQL served by the gin_trgm_ops index on search_text
+    condition = Q()
+    for term in terms:
+        condition &= Q(**{f"{SEARCH_FIELD}__contains": term})
+    return queryset.filter(condition)
+
+
+def rank(queryset, query):
+    """Order a `search` result by relevance where the backend supports it."""
+    if connections[queryset.db].vendor != "postgresql":
+        return queryset
+    from django.contrib.postgres.search import \
+        TrigramWordSimilarity  # pylint: disable=import-outside-toplevel
+
+    return queryset.annotate(
+        search_rank=TrigramWordSimilarity(fold(query), SEARCH_FIELD)
+    ).order_by("-search_rank", "-pk")
+
+
+def _result(kind, obj, label, project):
+    return {
+        "kind": kind,
+        "id": obj.pk,
+        "label": label,
+        "project_id": project.pk if project else None,
+        "project": project.code if project else "",
+    }
+
+
+def global_search(query, user, limit=10):
+    """Search owners, units and documents visible to `user`.
+
+    Superusers see every project, other users the projects they manage or
+    staff. A query that is a valid TC number matches that owner exactly
+    instead of searching the text. Returns a dict of result lists keyed by
+    kind, each holding at most `limit` plain dicts.
+    """
+    results = {"owners": [], "units": [], "documents": []}
+    if not search_terms(query):
+        return results
+
+    owners = Owner.objects.select_related("project")
+    units = Unit.objects.select_related("project")
+    documents = Document.objects.select_related("project", "unit__project")
+    if not user.is_superuser:
+        ids = member_project_ids(user)
+        owners = owners.filter(project_id__in=ids)
+        units = units.filter(project_id__in=ids)
+        documents = documents.filter(Q(project_id__in=ids) | Q(unit__project_id__in=ids))
+
+    matches = tc_lookup(owners, query.strip())
+    if matches is None:
+        matches = rank(search(owners, query), query)
+    for owner in matches[:limit]:
+        results["owners"].append(_result("owner", owner, str(owner), owner.project))
+    for unit in rank(search(units, query), query)[:limit]:
+        label = f"{unit.ada}/{unit.parsel} {unit.address}".strip()
+        results["units"].append(_result("unit", unit, label, unit.project))
+    for document in rank(search(documents, query), query)[:limit]:
+        project = document.project or (document.unit.project if document.unit else None)
+        entry = _result("document", document, str(document), project)
+        entry["url"] = document.file.url if document.file else ""
+        results["documents"].append(entry)
+    return results
+
+
+def rebuild_search_text(model, chunk_size=1000):
+    """Recompute ``search_text`` for every row of `model`; return rows changed.
+
+    Only rows whose stored value differs are written, with `bulk_update` in
+    chunks of `chunk_size`.
+    """
+    fields = SEARCH_SOURCES[model]
+    changed = []
+    count = 0
+    queryset = model.objects.only("pk", SEARCH_FIELD, *fields).order_by("pk")
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        value = search_text_for(obj)
+        if value != obj.search_text:
+            obj.search_text = value
+            changed.append(obj)
+        if len(changed) >= chunk_size:
+            model.objects.bulk_update(changed, [SEARCH_FIELD])
+            count += len(changed)
+            changed = []
+    model.objects.bulk_update(changed, [SEARCH_FIELD])
+    return count + len(changed)
+
+
+# SQLite FTS5 ------------------------------------------------------------
+
+_FTS_TRIGGERS = (
+    (
+        "ai", "AFTER INSERT ON {table} BEGIN "
+        "INSERT INTO {fts}(rowid, search_text) VALUES (new.id, new.search_text); END",
+    ),
+    (
+        "ad", "AFTER DELETE ON {table} BEGIN "
+        "INSERT INTO {fts}({fts}, rowid, search_text) "
+        "VALUES ('delete', old.id, old.search_text); END",
+    ),
+    (
+        "au", "AFTER UPDATE OF search_text ON {table} BEGIN "
+        "INSERT INTO {fts}({fts}, rowid, search_text) VALUES ('delete', old.id, old.search_text); "
+        "INSERT INTO {fts}(rowid, search_text) VALUES (new.id, new.search_text); END",
+    ),
+)
+
+
+def fts_available(using, model):
+    """Return True if the FTS5 table of `model` exists on database `using`."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [_fts_table(model)]
+        )
+        return cursor.fetchone() is not None
+
+
+def ensure_search_index(using="default"):
+    """Create missing SQLite FTS5 tables and triggers; a no-op elsewhere.
+
+    SQLite drops a table's triggers whenever a migration rebuilds the table,
+    so this runs after every ``migrate``: missing triggers are recreated and
+    the affected FTS table is rebuilt from ``search_text``.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        existing = {row[0] for row in cursor.fetchall()}
+        for model in SEARCH_SOURCES:
+            table = model._meta.db_table
+            fts = _fts_table(model)
+            introspection = connection.introspection
+            if table not in existing or SEARCH_FIELD not in {
+                column.name for column in introspection.get_table_description(cursor, table)
+            }:
+                # not migrated (that far) yet
+                continue
+            stale = fts not in existing
+            if stale:
+                try:
+                    cursor.execute(
+                        f"CREATE VIRTUAL TABLE {fts} USING fts5("
+                        f"search_text, content='{table}', content_rowid='id', tokenize='trigram')"
+                    )
+                except Exception:  # pylint: disable=broad-except
+                    # SQLite without FTS5 or its trigram tokenizer (< 3.34):
+                    # search falls back to LIKE
+                    logger.warning("FTS5 trigram tokenizer unavailable; %s search uses LIKE", table)
+                    return
+            for suffix, body in _FTS_TRIGGERS:
+                trigger = f"{fts}_{suffix}"
+                if trigger not in existing:
+                    stale = True
+                    cursor.execute(f"CREATE TRIGGER {trigger} " + body.format(table=table, fts=fts))
+            if stale:
+                cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
@@ -0,0 +1,246 @@
+"""Settlement (uzlaşma) calculations over units and ownership shares.
+
+For every owner of a project the engine works out:
+
+- ``land_m2``: their share of the land, ``Unit.share_m2 x share / 100``
+- ``current_m2``: their share of the existing area, ``Unit.current_m2``
+  (``Unit.m2`` when no current area is recorded) ``x share / 100``
+- per scenario, the offered area ``current_m2 x ratio`` and, when the
+  scenario has a unit price, the payout ``offered x price_per_m2``
+
+The per-owner sums are computed by the database in one grouped query over
+the project's ownerships. Each scenario then only multiplies those columns
+by a scalar, so a 20k-unit project costs one aggregate query and a few
+list passes over its owners, with no per-row ORM work. A second aggregate
+over the units counts rows without an area and rows whose shares do not
+add up to 100 (`proje.shares`); those feed the warnings shown with the
+results.
+
+All areas and amounts are `Decimal` values rounded to 0.01, like the
+model fields they come from, so totals and exports carry no float noise.
+
+Scenarios come from ``PROJE_SETTLEMENT_SCENARIOS`` (a list of dicts with
+``name``, ``ratio`` and optional ``price_per_m2``). Results are cached
+under the project's fragment version (`proje.fragment_cache`), which any
+change to its owners, units or ownerships bumps, and a digest of the
+scenarios (`scenario_digest`), which the cached detail page fragment is
+keyed by as well.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .fragment_cache import fragment_timeout, project_fragment_version
+from .models import Ownership, Unit
+from .replica import read_primary
+from .shares import share_status_filter
+
+DEFAULT_SCENARIOS = (
+    {"name": "1:1", "ratio": "1"},
+    {"name": "1:1,2", "ratio": "1.2"},
+    {"name": "1:1,4", "ratio": "1.4"},
+)
+
+CENT = Decimal("0.01")
+
+OWNER_HEADERS = ("owner_id", "first_name", "last_name", "tc_no", "units", "land_m2", "current_m2")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """An exchange ratio (offered m² per existing m²) and optional unit price."""
+
+    name: str
+    ratio: Decimal
+    price_per_m2: Decimal | None = None
+
+
+def _decimal(value):
+    # str() first so that float settings such as 1.2 stay 1.2
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def settlement_scenarios():
+    """Return the configured `Scenario` list (``PROJE_SETTLEMENT_SCENARIOS``)."""
+    configured = getattr(settings, "PROJE_SETTLEMENT_SCENARIOS", None) or DEFAULT_SCENARIOS
+    return [
+        Scenario(
+            name=str(item["name"]),
+            ratio=_decimal(item["ratio"]),
+            price_per_m2=(
+                _decimal(item["price_per_m2"]) if item.get("price_per_m2") is not None else None
+            ),
+        )
+        for item in configured
+    ]
+
+
+def scenario_digest(scenarios=None):
+    """Short digest of `scenarios` (default: the configured ones) for cache keys."""
+    scenarios = list(scenarios or settlement_scenarios())
+    return hashlib.md5(repr(scenarios).encode(), usedforsecurity=False).hexdigest()[:12]
+
+
+def _scale(column, factor):
+    return [(_decimal(value) * factor).quantize(CENT) for value in column]
+
+
+@dataclass
+class Settlement:
+    """Per-owner columns and per-scenario totals of one project.
+
+    Owner data is stored column-wise (one list per attribute, all in the
+    same owner order); `offered` and `payouts` hold one column per
+    scenario (`payouts` entries are None for scenarios without a price).
+    """
+
+    scenarios: list
+    owner_ids: list = field(default_factory=list)
+    first_names: list = field(default_factory=list)
+    last_names: list = field(default_factory=list)
+    tc_nos: list = field(default_factory=list)
+    unit_counts: list = field(default_factory=list)
+    land_m2: list = field(default_factory=list)
+    current_m2: list = field(default_factory=list)
+    offered: list = field(default_factory=list)
+    payouts: list = field(default_factory=list)
+    units: int = 0
+    units_without_area: int = 0
+    units_unbalanced: int = 0
+
+    def __post_init__(self):
+        if not self.offered:
+            self.offered = [_scale(self.current_m2, s.ratio) for s in self.scenarios]
+            self.payouts = [
+                _scale(column, s.price_per_m2) if s.price_per_m2 is not None else None
+                for s, column in zip(self.scenarios, self.offered)
+            ]
+
+    @property
+    def owner_count(self):
+        """Number of owners with at least one share in the project."""
+        return len(self.owner_ids)
+
+    def totals(self):
+        """Return one dict per scenario with totals and the change vs. the first."""
+        rows = []
+        baseline = None
+        for scenario, offered, payouts in zip(self.scenarios, self.offered, self.payouts):
+            total = sum(offered, Decimal(0)).quantize(CENT)
+            baseline = total if baseline is None else baseline
+            rows.append({
+                "name": scenario.name,
+                "ratio": scenario.ratio,
+                "price_per_m2": scenario.price_per_m2,
+                "offered_m2": total,
+                "payout": sum(payouts, Decimal(0)).quantize(CENT) if payouts is not None else None,
+                "delta_m2": total - baseline,
+                "delta_percent": (
+                    ((total - baseline) / baseline * 100).quantize(CENT) if baseline else None
+                ),
+            })
+        return rows
+
+    def headers(self):
+        """Column headers of `rows`: owner fields, then offered m²/payout per scenario."""
+        headers = list(OWNER_HEADERS)
+        for scenario, payouts in zip(self.scenarios, self.payouts):
+            headers.append(f"offered_m2 [{scenario.name}]")
+            if payouts is not None:
+                headers.append(f"payout [{scenario.name}]")
+        return headers
+
+    def rows(self):
+        """Yield one tuple per owner, matching `headers`."""
+        columns = [
+            self.owner_ids, self.first_names, self.last_names, self.tc_nos,
+            self.unit_counts, self.land_m2, self.current_m2,
+        ]
+        for offered, payouts in zip(self.offered, self.payouts):
+            columns.append(offered)
+            if payouts is not None:
+                columns.append(payouts)
+        return zip(*columns)
+
+
+# m² x share percent; divided by 100 in Python so the database never rounds
+_AREA_SHARE_FIELD = DecimalField(max_digits=20, decimal_places=4)
+
+
+def _area_share_sum(area):
+    return Coalesce(
+        Sum(area * F("share_percent"), output_field=_AREA_SHARE_FIELD),
+        Value(Decimal(0)),
+        output_field=_AREA_SHARE_FIELD,
+    )
+
+
+def _shares_to_m2(column):
+    return [(_decimal(value) / 100).quantize(CENT) for value in column]
+
+
+def compute_settlement(project, scenarios=None):
+    """Compute the `Settlement` of `project` (two aggregate queries, no cache)."""
+    scenarios = list(scenarios or settlement_scenarios())
+    owners = (
+        Ownership.objects.filter(unit__project=project)
+        .order_by()
+        .values("owner_id", "owner__first_name", "owner__last_name", "owner__tc_no")
+        .annotate(
+            units=Count("unit_id", distinct=True),
+            land=_area_share_sum(F("unit__share_m2")),
+            current=_area_share_sum(Coalesce("unit__current_m2", "unit__m2")),
+        )
+        .order_by("owner__last_name", "owner__first_name", "owner_id")
+        .values_list(
+            "owner_id", "owner__first_name", "owner__last_name", "owner__tc_no",
+            "units", "land", "current",
+        )
+    )
+    columns = list(zip(*owners)) or [()] * len(OWNER_HEADERS)
+    stats = Unit.objects.filter(project=project).aggregate(
+        units=Count("pk"),
+        without_area=Count("pk", filter=Q(current_m2__isnull=True, m2__isnull=True)),
+        unbalanced=Count("pk", filter=~share_status_filter("tam")),
+    )
+    return Settlement(
+        scenarios=scenarios,
+        owner_ids=list(columns[0]),
+        first_names=list(columns[1]),
+        last_names=list(columns[2]),
+        tc_nos=list(columns[3]),
+        unit_counts=list(columns[4]),
+        land_m2=_shares_to_m2(columns[5]),
+        current_m2=_shares_to_m2(columns[6]),
+        units=stats["units"],
+        units_without_area=stats["without_area"],
+        units_unbalanced=stats["unbalanced"],
+    )
+
+
+def _cache_key(project, scenarios):
+    digest = scenario_digest(scenarios)
+    return f"proje:settlement:{project.pk}:{project_fragment_version(project)}:{digest}"
+
+
+def project_settlement(project, scenarios=None):
+    """Return the (cached) `Settlement` of `project` for `scenarios`.
+
+    Results are computed on the primary database (`proje.replica`), since
+    they are cached for every later request.
+    """
+    scenarios = list(scenarios or settlement_scenarios())
+    key = _cache_key(project, scenarios)
+    result = cache.get(key)
+    if result is None:
+        with read_primary():
+            result = compute_settlement(project, scenarios)
+        cache.set(key, result, fragment_timeout())
+    return result
+
@@ -0,0 +1,122 @@
+"""Ownership share integrity: per-unit share sums and their status.
+
+The `Ownership.share_percent` values of a unit should add up to 100.
+`Unit.share_total` caches that sum. It is adjusted incrementally with
+`F()` updates by the signal handlers in `proje.signals` and recomputed in
+bulk by paths that bypass signals (`proje.registry_import`). Writes that
+skip signals altogether can make it drift; `recompute_share_totals` fixes
+that with one correlated-subquery UPDATE.
+
+`share_status_filter` turns a status into a `Q` over the cached column,
+which the `UnitAdmin` list filter uses. `validate_project_shares` does not
+trust the cache: it sums the live shares of a whole project in one
+grouped query and returns the units whose shares do not add up.
+
+Totals are compared to 100 with a tolerance (``PROJE_SHARE_TOLERANCE``,
+default 0.1) so that rounded fractions such as 3 x 33.33 pass.
+"""
+
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import (Case, CharField, DecimalField, F, OuterRef, Q,
+                              Subquery, Sum, Value, When)
+from django.db.models.functions import Coalesce
+
+from .models import Ownership, Unit
+
+FULL_SHARE = Decimal(100)
+DEFAULT_TOLERANCE = Decimal("0.1")
+
+SHARE_STATUSES = (
+    ("tam", "Tam (%100)"),
+    ("eksik", "Eksik (<%100)"),
+    ("fazla", "Fazla (>%100)"),
+    ("yok", "Hisse yok"),
+)
+
+_SHARE_FIELD = DecimalField(max_digits=8, decimal_places=2)
+
+
+def share_tolerance():
+    """Allowed distance of a unit's share total from 100."""
+    return Decimal(str(getattr(settings, "PROJE_SHARE_TOLERANCE", DEFAULT_TOLERANCE)))
+
+
+def share_status_filter(status, field="share_total"):
+    """Return a `Q` selecting units whose `field` total has `status`.
+
+    Raises `KeyError` for an unknown status.
+    """
+    low, high = FULL_SHARE - share_tolerance(), FULL_SHARE + share_tolerance()
+    return {
+        "tam": Q(**{f"{field}__gte": low, f"{field}__lte": high}),
+        "eksik": Q(**{f"{field}__gt": 0, f"{field}__lt": low}),
+        "fazla": Q(**{f"{field}__gt": high}),
+        "yok": Q(**{f"{field}__lte": 0}),
+    }[status]
+
+
+def share_status_expression(field="share_total"):
+    """Return a `Case` computing the status key from the `field` total."""
+    return Case(
+        *(When(share_status_filter(status, field), then=Value(status)) for status, _ in SHARE_STATUSES),
+        output_field=CharField(),
+    )
+
+
+def bump_share_total(unit_id, delta):
+    """Add `delta` to the cached share total of one unit (single `UPDATE`)."""
+    if not unit_id or not delta:
+        return
+    Unit.objects.filter(pk=unit_id).update(share_total=F("share_total") + delta)
+
+
+def share_total_expression():
+    """Correlated subquery summing the shares of the outer unit."""
+    total = (
+        Ownership.objects.filter(unit=OuterRef("pk"))
+        .order_by()
+        .values("unit")
+        .annotate(total=Sum("share_percent"))
+        .values("total")
+    )
+    return Coalesce(Subquery(total[:1], output_field=_SHARE_FIELD), Value(Decimal(0)))
+
+
+def recompute_share_totals(queryset=None, dry_run=False):
+    """Reconcile `Unit.share_total` for `queryset` (default: all units).
+
+    Returns the primary keys of units whose cached total differed from the
+    sum of their shares; unless `dry_run`, those rows are fixed with a
+    single `UPDATE`.
+    """
+    queryset = Unit.objects.all() if queryset is None else queryset
+    drifted = list(
+        queryset.annotate(expected=share_total_expression())
+        .exclude(share_total=F("expected"))
+        .values_list("pk", flat=True)
+    )
+    if drifted and not dry_run:
+        Unit.objects.filter(pk__in=drifted).update(share_total=share_total_expression())
+    return drifted
+
+
+def validate_project_shares(project):
+    """Return the units of `project` whose live shares do not add up to 100.
+
+    One grouped aggregate over the project's units and ownerships; each
+    unit is annotated with ``computed_total`` and ``share_status``
+    (``eksik``, ``fazla`` or ``yok``).
+    """
+    return (
+        Unit.objects.filter(project=project)
+        .annotate(
+            computed_total=Coalesce(
+                Sum("ownership__share_percent"), Value(Decimal(0)), output_field=_SHARE_FIELD
+            )
+        )
+        .annotate(share_status=share_status_expression("computed_total"))
+        .exclude(share_status="tam")
+        .order_by("ada", "parsel", "pk")
+    )
@@ -0,0 +1,461 @@
+"""Signal handlers for the `proje` app.
+
+- invalidate cached project membership when `Project.staff` changes
+- invalidate cached project membership when `Project.manager` changes or a
+  project is deleted
+- record size, type, hash and dimensions of newly uploaded `Document` files
+- keep the denormalised `Project` counters (units, owners, documents and
+  units per agreement status) in step with creates, moves and deletes;
+  rows removed by the cascade of a project delete are skipped, since the
+  counters, share totals and fragments they would update go with it
+- keep the cached `Unit.share_total` in step with ownership writes
+- bump the cached-fragment version of projects whose owners, units,
+  ownerships or documents change (after commit)
+- release content-addressed blobs no longer referenced after a `Document`
+  or `Owner` file is replaced or its row deleted
+- refresh the folded `search_text` of owners, units and documents and
+  repair the SQLite search index after ``migrate``
+- normalise owner TC numbers and refresh their keyed hash
+- derive the registry import keys of units and owners from the fields they
+  are built from
+"""
+
+import time
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import (m2m_changed, post_delete, post_migrate, post_save,
+                                      pre_delete, pre_save)
+from django.dispatch import receiver
+
+from core.tc_kimlik import apply_tc
+
+from .counters import bump, document_project_id, unit_deltas
+from .file_metadata import apply_file_metadata
+from .fragment_cache import bump_project_fragments
+from .membership import invalidate_membership
+from .models import Document, Owner, Ownership, Project, Unit
+from .registry_import import NAME_KEY_PREFIX, owner_import_key, unit_import_key
+from .search import ensure_search_index, search_text_for
+from .shares import bump_share_total
+from .storage import CONTENT_ADDRESSED_FIELDS, content_addressing_enabled, discard_blob
+
+
+@receiver(m2m_changed, sender=Project.staff.through)
+def staff_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalidate membership for users added to/removed from `Project.staff`.
+
+    Handles both directions (`project.staff.add(user)` and
+    `user.projects.add(project)`) and `clear()`, whose affected users are
+    only known before the rows are removed.
+    """
+    _ = sender
+    if reverse:
+        # instance is a user; pk_set holds project ids
+        if action in ("post_add", "post_remove", "post_clear"):
+            invalidate_membership(instance.pk)
+        return
+
+    if action == "pre_clear":
+        instance._proje_cleared_staff = list(  # pylint: disable=protected-access
+            instance.staff.values_list("pk", flat=True)
+        )
+    elif action == "post_clear":
+        invalidate_membership(*getattr(instance, "_proje_cleared_staff", ()))
+    elif action in ("post_add", "post_remove"):
+        invalidate_membership(*(pk_set or ()))
+
+
+@receiver(pre_save, sender=Project)
+def remember_previous_manager(sender, instance, **kwargs):
+    """Record the stored `manager_id` so `post_save` can invalidate it."""
+    _ = sender
+    previous = None
+    if instance.pk:
+        previous = (
+            Project.objects.filter(pk=instance.pk)
+            .values_list("manager_id", flat=True)
+            .first()
+        )
+    instance._proje_previous_manager_id = previous  # pylint: disable=protected-access
+
+
+@receiver(post_save, sender=Project)
+def manager_changed(sender, instance, created, **kwargs):
+    """Invalidate membership for the old and new manager of a project."""
+    _ = sender
+    previous = getattr(instance, "_proje_previous_manager_id", None)
+    if created or previous != instance.manager_id:
+        invalidate_membership(previous, instance.manager_id)
+
+
+@receiver(pre_delete, sender=Project)
+def remember_project_members(sender, instance, **kwargs):
+    """Collect members before the cascade removes the staff rows."""
+    _ = sender
+    instance._proje_member_pks = [  # pylint: disable=protected-access
+        instance.manager_id,
+        *instance.staff.values_list("pk", flat=True),
+    ]
+
+
+def _project_cascade(origin):
+    """Return True when a delete signal comes from deleting a project.
+
+    `origin` is the instance or queryset `delete()` was called on.
+    """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model is Project
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    """Invalidate membership for everyone who belonged to a deleted project."""
+    _ = sender
+    invalidate_membership(*getattr(instance, "_proje_member_pks", ()))
+    _bump_fragments_after_commit(instance.pk)
+
+
+@receiver(pre_save, sender=Document)
+def document_file_metadata(sender, instance, **kwargs):
+    """Fill the metadata columns when a new file is about to be stored."""
+    _ = sender
+    if instance.file and not instance.file._committed:  # pylint: disable=protected-access
+        apply_file_metadata(instance, instance.file.file)
+
+
+# connected before refresh_search_text so the normalised number is indexed
+@receiver(pre_save, sender=Owner)
+def normalise_owner_tc(sender, instance, **kwargs):
+    """Store `tc_no` as digits only and refresh `tc_hash` (`core.tc_kimlik`)."""
+    _ = sender
+    apply_tc(instance)
+
+
+@receiver(pre_save, sender=Owner)
+@receiver(pre_save, sender=Unit)
+@receiver(pre_save, sender=Document)
+def refresh_search_text(sender, instance, update_fields=None, **kwargs):
+    """Recompute the folded search column (`proje.search`) before saving.
+
+    Saves restricted by `update_fields` only persist it when it is listed;
+    ``rebuild_search_index`` repairs rows written that way.
+    """
+    _ = sender
+    if update_fields is None or "search_text" in update_fields:
+        instance.search_text = search_text_for(instance)
+
+
+@receiver(pre_save, sender=Unit)
+@receiver(pre_save, sender=Owner)
+def refresh_import_key(sender, instance, update_fields=None, **kwargs):
+    """Derive the registry key (`proje.registry_import`) from the saved fields.
+
+    Rows saved from forms are keyed too, so a later import (e.g. of an
+    edited export) updates them instead of creating duplicates. A key
+    already held by another row of the project is left NULL rather than
+    failing the save; so is a row without ada/parsel or a valid TC number.
+    An owner an import keyed on its name (no TC) keeps that key until it
+    gets a TC number.
+    """
+    if update_fields is not None and "import_key" not in update_fields:
+        return
+    if sender is Unit:
+        key = unit_import_key(
+            instance.ada, instance.parsel, instance.door_outside, instance.door_inside
+        )
+    else:
+        key = owner_import_key(instance.tc_no)
+        if key is None and not instance.tc_no and (instance.import_key or "").startswith(
+            NAME_KEY_PREFIX
+        ):
+            key = instance.import_key
+    if key and key != instance.import_key:
+        taken = sender.objects.filter(project_id=instance.project_id, import_key=key)
+        if instance.pk:
+            taken = taken.exclude(pk=instance.pk)
+        if taken.exists():
+            key = None
+    instance.import_key = key
+
+
+@receiver(post_migrate)
+def repair_search_index(sender, using="default", **kwargs):
+    """Recreate SQLite FTS tables/triggers dropped by table rebuilds."""
+    if sender.name == "proje":
+        ensure_search_index(using)
+
+
+def _file_fields(model):
+    # pylint: disable=protected-access
+    return [
+        field
+        for app_label, model_name, field in CONTENT_ADDRESSED_FIELDS
+        if (app_label, model_name) == (model._meta.app_label, model.__name__)
+    ]
+
+
+def _release_after_commit(instance, names):
+    """Delete blobs `names` once the transaction commits, if unreferenced."""
+    # pylint: disable=protected-access
+    storage = instance._meta.get_field(_file_fields(type(instance))[0]).storage
+    requested_at = time.time()
+    for name in {n for n in names if n}:
+        transaction.on_commit(lambda name=name: discard_blob(storage, name, requested_at))
+
+
+@receiver(pre_save, sender=Document)
+@receiver(pre_save, sender=Owner)
+def remember_previous_files(sender, instance, **kwargs):
+    """Record the stored file names so `post_save` can release replaced blobs."""
+    fields = _file_fields(sender)
+    previous = {}
+    if instance.pk and content_addressing_enabled():
+        previous = sender.objects.filter(pk=instance.pk).values(*fields).first() or {}
+    instance._proje_previous_files = previous  # pylint: disable=protected-access
+
+
+@receiver(post_save, sender=Document)
+@receiver(post_save, sender=Owner)
+def release_replaced_files(sender, instance, **kwargs):
+    """Release blobs whose row now points at a different (or no) file."""
+    previous = getattr(instance, "_proje_previous_files", {})
+    replaced = [
+        name
+        for field, name in previous.items()
+        if name and name != getattr(instance, field).name
+    ]
+    if replaced:
+        _release_after_commit(instance, replaced)
+
+
+@receiver(post_delete, sender=Document)
+@receiver(post_delete, sender=Owner)
+def release_deleted_files(sender, instance, **kwargs):
+    """Release the blobs of a deleted row."""
+    if not content_addressing_enabled():
+        return
+    _release_after_commit(
+        instance, [getattr(instance, field).name for field in _file_fields(sender)]
+    )
+
+
+@receiver(pre_save, sender=Unit)
+def remember_unit_counter_state(sender, instance, **kwargs):
+    """Record the stored project and agreement status of an updated unit.
+
+    The stored `share_total` is copied back as well: only ownership writes
+    change it, and a unit loaded before those must not overwrite it.
+    """
+    _ = sender
+    previous = None
+    if instance.pk:
+        stored = (
+            Unit.objects.filter(pk=instance.pk)
+            .values_list("project_id", "agreement_status", "share_total")
+            .first()
+        )
+        if stored is not None:
+            previous, instance.share_total = stored[:2], stored[2]
+    instance._proje_counter_state = previous  # pylint: disable=protected-access
+
+
+@receiver(post_save, sender=Unit)
+def unit_saved_counters(sender, instance, created, **kwargs):
+    """Count a new unit, or move it between projects/status counters."""
+    _ = sender
+    current = (instance.project_id, instance.agreement_status)
+    previous = getattr(instance, "_proje_counter_state", None)
+    if created or previous is None:
+        bump(instance.project_id, **unit_deltas(instance.agreement_status))
+    elif previous != current:
+        bump(previous[0], **unit_deltas(previous[1], sign=-1))
+        bump(instance.project_id, **unit_deltas(instance.agreement_status))
+
+
+@receiver(post_delete, sender=Unit)
+def unit_deleted_counters(sender, instance, origin=None, **kwargs):
+    """Uncount a deleted unit."""
+    _ = sender
+    if _project_cascade(origin):
+        return
+    bump(instance.project_id, **unit_deltas(instance.agreement_status, sign=-1))
+
+
+@receiver(pre_save, sender=Ownership)
+def remember_ownership_share(sender, instance, **kwargs):
+    """Record the stored unit and share of an updated ownership."""
+    _ = sender
+    previous = None
+    if instance.pk:
+        previous = (
+            Ownership.objects.filter(pk=instance.pk)
+            .values_list("unit_id", "share_percent")
+            .first()
+        )
+    instance._proje_previous_share = previous  # pylint: disable=protected-access
+
+
+@receiver(post_save, sender=Ownership)
+def ownership_saved_share_total(sender, instance, created, **kwargs):
+    """Add a new share to its unit's total, or move/adjust a changed one."""
+    _ = sender
+    previous = getattr(instance, "_proje_previous_share", None)
+    share = Decimal(instance.share_percent or 0)
+    if created or previous is None:
+        bump_share_total(instance.unit_id, share)
+    elif previous[0] != instance.unit_id:
+        bump_share_total(previous[0], -previous[1])
+        bump_share_total(instance.unit_id, share)
+    else:
+        bump_share_total(instance.unit_id, share - previous[1])
+
+
+@receiver(post_delete, sender=Ownership)
+def ownership_deleted_share_total(sender, instance, origin=None, **kwargs):
+    """Remove a deleted share from its unit's total."""
+    _ = sender
+    if _project_cascade(origin):
+        return
+    bump_share_total(instance.unit_id, -Decimal(instance.share_percent or 0))
+
+
+@receiver(pre_save, sender=Owner)
+def remember_owner_project(sender, instance, **kwargs):
+    """Record the stored project of an updated owner."""
+    _ = sender
+    previous = None
+    if instance.pk:
+        previous = (
+            Owner.objects.filter(pk=instance.pk).values_list("project_id", flat=True).first()
+        )
+    instance._proje_previous_project_id = previous  # pylint: disable=protected-access
+
+
+@receiver(post_save, sender=Owner)
+def owner_saved_counters(sender, instance, created, **kwargs):
+    """Count a new owner or move it to another project's counter."""
+    _ = sender
+    previous = getattr(instance, "_proje_previous_project_id", None)
+    if created:
+        bump(instance.project_id, owner_count=1)
+    elif previous != instance.project_id:
+        bump(previous, owner_count=-1)
+        bump(instance.project_id, owner_count=1)
+
+
+@receiver(post_delete, sender=Owner)
+def owner_deleted_counters(sender, instance, origin=None, **kwargs):
+    """Uncount a deleted owner."""
+    _ = sender
+    if _project_cascade(origin):
+        return
+    bump(instance.project_id, owner_count=-1)
+
+
+@receiver(pre_save, sender=Document)
+def remember_document_project(sender, instance, **kwargs):
+    """Record the project an updated document is currently counted under."""
+    _ = sender
+    previous = None
+    if instance.pk:
+        stored = (
+            Document.objects.filter(pk=instance.pk)
+            .values_list("project_id", "unit__project_id")
+            .first()
+        )
+        previous = (stored[0] or stored[1]) if stored else None
+    instance._proje_previous_project_id = previous  # pylint: disable=protected-access
+
+
+@receiver(post_save, sender=Document)
+def document_saved_counters(sender, instance, created, **kwargs):
+    """Count a new document or move it to another project's counter."""
+    _ = sender
+    current = document_project_id(instance)
+    previous = getattr(instance, "_proje_previous_project_id", None)
+    if created:
+        bump(current, document_count=1)
+    elif previous != current:
+        bump(previous, document_count=-1)
+        bump(current, document_count=1)
+
+
+@receiver(pre_delete, sender=Document)
+def remember_deleted_document_project(sender, instance, origin=None, **kwargs):
+    """Resolve the counted project while a cascading unit still exists."""
+    _ = sender
+    counted = None if _project_cascade(origin) else document_project_id(instance)
+    instance._proje_counted_project_id = counted  # pylint: disable=protected-access
+
+
+@receiver(post_delete, sender=Document)
+def document_deleted_counters(sender, instance, **kwargs):
+    """Uncount a deleted document."""
+    _ = sender
+    bump(getattr(instance, "_proje_counted_project_id", None), document_count=-1)
+
+
+def _bump_fragments_after_commit(*project_ids):
+    project_ids = {pk for pk in project_ids if pk}
+    if project_ids:
+        transaction.on_commit(lambda: bump_project_fragments(*project_ids))
+
+
+@receiver(post_save, sender=Project)
+def project_saved_fragments(sender, instance, **kwargs):
+    """Project fields (code, name) appear inside the cached sections."""
+    _ = sender
+    _bump_fragments_after_commit(instance.pk)
+
+
+@receiver(post_save, sender=Unit)
+@receiver(post_delete, sender=Unit)
+def unit_changed_fragments(sender, instance, origin=None, **kwargs):
+    """Invalidate the old and new project of a changed unit."""
+    _ = sender
+    if _project_cascade(origin):
+        return
+    previous = getattr(instance, "_proje_counter_state", None) or (None,)
+    _bump_fragments_after_commit(instance.project_id, previous[0])
+
+
+@receiver(post_save, sender=Owner)
+@receiver(post_delete, sender=Owner)
+def owner_changed_fragments(sender, instance, origin=None, **kwargs):
+    """Invalidate the old and new project of a changed owner."""
+    _ = sender
+    if _project_cascade(origin):
+        return
+    _bump_fragments_after_commit(
+        instance.project_id, getattr(instance, "_proje_previous_project_id", None)
+    )
+
+
+@receiver(post_save, sender=Document)
+def document_saved_fragments(sender, instance, **kwargs):
+    """Invalidate the old and new project of a changed document."""
+    _ = sender
+    _bump_fragments_after_commit(
+        document_project_id(instance), getattr(instance, "_proje_previous_project_id", None)
+    )
+
+
+@receiver(post_delete, sender=Document)
+def document_deleted_fragments(sender, instance, **kwargs):
+    """Invalidate the project a deleted document was shown under."""
+    _ = sender
+    _bump_fragments_after_commit(getattr(instance, "_proje_counted_project_id", None))
+
+
+@receiver(post_save, sender=Ownership)
+@receiver(post_delete, sender=Ownership)
+def ownership_changed_fragments(sender, instance, origin=None, **kwargs):
+    """Invalidate the project of the unit whose ownership changed."""
+    _ = sender
+    if _project_cascade(origin):
+        return
+    _bump_fragments_after_commit(
+        Unit.objects.filter(pk=instance.unit_id).values_list("project_id", flat=True).first()
+    )
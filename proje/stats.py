@@ -0,0 +1,188 @@
+"""Daily KPI snapshots (`ProjectDailyStats`) and the dashboard built on them.
+
+`build_daily_stats` runs once a day (celery-beat task
+``proje.build_daily_stats`` or the ``build_project_stats`` command). It
+reads the denormalised `Project` counters (`proje.counters`) and adds a
+few grouped queries for the unit type/occupancy mix, the documents added
+that day and team membership, then upserts one row per project.
+
+Only today's snapshot can be built: the counters, mixes and team are
+current values, so a row for another date would record today's numbers
+under that date.
+
+`dashboard_context` renders the dashboard from the latest snapshot only,
+so page loads cost a handful of indexed queries regardless of table sizes.
+"""
+
+import datetime
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .counters import AGREEMENT_COUNTER_FIELDS
+from .membership import member_project_ids
+from .models import Document, Project, ProjectDailyStats, Unit
+
+SNAPSHOT_FIELDS = (
+    "unit_count",
+    "owner_count",
+    "document_count",
+    "documents_added",
+    *AGREEMENT_COUNTER_FIELDS.values(),
+    "unit_types",
+    "occupancy",
+    "member_ids",
+)
+
+# days of `documents_added` summed for the dashboard's document volume
+DOCUMENT_TREND_DAYS = 7
+
+
+def _grouped_counts(queryset, field):
+    """Return `{project_id: {value: count}}` for one grouped COUNT query."""
+    result = defaultdict(dict)
+    rows = queryset.order_by().values_list("project_id", field).annotate(n=Count("pk"))
+    for project_id, value, count in rows:
+        result[project_id][value] = count
+    return result
+
+
+def build_daily_stats(day=None):
+    """Upsert today's `ProjectDailyStats` rows.
+
+    `day` defaults to today; any other date raises `ValueError`, since the
+    snapshot is taken from current values. Returns the number of snapshot
+    rows written.
+    """
+    today = timezone.localdate()
+    day = day or today
+    if day != today:
+        raise ValueError(f"Snapshots can only be built for today ({today}), not {day}")
+    tz = timezone.get_current_timezone()
+    start = datetime.datetime.combine(day, datetime.time.min, tzinfo=tz)
+    end = start + datetime.timedelta(days=1)
+
+    types = _grouped_counts(Unit.objects.all(), "type")
+    occupancy = _grouped_counts(Unit.objects.all(), "occupancy")
+    added = dict(
+        Document.objects.filter(uploaded_at__gte=start, uploaded_at__lt=end)
+        .annotate(counted_project=Coalesce("project_id", "unit__project_id"))
+        .order_by()
+        .values_list("counted_project")
+        .annotate(n=Count("pk"))
+    )
+    members = defaultdict(set)
+    for project_id, user_id in Project.staff.through.objects.values_list(
+        "project_id", "user_id"
+    ):
+        members[project_id].add(user_id)
+
+    rows = []
+    counter_fields = ("unit_count", "owner_count", "document_count", *AGREEMENT_COUNTER_FIELDS.values())
+    for project in Project.objects.only("pk", "manager_id", *counter_fields).iterator():
+        team = members.get(project.pk, set()) | ({project.manager_id} if project.manager_id else set())
+        rows.append(
+            ProjectDailyStats(
+                project_id=project.pk,
+                date=day,
+                documents_added=added.get(project.pk, 0),
+                unit_types=types.get(project.pk, {}),
+                occupancy=occupancy.get(project.pk, {}),
+                member_ids=sorted(team),
+                **{field: getattr(project, field) for field in counter_fields},
+            )
+        )
+    with transaction.atomic():
+        ProjectDailyStats.objects.bulk_create(
+            rows,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["project", "date"],
+            update_fields=[*SNAPSHOT_FIELDS, "created"],
+        )
+    return len(rows)
+
+
+def _label(choices, key):
+    return dict(choices).get(key, key)
+
+
+def _mix(snapshots, attr, choices):
+    """Sum a `{key: count}` JSON column over snapshots, with display labels."""
+    totals = defaultdict(int)
+    for snap in snapshots:
+        for key, count in getattr(snap, attr).items():
+            totals[key] += count
+    return [
+        {"key": key, "label": _label(choices, key), "count": count}
+        for key, count in sorted(totals.items(), key=lambda item: -item[1])
+    ]
+
+
+def dashboard_context(user):
+    """Return the template context of the KPI dashboard for `user`.
+
+    Superusers see every project, other users the projects they manage or
+    staff. Only `ProjectDailyStats` rows of the latest snapshot date (plus
+    `DOCUMENT_TREND_DAYS` of document volume) are read.
+    """
+    stats = ProjectDailyStats.objects.all()
+    if not user.is_superuser:
+        stats = stats.filter(project_id__in=member_project_ids(user))
+    latest = stats.aggregate(latest=Max("date"))["latest"]
+    if latest is None:
+        return {"stats_date": None, "project_stats": []}
+
+    snapshots = list(
+        stats.filter(date=latest)
+        .select_related("project")
+        .order_by("project__code")
+    )
+    since = latest - datetime.timedelta(days=DOCUMENT_TREND_DAYS - 1)
+    trend = dict(
+        stats.filter(date__gte=since, date__lte=latest)
+        .values_list("project_id")
+        .annotate(n=Sum("documents_added"))
+    )
+    for snap in snapshots:
+        snap.documents_recent = trend.get(snap.project_id, 0)
+
+    workload = defaultdict(lambda: {"projects": 0, "units": 0, "documents": 0})
+    for snap in snapshots:
+        for user_id in snap.member_ids:
+            load = workload[user_id]
+            load["projects"] += 1
+            load["units"] += snap.unit_count
+            load["documents"] += snap.documents_recent
+    users = get_user_model().objects.in_bulk(list(workload))
+    staff_workload = sorted(
+        (
+            {"user": users[user_id], **load}
+            for user_id, load in workload.items()
+            if user_id in users
+        ),
+        key=lambda row: (-row["units"], -row["projects"]),
+    )
+
+    totals = {field: sum(getattr(s, field) for s in snapshots) for field in (
+        "unit_count", "owner_count", "document_count", "unit_saglandi_count"
+    )}
+    totals["projects"] = len(snapshots)
+    totals["documents_recent"] = sum(s.documents_recent for s in snapshots)
+    totals["agreement_percent"] = (
+        int(totals["unit_saglandi_count"] * 100 / totals["unit_count"])
+        if totals["unit_count"] else 0
+    )
+    return {
+        "stats_date": latest,
+        "project_stats": snapshots,
+        "totals": totals,
+        "type_mix": _mix(snapshots, "unit_types", Unit.TYPE),
+        "occupancy_mix": _mix(snapshots, "occupancy", Unit.OCCUPANCY),
+        "staff_workload": staff_workload,
+        "trend_days": DOCUMENT_TREND_DAYS,
+    }
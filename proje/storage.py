@@ -0,0 +1,156 @@
+"""Content-addressed storage for uploaded files.
+
+When `settings.PROJE_CONTENT_ADDRESSED_UPLOADS` is enabled, every file saved
+through `ContentAddressedStorage` is hashed while it is streamed and stored
+once per distinct content under::
+
+    <upload_to>/<sha256[:2]>/<sha256>/<original file name>
+
+Uploading identical content again returns the existing name without
+writing anything, so several rows can point at one blob. Rows referencing
+blobs are counted across `CONTENT_ADDRESSED_FIELDS` and a blob is only
+deleted (after commit) once no row references it any more; see the
+`Document`/`Owner` handlers in `proje.signals`.
+
+Reusing a blob and deleting it are serialised by a per-digest file lock:
+`save` finds (or re-writes) the blob and refreshes its modification time
+under the lock, and `discard_blob` re-counts references under the same
+lock and keeps any blob reused after its deletion was requested, since the
+row of that upload may not be committed yet.
+
+With the setting disabled the storage behaves exactly like
+`FileSystemStorage` and nothing is deleted automatically.
+"""
+
+import hashlib
+import logging
+import os
+import posixpath
+import re
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files import File, locks
+from django.core.files.storage import FileSystemStorage
+
+logger = logging.getLogger(__name__)
+
+# (app_label, model, field) of every file field stored content-addressed
+CONTENT_ADDRESSED_FIELDS = (
+    ("proje", "Document", "file"),
+    ("proje", "Owner", "photo"),
+    ("proje", "Owner", "id_scan"),
+)
+
+# attribute set on upload objects by `proje.file_metadata` to skip re-hashing
+SHA256_ATTR = "proje_sha256"
+
+_BLOB_NAME_RE = re.compile(r"(?:^|/)([0-9a-f]{2})/([0-9a-f]{64})/[^/]+$")
+_READ_CHUNK = 1024 * 1024
+
+
+def content_addressing_enabled():
+    """Return True when new uploads are stored content-addressed."""
+    return bool(getattr(settings, "PROJE_CONTENT_ADDRESSED_UPLOADS", False))
+
+
+def is_blob_name(name):
+    """Return True when `name` is a content-addressed blob path."""
+    match = _BLOB_NAME_RE.search(str(name or ""))
+    return bool(match) and match.group(2).startswith(match.group(1))
+
+
+def stream_sha256(content):
+    """Return the hex SHA-256 of a Django `File`, read in chunks and rewound."""
+    digest = hashlib.sha256()
+    for chunk in content.chunks(_READ_CHUNK):
+        digest.update(chunk)
+    if hasattr(content, "seek"):
+        content.seek(0)
+    return digest.hexdigest()
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """`FileSystemStorage` that deduplicates uploads by content hash."""
+
+    def save(self, name, content, max_length=None):
+        if not content_addressing_enabled():
+            return super().save(name, content, max_length=max_length)
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        digest = getattr(content, SHA256_ATTR, None) or stream_sha256(content)
+        folder = posixpath.join(posixpath.dirname(name), digest[:2], digest)
+        with blob_lock(self, folder):
+            existing = self._existing_blob(folder)
+            if existing:
+                # marks the reuse for a concurrent `discard_blob`
+                os.utime(self.path(existing))
+                return existing
+            return super().save(
+                posixpath.join(folder, posixpath.basename(name)), content, max_length=max_length
+            )
+
+    def _existing_blob(self, folder):
+        try:
+            _dirs, files = self.listdir(folder)
+        except FileNotFoundError:
+            return None
+        return posixpath.join(folder, sorted(files)[0]) if files else None
+
+
+@contextmanager
+def blob_lock(storage, folder):
+    """Hold an exclusive lock on the blob `folder` (``<...>/<sha[:2]>/<sha>``).
+
+    The lock file lives next to the folder, so it outlasts the blob itself.
+    """
+    parent = storage.path(posixpath.dirname(folder))
+    os.makedirs(parent, exist_ok=True)
+    with open(os.path.join(parent, f".{posixpath.basename(folder)}.lock"), "ab") as handle:
+        locks.lock(handle, locks.LOCK_EX)
+        try:
+            yield
+        finally:
+            locks.unlock(handle)
+
+
+def upload_storage():
+    """Storage used by `Document.file`, `Owner.photo` and `Owner.id_scan`."""
+    return ContentAddressedStorage()
+
+
+def blob_reference_count(name):
+    """Return how many rows across `CONTENT_ADDRESSED_FIELDS` reference `name`."""
+    total = 0
+    for app_label, model_name, field in CONTENT_ADDRESSED_FIELDS:
+        model = apps.get_model(app_label, model_name)
+        total += model._default_manager.filter(**{field: name}).count()  # pylint: disable=protected-access
+    return total
+
+
+def discard_blob(storage, name, requested_at=None):
+    """Delete the blob `name` from `storage` unless some row still references it.
+
+    Only content-addressed names are ever removed; legacy uploads stored
+    under their plain names are left alone. When `requested_at` (a
+    `time.time()` value) is given, a blob reused by an upload since then is
+    kept as well. Returns True when deleted.
+    """
+    if not name or not is_blob_name(name):
+        return False
+    with blob_lock(storage, posixpath.dirname(name)):
+        if blob_reference_count(name):
+            return False
+        try:
+            if requested_at is not None and os.path.getmtime(storage.path(name)) >= requested_at:
+                return False
+            storage.delete(name)
+        except FileNotFoundError:
+            return False
+        except OSError:  # pragma: no cover - best-effort cleanup
+            logger.warning("Could not delete unreferenced blob %s", name, exc_info=True)
+            return False
+    return True
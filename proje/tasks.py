@@ -0,0 +1,38 @@
+"""Celery tasks for the `proje` app.
+
+Tasks are thin wrappers around helpers in `proje.admin_helpers`,
+`proje.stats` and `proje.registry_import`, so the same code path can be
+exercised directly in tests or run in-process when Celery is configured to
+execute tasks eagerly.
+"""
+
+from pathlib import Path
+
+from celery import shared_task
+
+from .admin_helpers import execute_owner_assign_job
+from .models import Project
+from .registry_import import import_registry_file
+from .stats import build_daily_stats
+
+
+@shared_task(name="proje.run_owner_assign_job")
+def run_owner_assign_job(job_id):
+    """Process a queued `OwnerAssignJob` and return its final status."""
+    return execute_owner_assign_job(job_id).status
+
+
+@shared_task(name="proje.build_daily_stats")
+def build_daily_stats_task():
+    """Write today's `ProjectDailyStats` snapshot (scheduled by celery-beat)."""
+    return build_daily_stats()
+
+
+@shared_task(name="proje.import_registry")
+def import_registry_task(project_id, path, dry_run=False):
+    """Import an uploaded registry file, delete it and return the summary."""
+    try:
+        project = Project.objects.get(pk=project_id)
+        return import_registry_file(project, path, dry_run=dry_run)
+    finally:
+        Path(path).unlink(missing_ok=True)
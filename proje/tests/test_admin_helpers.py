@@ -114,3 +114,55 @@ class AdminHelpersTests(TestCase):
             self.assertIsNotNone(tpl_ctx2)
             # group should have user a assigned if email matched
             self.assertIn(user_a, grp.user_set.all())
+
+    def test_build_owner_assign_report_batches_lookups_and_writes(self):
+        proj = Project.objects.create(name="TP", code="TPB")
+        user_a = User.objects.create_user("b_a", email="Mixed@Test.local", password="pw")
+        user_b = User.objects.create_user("b_b", email="b@test.local", password="pw")
+        grp = Group.objects.create(name="Batch")
+        grp.user_set.add(user_b)  # existing membership must not conflict
+        Owner.objects.create(first_name="A", last_name="A", email=" mixed@test.local ", project=proj)
+        Owner.objects.create(first_name="B", last_name="B", email="B@test.local", project=proj)
+        Owner.objects.create(first_name="C", last_name="C", email="", project=proj)
+        Owner.objects.create(first_name="D", last_name="D", email="nobody@test.local", project=proj)
+        Owner.objects.create(first_name="E", last_name="E", email="mixed@test.local", project=proj)
+
+        rows, assigned = admin_helpers.build_owner_assign_report(
+            Owner.objects.order_by("pk"), grp, dry_run=True
+        )
+        self.assertEqual(
+            [r["status"] for r in rows],
+            ["would_assign", "would_assign", "no_email", "not_found", "would_assign"],
+        )
+        self.assertEqual(assigned, 0)
+        self.assertNotIn(user_a, grp.user_set.all())
+
+        rows, assigned = admin_helpers.build_owner_assign_report(
+            Owner.objects.order_by("pk"), grp
+        )
+        self.assertEqual(
+            [(r["ident"], r["status"]) for r in rows],
+            [
+                ("mixed@test.local", "assigned"),
+                ("B@test.local", "assigned"),
+                ("C C", "no_email"),
+                ("nobody@test.local", "not_found"),
+                ("mixed@test.local", "assigned"),
+            ],
+        )
+        self.assertEqual(rows[0]["user"], str(user_a))
+        self.assertEqual(rows[0]["group"], "Batch")
+        self.assertEqual(assigned, 3)
+        self.assertEqual(set(grp.user_set.all()), {user_a, user_b})
+
+    def test_build_owner_assign_report_query_count_is_constant(self):
+        proj = Project.objects.create(name="TP", code="TPQ")
+        grp = Group.objects.create(name="Batch2")
+        for i in range(20):
+            User.objects.create_user(f"q{i}", email=f"q{i}@test.local", password="pw")
+            Owner.objects.create(first_name="Q", last_name=str(i), email=f"q{i}@test.local", project=proj)
+        # owners fetch, users fetch, savepoint, insert, release savepoint
+        with self.assertNumQueries(5):
+            _rows, assigned = admin_helpers.build_owner_assign_report(Owner.objects.all(), grp)
+        self.assertEqual(assigned, 20)
+        self.assertEqual(grp.user_set.count(), 20)
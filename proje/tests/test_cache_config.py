@@ -0,0 +1,58 @@
+"""Tests for the env-driven cache and session profile in `config.settings`."""
+# pylint: disable=missing-function-docstring
+
+import runpy
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+
+def _settings_for(**env):
+    with mock.patch.dict("os.environ", env):
+        return runpy.run_path(settings.BASE_DIR / "config" / "settings.py")
+
+
+class RedisProfileTests(TestCase):
+    """A cache URL switches to Redis caches and cached_db sessions."""
+
+    def setUp(self):
+        profile = _settings_for(DJANGO_CACHE_URL="fakeredis://localhost:6379/1")
+        override = override_settings(
+            CACHES=profile["CACHES"],
+            SESSION_ENGINE=profile["SESSION_ENGINE"],
+            SESSION_CACHE_ALIAS=profile["SESSION_CACHE_ALIAS"],
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        self.addCleanup(caches["default"].clear)
+        self.addCleanup(caches["sessions"].clear)
+
+    def test_profile(self):
+        self.assertEqual(
+            settings.CACHES["default"]["BACKEND"], "django.core.cache.backends.redis.RedisCache"
+        )
+        self.assertEqual(settings.SESSION_ENGINE, "django.contrib.sessions.backends.cached_db")
+        self.assertEqual(settings.CACHES["sessions"]["KEY_PREFIX"], "syncra:sessions")
+
+    def test_cache_round_trip(self):
+        cache = caches["default"]
+        cache.set("greeting", {"text": "merhaba"})
+        self.assertEqual(cache.get("greeting"), {"text": "merhaba"})
+        self.assertEqual(cache.get_or_set("hits", 1), 1)
+        self.assertEqual(cache.incr("hits"), 2)
+
+    def test_session_round_trip_survives_cache_flush(self):
+        session = SessionStore()
+        session["project_id"] = 7
+        session.create()
+        key = f"{SessionStore.cache_key_prefix}{session.session_key}"
+        self.assertTrue(caches["sessions"].has_key(key))
+        self.assertEqual(SessionStore(session.session_key)["project_id"], 7)
+
+        # cached_db falls back to the database and caches the session again
+        caches["sessions"].clear()
+        self.assertEqual(SessionStore(session.session_key)["project_id"], 7)
+        self.assertTrue(caches["sessions"].has_key(key))
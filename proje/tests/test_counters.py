@@ -0,0 +1,104 @@
+"""Tests for the denormalised project counters in `proje.counters`."""
+# pylint: disable=missing-function-docstring
+
+import tempfile
+from io import StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from proje.ingest import ingest_documents
+from proje.models import Document, Owner, Ownership, Project, Unit
+
+
+class ProjectCounterTests(TestCase):
+    """Counters follow creates, moves, status changes and deletes."""
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        override = override_settings(MEDIA_ROOT=self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.project = Project.objects.create(name="C", code="C1")
+        self.other = Project.objects.create(name="D", code="D1")
+
+    def _counts(self, project, *fields):
+        project.refresh_from_db()
+        return tuple(getattr(project, f) for f in fields)
+
+    def test_unit_counters_and_status_changes(self):
+        unit = Unit.objects.create(project=self.project, ada="1", parsel="1")
+        Unit.objects.create(project=self.project, ada="1", parsel="2", agreement_status="saglandi")
+        self.assertEqual(
+            self._counts(self.project, "unit_count", "unit_beklemede_count", "unit_saglandi_count"),
+            (2, 1, 1),
+        )
+
+        unit.agreement_status = "saglandi"
+        unit.save()
+        self.assertEqual(
+            self._counts(self.project, "unit_beklemede_count", "unit_saglandi_count"), (0, 2)
+        )
+
+        unit.project = self.other
+        unit.save()
+        self.assertEqual(self._counts(self.project, "unit_count", "unit_saglandi_count"), (1, 1))
+        self.assertEqual(self._counts(self.other, "unit_count", "unit_saglandi_count"), (1, 1))
+
+        unit.delete()
+        self.assertEqual(self._counts(self.other, "unit_count", "unit_saglandi_count"), (0, 0))
+
+    def test_owner_and_document_counters(self):
+        owner = Owner.objects.create(project=self.project, first_name="A", last_name="B")
+        unit = Unit.objects.create(project=self.project)
+        Document.objects.create(unit=unit, file=SimpleUploadedFile("u.txt", b"u"))
+        ingest_documents([SimpleUploadedFile(f"{i}.txt", b"x") for i in range(3)], project=self.project)
+        self.assertEqual(self._counts(self.project, "owner_count", "document_count"), (1, 4))
+
+        owner.delete()
+        unit.delete()  # cascades to its document
+        self.assertEqual(
+            self._counts(self.project, "owner_count", "document_count", "unit_count"), (0, 3, 0)
+        )
+
+    def _populate(self, project, count):
+        for i in range(count):
+            unit = Unit.objects.create(project=project, ada="1", parsel=str(i))
+            owner = Owner.objects.create(project=project, first_name="A", last_name=str(i))
+            Ownership.objects.create(unit=unit, owner=owner, share_percent=100)
+            Document.objects.create(unit=unit, file=SimpleUploadedFile(f"{i}.txt", b"d"))
+
+    def _delete_queries(self, count):
+        project = Project.objects.create(name="X", code=f"X{count}")
+        self._populate(project, count)
+        with CaptureQueriesContext(connection) as ctx:
+            with self.captureOnCommitCallbacks(execute=True):
+                project.delete()
+        return len(ctx.captured_queries)
+
+    def test_project_delete_skips_per_row_bookkeeping(self):
+        self.assertEqual(self._delete_queries(2), self._delete_queries(6))
+        # deleting a single unit still updates the counters
+        self._populate(self.project, 1)
+        Unit.objects.get(project=self.project).delete()
+        self.assertEqual(
+            self._counts(self.project, "unit_count", "owner_count", "document_count"), (0, 1, 0)
+        )
+
+    def test_recount_command_fixes_drift(self):
+        Unit.objects.create(project=self.project)
+        Unit.objects.filter(project=self.project).update(agreement_status="istemiyor")
+        Project.objects.filter(pk=self.other.pk).update(owner_count=7)
+
+        out = StringIO()
+        call_command("recount_projects", "--dry-run", stdout=out)
+        self.assertIn("2 projects have drifted", out.getvalue())
+
+        call_command("recount_projects", stdout=out)
+        self.assertEqual(
+            self._counts(self.project, "unit_beklemede_count", "unit_istemiyor_count"), (0, 1)
+        )
+        self.assertEqual(self._counts(self.other, "owner_count"), (0,))
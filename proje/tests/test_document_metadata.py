@@ -0,0 +1,64 @@
+"""Tests for stored `Document` file metadata."""
+# pylint: disable=missing-function-docstring
+
+import hashlib
+import tempfile
+from io import BytesIO, StringIO
+from unittest.mock import patch
+
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from proje import admin_helpers
+from proje.ingest import ingest_documents
+from proje.models import Document
+
+
+def _jpeg(size=(40, 30)):
+    buf = BytesIO()
+    Image.new("RGB", size, (0, 80, 160)).save(buf, "JPEG")
+    return buf.getvalue()
+
+
+class DocumentMetadataTests(TestCase):
+    """Metadata is captured on upload and rendered without storage access."""
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        override = override_settings(MEDIA_ROOT=self.media, MEDIA_URL="/media/")
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_metadata_recorded_on_create_and_bulk_ingest(self):
+        data = _jpeg()
+        doc = Document.objects.create(file=SimpleUploadedFile("p.jpg", data))
+        doc.refresh_from_db()
+        self.assertEqual(
+            (doc.size, doc.content_type, doc.width, doc.height),
+            (len(data), "image/jpeg", 40, 30),
+        )
+        self.assertEqual(doc.sha256, hashlib.sha256(data).hexdigest())
+
+        pdf, = ingest_documents([SimpleUploadedFile("a.pdf", b"%PDF-1.4\n")])
+        pdf.refresh_from_db()
+        self.assertEqual((pdf.size, pdf.content_type, pdf.width), (9, "application/pdf", None))
+
+    def test_helpers_do_not_touch_storage(self):
+        doc = Document.objects.create(file=SimpleUploadedFile("n.txt", b"12345"))
+        doc = Document.objects.get(pk=doc.pk)
+        with patch.object(FileSystemStorage, "size", side_effect=AssertionError("stat")):
+            html = str(admin_helpers.format_file_link_html(doc))
+        self.assertIn('data-size="5"', html)
+
+    def test_backfill_command(self):
+        doc = Document.objects.create(file=SimpleUploadedFile("old.jpg", _jpeg((8, 6))))
+        Document.objects.filter(pk=doc.pk).update(size=None, content_type="", sha256="", width=None)
+        out = StringIO()
+        call_command("proje_document_metadata", stdout=out)
+        doc.refresh_from_db()
+        self.assertEqual((doc.width, doc.height, doc.content_type), (8, 6, "image/jpeg"))
+        self.assertEqual(len(doc.sha256), 64)
+        self.assertIn("Updated metadata for 1 documents", out.getvalue())
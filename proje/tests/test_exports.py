@@ -0,0 +1,142 @@
+"""Tests for the streaming registry exports in `proje.exports`."""
+# pylint: disable=missing-function-docstring
+
+import csv
+import io
+import unittest
+import zipfile
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from proje.exports import csv_stream, xlsx_stream
+from proje.models import Agreement, Owner, Ownership, Project, Unit
+from proje.registry_import import import_registry_file
+
+try:
+    import openpyxl
+except ImportError:  # pragma: no cover - optional dependency
+    openpyxl = None
+
+User = get_user_model()
+
+
+class ExportStreamTests(TestCase):
+    """Writers emit rows in batches, never the whole export at once."""
+
+    def test_csv_is_written_in_batches(self):
+        rows = ((i, f"ada {i}") for i in range(1200))
+        chunks = list(csv_stream(["id", "ada"], rows))
+        self.assertEqual(len(chunks), 3)
+        parsed = list(csv.reader(io.StringIO("".join(chunks).lstrip("﻿"))))
+        self.assertEqual(parsed[0], ["id", "ada"])
+        self.assertEqual(parsed[-1], ["1199", "ada 1199"])
+
+    def test_xlsx_is_a_valid_workbook(self):
+        rows = [(1, Decimal("12.50"), "Gül <Sok.>\x01", None), (2, 3.5, " x ", True)]
+        data = b"".join(xlsx_stream(["id", "m2", "address", "flag"], rows, "Bölümler"))
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.assertIsNone(archive.testzip())
+            sheet = archive.read("xl/worksheets/sheet1.xml").decode()
+        self.assertIn("Gül &lt;Sok.&gt;</t>", sheet)
+        self.assertNotIn("\x01", sheet)
+
+    def test_formulas_are_neutralised(self):
+        rows = [("=1+1", "+90 555", "@x", -5, "a=b")]
+        chunks = csv_stream(["a", "b", "c", "d", "e"], rows)
+        parsed = list(csv.reader(io.StringIO("".join(chunks).lstrip("\ufeff"))))
+        self.assertEqual(parsed[1], ["'=1+1", "'+90 555", "'@x", "-5", "a=b"])
+
+        data = b"".join(xlsx_stream(["a"], [("=1+1",)], "Sayfa"))
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            sheet = archive.read("xl/worksheets/sheet1.xml").decode()
+        self.assertIn('t="inlineStr"><is><t>=1+1</t>', sheet)
+        self.assertNotIn("<f>", sheet)
+
+    @unittest.skipUnless(openpyxl, "openpyxl is not installed")
+    def test_xlsx_opens_in_openpyxl(self):
+        rows = [(1, Decimal("12.50"), "Gül Sok.")]
+        data = b"".join(xlsx_stream(["id", "m2", "address"], rows, "Bölümler"))
+        workbook = openpyxl.load_workbook(io.BytesIO(data))
+        sheet = workbook.worksheets[0]
+        self.assertEqual(sheet.title, "Bölümler")
+        self.assertEqual(
+            list(sheet.iter_rows(values_only=True)),
+            [("id", "m2", "address"), (1, 12.5, "Gül Sok.")],
+        )
+
+
+class ProjectExportViewTests(TestCase):
+    """Members stream their project's tables; others are refused."""
+
+    def setUp(self):
+        self.project = Project.objects.create(name="E", code="E1")
+        self.other = Project.objects.create(name="O", code="O1")
+        self.user = User.objects.create_user("member", password="pw")
+        User.objects.filter(pk=self.user.pk).update(is_active=True)
+        self.project.staff.add(self.user)
+        self.client.login(username="member", password="pw")
+        unit = Unit.objects.create(project=self.project, ada="101", parsel="5", door_outside="12")
+        owner = Owner.objects.create(
+            project=self.project, first_name="Ayşe", last_name="Yılmaz", tc_no="10000000146"
+        )
+        Ownership.objects.create(unit=unit, owner=owner, share_percent=Decimal("100"))
+        Agreement.objects.create(unit=unit, status="saglandi", note="imzalandı")
+        Unit.objects.create(project=self.other, ada="999", parsel="9")
+
+    def _get(self, kind, **params):
+        return self.client.get(
+            reverse("proje:project_export", args=[self.project.pk, kind]), params
+        )
+
+    def test_csv_export_streams_project_rows(self):
+        response = self._get("units")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn("E1_units_", response["Content-Disposition"])
+        body = b"".join(response.streaming_content).decode("utf-8-sig")
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["ada"], "101")
+
+    def test_ownerships_export_can_be_imported_again(self):
+        Owner.objects.update(last_name="=Yılmaz")
+        response = self._get("ownerships")
+        data = b"".join(response.streaming_content)
+        Ownership.objects.all().delete()
+        summary = import_registry_file(self.project, io.BytesIO(data), file_format="csv")
+        self.assertEqual(summary["rejected"], 0)
+        self.assertEqual(Unit.objects.filter(project=self.project).count(), 1)
+        self.assertEqual(Ownership.objects.get().share_percent, Decimal("100.00"))
+        self.assertEqual(Owner.objects.get(project=self.project).last_name, "=Yılmaz")
+
+    def test_xlsx_export(self):
+        response = self._get("agreements", format="xlsx")
+        self.assertEqual(response.status_code, 200)
+        data = b"".join(response.streaming_content)
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            sheet = archive.read("xl/worksheets/sheet1.xml").decode()
+        self.assertIn("imzalandı", sheet)
+
+    @override_settings(PROJE_EXPORT_CHUNK_SIZE=2)
+    def test_query_count_does_not_grow_with_rows(self):
+        def count(size):
+            Owner.objects.bulk_create(
+                Owner(project=self.project, first_name="A", last_name=str(i)) for i in range(size)
+            )
+            with CaptureQueriesContext(connection) as ctx:
+                b"".join(self._get("owners").streaming_content)
+            return len([q for q in ctx.captured_queries if "proje_owner" in q["sql"]])
+
+        # SQLite has no server-side cursors: one query, fetched in chunks
+        self.assertEqual(count(1), count(20))
+
+    def test_non_members_and_unknown_kinds_are_refused(self):
+        response = self.client.get(reverse("proje:project_export", args=[self.other.pk, "units"]))
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self._get("documents").status_code, 404)
+        self.assertEqual(self._get("units", format="pdf").status_code, 404)
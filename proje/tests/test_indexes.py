@@ -0,0 +1,66 @@
+"""Query-plan tests for the lookup indexes declared on `proje` models.
+
+Each test runs `QuerySet.explain()` on a query issued by the views/helpers
+and asserts the planner picks the matching index. On PostgreSQL sequential
+scans are disabled for the test transaction because tiny test tables would
+otherwise always be scanned.
+"""
+# pylint: disable=missing-function-docstring
+
+from django.db import connection
+from django.db.models.functions import Lower
+from django.test import TestCase
+
+from proje.models import Agreement, Document, Owner, Project, Unit
+
+
+class IndexUsageTests(TestCase):
+    """The main view queries are served by the declared indexes."""
+
+    def setUp(self):
+        if connection.vendor not in ("sqlite", "postgresql"):
+            self.skipTest("EXPLAIN assertions only cover SQLite and PostgreSQL")
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        self.project = Project.objects.create(name="P", code="IDX1")
+        self.unit = Unit.objects.create(project=self.project, ada="1", parsel="2")
+
+    def assertUsesIndex(self, queryset, index_name):  # pylint: disable=invalid-name
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, msg=plan)
+
+    def test_unit_status_filter(self):
+        qs = Unit.objects.filter(project=self.project, agreement_status="saglandi")
+        self.assertUsesIndex(qs, "proje_unit_proj_status_idx")
+
+    def test_unit_ada_parsel_lookup(self):
+        qs = Unit.objects.filter(project=self.project, ada="1", parsel="2")
+        self.assertUsesIndex(qs, "proje_unit_proj_ada_parsel_idx")
+
+    def test_owner_name_listing(self):
+        qs = Owner.objects.filter(project=self.project, last_name="Yilmaz")
+        self.assertUsesIndex(qs, "proje_owner_proj_name_idx")
+
+    def test_owner_tc_lookup(self):
+        self.assertUsesIndex(Owner.objects.filter(tc_no="10000000146"), "proje_owner_tc_no_idx")
+
+    def test_owner_lower_email_lookup(self):
+        qs = Owner.objects.annotate(email_lower=Lower("email")).filter(
+            email_lower="a@example.com"
+        )
+        self.assertUsesIndex(qs, "proje_owner_email_lower_idx")
+
+    def test_document_listings(self):
+        qs = Document.objects.filter(project=self.project).order_by("-uploaded_at")
+        self.assertUsesIndex(qs, "proje_doc_proj_uploaded_idx")
+        qs = Document.objects.filter(unit=self.unit).order_by("-uploaded_at")
+        self.assertUsesIndex(qs, "proje_doc_unit_uploaded_idx")
+
+    def test_agreement_history(self):
+        qs = Agreement.objects.filter(unit=self.unit).order_by("date")
+        self.assertUsesIndex(qs, "proje_agreement_unit_date_idx")
+
+    def test_document_keyset_listing(self):
+        qs = Document.objects.order_by("-uploaded_at", "-id")[:51]
+        self.assertUsesIndex(qs, "proje_doc_uploaded_id_idx")
@@ -0,0 +1,83 @@
+"""Tests for bulk document ingestion in `proje.ingest`."""
+# pylint: disable=missing-function-docstring
+
+import os
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from proje import ingest
+from proje.fragment_cache import project_fragment_version
+from proje.ingest import ingest_documents
+from proje.models import Document, Project
+
+User = get_user_model()
+
+
+class IngestDocumentsTests(TestCase):
+    """Files are stored in parallel and rows inserted in one statement."""
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        override = override_settings(MEDIA_ROOT=self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.user = User.objects.create_user("up", password="pw")
+        self.project = Project.objects.create(name="I", code="I1")
+
+    def _files(self, count):
+        return [SimpleUploadedFile(f"scan_{i}.txt", f"page {i}".encode()) for i in range(count)]
+
+    def _stored_files(self):
+        folder = os.path.join(self.media, "proje_documents")
+        return sorted(os.listdir(folder)) if os.path.isdir(folder) else []
+
+    def test_batch_is_inserted_with_one_query(self):
+        files = self._files(20)
+        with CaptureQueriesContext(connection) as ctx:
+            docs = ingest_documents(
+                files, ["first"], max_workers=4, project=self.project, uploaded_by=self.user
+            )
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(len(docs), 20)
+        self.assertEqual(Document.objects.filter(project=self.project).count(), 20)
+        self.assertEqual([d.label for d in docs[:2]], ["first", ""])
+        self.assertEqual(str(docs[3]), "scan_3.txt")
+        with docs[3].file.open("rb") as fh:
+            self.assertEqual(fh.read(), b"page 3")
+        self.assertEqual(len(self._stored_files()), 20)
+
+    def test_batch_invalidates_project_fragments_after_commit(self):
+        before = project_fragment_version(self.project)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            ingest_documents(self._files(3), project=self.project)
+            self.assertEqual(project_fragment_version(self.project), before)
+        self.assertEqual(len(callbacks), 1)
+        self.assertNotEqual(project_fragment_version(self.project), before)
+
+    def test_failed_insert_removes_written_files(self):
+        with patch.object(Document.objects, "bulk_create", side_effect=DatabaseError("boom")):
+            with self.assertRaises(DatabaseError):
+                ingest_documents(self._files(5), project=self.project)
+        self.assertEqual(self._stored_files(), [])
+        self.assertFalse(Document.objects.exists())
+
+    def test_failed_write_removes_other_files(self):
+        real_store = ingest._store_file  # pylint: disable=protected-access
+
+        def flaky_store(field, instance, uploaded):
+            if uploaded.name == "scan_2.txt":
+                raise OSError("disk full")
+            return real_store(field, instance, uploaded)
+
+        with patch.object(ingest, "_store_file", side_effect=flaky_store):
+            with self.assertRaises(OSError):
+                ingest_documents(self._files(4), project=self.project)
+        self.assertEqual(self._stored_files(), [])
+        self.assertFalse(Document.objects.exists())
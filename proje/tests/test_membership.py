@@ -0,0 +1,90 @@
+"""Tests for project membership resolution and its cache invalidation."""
+# pylint: disable=missing-function-docstring
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from proje.membership import is_member, member_project_ids
+from proje.models import Project
+
+User = get_user_model()
+
+
+class MembershipTests(TestCase):
+    """`is_member` resolves once per request and follows staff/manager changes."""
+
+    def setUp(self):
+        cache.clear()
+        self.manager = User.objects.create_user("mgr", password="pw")
+        self.staff = User.objects.create_user("stf", password="pw")
+        self.outsider = User.objects.create_user("out", password="pw")
+        self.project = Project.objects.create(name="P", code="P1", manager=self.manager)
+        self.other = Project.objects.create(name="Q", code="Q1")
+        self.project.staff.add(self.staff)
+
+    def _fresh(self, user):
+        # simulate a new request: a user object without request-level memo
+        return User.objects.get(pk=user.pk)
+
+    def test_manager_and_staff_are_members(self):
+        self.assertTrue(is_member(self._fresh(self.manager), self.project.pk))
+        self.assertTrue(is_member(self._fresh(self.staff), str(self.project.pk)))
+        self.assertFalse(is_member(self._fresh(self.staff), self.other.pk))
+        self.assertFalse(is_member(self._fresh(self.outsider), self.project.pk))
+        self.assertFalse(is_member(self._fresh(self.staff), "not-an-id"))
+
+    def test_superuser_bypasses_check(self):
+        admin = User.objects.create_superuser("root", password="pw")
+        with self.assertNumQueries(0):
+            self.assertTrue(is_member(admin, self.other.pk))
+
+    def test_single_query_then_cached(self):
+        user = self._fresh(self.staff)
+        with self.assertNumQueries(1):
+            is_member(user, self.project.pk)
+            is_member(user, self.other.pk)
+        # next request is served from the shared cache
+        user = self._fresh(self.staff)
+        with self.assertNumQueries(0):
+            self.assertTrue(is_member(user, self.project.pk))
+
+    def test_staff_changes_invalidate_cache(self):
+        member_project_ids(self._fresh(self.outsider))
+        self.other.staff.add(self.outsider)
+        self.assertTrue(is_member(self._fresh(self.outsider), self.other.pk))
+
+        self.other.staff.remove(self.outsider)
+        self.assertFalse(is_member(self._fresh(self.outsider), self.other.pk))
+
+        self.outsider.projects.add(self.other)
+        self.assertTrue(is_member(self._fresh(self.outsider), self.other.pk))
+
+        member_project_ids(self._fresh(self.staff))
+        self.project.staff.clear()
+        self.assertFalse(is_member(self._fresh(self.staff), self.project.pk))
+
+    def test_manager_change_invalidates_old_and_new_manager(self):
+        member_project_ids(self._fresh(self.manager))
+        member_project_ids(self._fresh(self.outsider))
+        self.project.manager = self.outsider
+        self.project.save()
+        self.assertFalse(is_member(self._fresh(self.manager), self.project.pk))
+        self.assertTrue(is_member(self._fresh(self.outsider), self.project.pk))
+
+    def test_project_delete_invalidates_members(self):
+        pk = self.project.pk
+        member_project_ids(self._fresh(self.staff))
+        self.project.delete()
+        self.assertFalse(is_member(self._fresh(self.staff), pk))
+
+    def test_views_use_membership(self):
+        # new users start inactive (accounts profile signal); activate them
+        User.objects.filter(pk__in=[self.staff.pk, self.outsider.pk]).update(is_active=True)
+        self.client.force_login(self.outsider)
+        resp = self.client.get(reverse("proje:owner_add", args=[self.project.pk]))
+        self.assertEqual(resp.status_code, 403)
+        self.client.force_login(self.staff)
+        resp = self.client.get(reverse("proje:owner_add", args=[self.project.pk]))
+        self.assertEqual(resp.status_code, 200)
@@ -0,0 +1,73 @@
+"""Tests for background owner group assignment jobs."""
+# pylint: disable=missing-function-docstring
+
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from proje.admin_helpers import execute_owner_assign_job
+from proje.models import Owner, OwnerAssignJob, Project
+
+User = get_user_model()
+
+
+class OwnerAssignJobTests(TestCase):
+    """The admin action queues a job; the job assigns and writes a report."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.admin = User.objects.create_superuser("boss", email="boss@test.local", password="pw")
+        # profiles start inactive (accounts signal); re-activate for login
+        User.objects.filter(pk=self.admin.pk).update(is_active=True)
+        self.user = User.objects.create_user("own", email="own@test.local", password="pw")
+        project = Project.objects.create(name="J", code="J1")
+        self.owners = [
+            Owner.objects.create(project=project, first_name="A", last_name="A", email="own@test.local"),
+            Owner.objects.create(project=project, first_name="B", last_name="B", email="none@test.local"),
+        ]
+        self.group = Group.objects.create(name="JobGroup")
+
+    def test_admin_action_enqueues_job_and_redirects_to_status(self):
+        self.client.force_login(self.admin)
+        with override_settings(MEDIA_ROOT=self.tmpdir, CELERY_TASK_ALWAYS_EAGER=True):
+            with self.captureOnCommitCallbacks(execute=True):
+                resp = self.client.post(
+                    reverse("admin:proje_owner_changelist"),
+                    {
+                        "action": "assign_group_to_owner_users",
+                        "_selected_action": [o.pk for o in self.owners],
+                        "confirm": "1",
+                        "group": self.group.pk,
+                        "report_format": "jsonl",
+                    },
+                )
+            job = OwnerAssignJob.objects.get()
+            self.assertRedirects(
+                resp, reverse("admin:proje_owner_assign_job", args=[job.pk]),
+                fetch_redirect_response=False,
+            )
+
+            job.refresh_from_db()
+            self.assertEqual(job.status, "tamamlandi")
+            self.assertEqual((job.total, job.processed, job.assigned), (2, 2, 1))
+            self.assertTrue(job.report_file.endswith(".jsonl"))
+            self.assertTrue((Path(self.tmpdir) / job.report_file).exists())
+            self.assertIn(self.user, self.group.user_set.all())
+
+            resp = self.client.get(reverse("admin:proje_owner_assign_job", args=[job.pk]))
+            self.assertContains(resp, job.report_file_url)
+
+    def test_job_with_deleted_group_is_marked_failed(self):
+        job = OwnerAssignJob.objects.create(
+            group=self.group, owner_ids=[o.pk for o in self.owners], total=2
+        )
+        self.group.delete()
+        with override_settings(MEDIA_ROOT=self.tmpdir):
+            job = execute_owner_assign_job(job.pk)
+        self.assertEqual(job.status, "hata")
+        self.assertIn("no longer exists", job.error)
+        self.assertTrue(job.is_finished)
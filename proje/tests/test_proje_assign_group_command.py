@@ -138,3 +138,51 @@ class TestProjeAssignGroupCommand(TestCase):
                 # upload helper should have been called once
                 self.assertTrue(mock_upload.called)
                 self.assertIn("Uploaded report to S3", out.getvalue())
+
+    def test_file_bulk_engine_uses_constant_queries_per_chunk(self):
+        from django.contrib.auth.models import Group
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        tmpdir = tempfile.mkdtemp()
+        csv_path = Path(tmpdir) / "bulk.csv"
+        with csv_path.open("w", newline="", encoding="utf-8") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(["username", "group"])
+            for i in range(30):
+                writer.writerow([f"bulk{i}", "BulkA" if i % 2 else "BulkB"])
+                writer.writerow([f"bulk{i}@example.com", "BulkA"])
+            writer.writerow(["ghost", "BulkA"])
+            writer.writerow(["bulk0", ""])
+
+        for i in range(30):
+            User.objects.create_user(f"bulk{i}", email=f"bulk{i}@example.com", password="pw")
+        Group.objects.create(name="BulkA")
+
+        with override_settings(MEDIA_ROOT=tmpdir):
+            out = io.StringIO()
+            with CaptureQueriesContext(connection) as ctx:
+                call_command(
+                    "proje_assign_group", "--file", str(csv_path), "--chunk-size", "100",
+                    stdout=out,
+                )
+            # one chunk: users by username/email, groups (lookup, create,
+            # re-read), one membership insert and the transaction savepoints
+            self.assertLessEqual(len(ctx.captured_queries), 10)
+            self.assertIn("Assigned 60 users", out.getvalue())
+            self.assertIn("rows/sec", out.getvalue())
+
+        self.assertEqual(Group.objects.get(name="BulkA").user_set.count(), 30)
+        self.assertEqual(Group.objects.get(name="BulkB").user_set.count(), 15)
+
+    def test_dry_run_does_not_create_groups(self):
+        from django.contrib.auth.models import Group
+
+        tmpdir = tempfile.mkdtemp()
+        with override_settings(MEDIA_ROOT=tmpdir):
+            User.objects.create_user("gina", email="gina@example.com", password="pw")
+            call_command(
+                "proje_assign_group", "--users", "gina", "--group", "NewGroup", "--dry-run",
+                stdout=io.StringIO(),
+            )
+        self.assertFalse(Group.objects.filter(name="NewGroup").exists())
@@ -0,0 +1,171 @@
+"""Tests for the public project views in `proje.views`."""
+# pylint: disable=missing-function-docstring
+
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from proje.models import Document, Owner, Project, Unit
+from proje.pagination import encode_cursor
+from proje.views import DocumentListView, ProjectListView
+
+User = get_user_model()
+
+
+class ProjectDetailViewTests(TestCase):
+    """The detail page paginates its sections with a constant query count."""
+
+    def _make_project(self, code, size):
+        project = Project.objects.create(name=code, code=code)
+        Owner.objects.bulk_create(
+            Owner(project=project, first_name=f"A{i}", last_name=f"B{i}")
+            for i in range(size)
+        )
+        Unit.objects.bulk_create(
+            Unit(project=project, ada=str(i), parsel="1") for i in range(size)
+        )
+        return project
+
+    def _count_queries(self, project):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse("proje:project_detail", args=[project.pk]))
+        self.assertEqual(resp.status_code, 200)
+        return len(ctx.captured_queries)
+
+    @override_settings(PROJE_DETAIL_PAGE_SIZE=5)
+    def test_query_count_independent_of_project_size(self):
+        small = self._make_project("S1", 3)
+        large = self._make_project("L1", 40)
+        self.assertEqual(self._count_queries(small), self._count_queries(large))
+
+    @override_settings(PROJE_DETAIL_PAGE_SIZE=5)
+    def test_sections_are_paginated(self):
+        project = self._make_project("L2", 12)
+        url = reverse("proje:project_detail", args=[project.pk])
+        resp = self.client.get(url, {"units_page": 3})
+        self.assertEqual(resp.context["units_page"].number, 3)
+        self.assertEqual(len(resp.context["units_page"].object_list), 2)
+        self.assertEqual(resp.context["owners_page"].number, 1)
+        self.assertContains(resp, "owners_page=2")
+        # out-of-range pages fall back to the last page
+        resp = self.client.get(url, {"owners_page": 99})
+        self.assertEqual(resp.context["owners_page"].number, 3)
+
+    @override_settings(PROJE_DETAIL_PAGE_SIZE=5)
+    def test_fragments_are_keyed_by_their_own_page_only(self):
+        project = self._make_project("L3", 12)
+        url = reverse("proje:project_detail", args=[project.pk])
+        self.client.get(url)
+        cached = self._count_queries(project)
+        # unrelated parameters and other sections' pages reuse the fragments
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url, {"x": "1"})
+        self.assertEqual(len(ctx.captured_queries), cached)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url, {"units_page": 2})
+        self.assertFalse(any("proje_owner" in q["sql"] for q in ctx.captured_queries))
+        self.assertContains(resp, 'href="?units_page=3"')
+
+
+class KeysetListViewTests(TestCase):
+    """List views page through rows with stable cursors."""
+
+    def _walk(self, url):
+        seen, pages, params = [], 0, {}
+        while True:
+            resp = self.client.get(url, params)
+            self.assertEqual(resp.status_code, 200)
+            page = resp.context["page_obj"]
+            seen.extend(obj.pk for obj in page)
+            pages += 1
+            if not page.has_next():
+                return seen, pages, page
+            params = {"cursor": page.next_cursor}
+
+    @patch.object(ProjectListView, "paginate_by", 3)
+    def test_project_list_walks_all_rows_in_code_order(self):
+        Project.objects.bulk_create(
+            Project(name=f"P{i}", code=f"C{i:03d}") for i in range(7)
+        )
+        url = reverse("proje:project_list")
+        seen, pages, last = self._walk(url)
+        expected = list(Project.objects.order_by("code", "id").values_list("pk", flat=True))
+        self.assertEqual(seen, expected)
+        self.assertEqual(pages, 3)
+
+        # the previous cursor of the last page leads back to the middle page
+        resp = self.client.get(url, {"cursor": last.previous_cursor})
+        page = resp.context["page_obj"]
+        self.assertEqual([p.pk for p in page], expected[3:6])
+        self.assertTrue(page.has_next())
+        self.assertTrue(page.has_previous())
+
+    @patch.object(DocumentListView, "paginate_by", 2)
+    def test_document_list_walks_newest_first(self):
+        tmpdir = tempfile.mkdtemp()
+        with override_settings(MEDIA_ROOT=tmpdir, MEDIA_URL="/media/"):
+            project = Project.objects.create(name="D", code="D1")
+            for i in range(5):
+                Document.objects.create(
+                    project=project, file=SimpleUploadedFile(f"f{i}.txt", b"x")
+                )
+            url = reverse("proje:documents")
+            seen, pages, _last = self._walk(url)
+            expected = list(
+                Document.objects.order_by("-uploaded_at", "-id").values_list("pk", flat=True)
+            )
+            self.assertEqual(seen, expected)
+            self.assertEqual(pages, 3)
+
+    def test_invalid_cursor_shows_first_page(self):
+        Project.objects.create(name="P", code="C1")
+        resp = self.client.get(reverse("proje:project_list"), {"cursor": "garbage!"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.context["page_obj"]), 1)
+        self.assertFalse(resp.context["page_obj"].has_previous())
+
+    def test_tampered_cursor_values_show_first_page(self):
+        Project.objects.create(name="P", code="C1")
+        for values in (["x", "y"], [["a"], {}], [None, None], ["C1"]):
+            for url in (reverse("proje:project_list"), reverse("proje:documents")):
+                resp = self.client.get(url, {"cursor": encode_cursor(values)})
+                self.assertEqual(resp.status_code, 200, (url, values))
+                self.assertFalse(resp.context["page_obj"].has_previous())
+
+
+class ProjectDetailFragmentCacheTests(TestCase):
+    """Detail sections are served from cache until the project changes."""
+
+    def setUp(self):
+        self.project = Project.objects.create(name="F", code="F1")
+        self.url = reverse("proje:project_detail", args=[self.project.pk])
+
+    def _get(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, 200)
+        return resp, len(ctx.captured_queries)
+
+    def test_cached_sections_skip_queries_until_a_change(self):
+        Owner.objects.create(project=self.project, first_name="Eski", last_name="Malik")
+        _resp, cold = self._get()
+        resp, warm = self._get()
+        self.assertContains(resp, "Eski Malik")
+        self.assertLess(warm, cold)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Owner.objects.create(project=self.project, first_name="Yeni", last_name="Malik")
+        resp, _count = self._get()
+        self.assertContains(resp, "Yeni Malik")
+
+        unit = Unit.objects.create(project=self.project, ada="7", parsel="9")
+        with self.captureOnCommitCallbacks(execute=True):
+            unit.owners.through.objects.create(unit=unit, owner=Owner.objects.first())
+        resp, _count = self._get()
+        self.assertContains(resp, "7/9")
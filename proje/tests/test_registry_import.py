@@ -0,0 +1,284 @@
+"""Tests for the bulk registry import in `proje.registry_import`."""
+# pylint: disable=missing-function-docstring
+
+import csv
+import io
+import tempfile
+import unittest
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from proje.models import Owner, Ownership, Project, Unit
+from proje.registry_import import (
+    RegistryImportEngine,
+    import_registry_file,
+    normalize_header,
+    parse_share,
+    unit_import_key,
+)
+
+try:
+    import openpyxl
+except ImportError:  # pragma: no cover - optional dependency
+    openpyxl = None
+
+User = get_user_model()
+
+TC_A = "10000000146"
+TC_B = "12345678950"
+
+HEADER = ["Ada", "Parsel", "Dış Kapı", "İç Kapı", "Adres", "Ad", "Soyad", "TC", "Hisse"]
+ROWS = [
+    ["101", "5", "12", "1", "Gül Sok.", "Ayşe", "Yılmaz", TC_A, "1/2"],
+    ["101", "5", "12", "1", "Gül Sok.", "Mehmet", "Öz", TC_B, "%50"],
+    ["101", "5", "12", "2", "Gül Sok.", "Ayşe", "Yılmaz", TC_A, "100"],
+]
+
+
+def _csv(rows, header=HEADER, delimiter=";"):
+    buf = io.StringIO()
+    writer = csv.writer(buf, delimiter=delimiter)
+    writer.writerow(header)
+    writer.writerows(rows)
+    return buf.getvalue().encode("utf-8")
+
+
+class RegistryParsingTests(TestCase):
+    """Headers, keys and shares are normalised before import."""
+
+    def test_turkish_headers_map_to_columns(self):
+        self.assertEqual(normalize_header("Dış Kapı"), "door_outside")
+        self.assertEqual(normalize_header("T.C. Kimlik No"), "tc_no")
+        self.assertEqual(normalize_header("Hisse Oranı"), "share_percent")
+
+    def test_unit_key_is_folded_and_requires_ada_parsel(self):
+        self.assertEqual(unit_import_key("101", "5", "12A", ""), "101|5|12a|")
+        self.assertEqual(unit_import_key(" 101 ", "5", "12a"), unit_import_key("101", "5", "12A"))
+        self.assertIsNone(unit_import_key("", "5"))
+
+    def test_shares_accept_fractions_and_percent(self):
+        self.assertEqual(parse_share("1/4"), Decimal("25.00"))
+        self.assertEqual(parse_share("%25,5"), Decimal("25.50"))
+        self.assertEqual(parse_share(""), Decimal("100"))
+        with self.assertRaises(ValueError):
+            parse_share("120")
+
+
+class RegistryImportTests(TestCase):
+    """Rows are upserted in bulk, rejected rows reported."""
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        override = override_settings(MEDIA_ROOT=self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.project = Project.objects.create(name="R", code="R1")
+
+    def _import(self, data, **kwargs):
+        return import_registry_file(self.project, io.BytesIO(data), file_format="csv", **kwargs)
+
+    def test_csv_creates_units_owners_and_ownerships(self):
+        summary = self._import(_csv(ROWS))
+        self.assertEqual(summary["processed"], 3)
+        self.assertEqual(summary["rejected"], 0)
+        self.assertIsNone(summary["report_file"])
+        self.assertEqual(Unit.objects.filter(project=self.project).count(), 2)
+        self.assertEqual(Owner.objects.filter(project=self.project).count(), 2)
+        self.assertEqual(Ownership.objects.count(), 3)
+        unit = Unit.objects.get(door_inside="1")
+        self.assertEqual(unit.import_key, "101|5|12|1")
+        self.assertEqual(
+            sorted(unit.ownership_set.values_list("share_percent", flat=True)),
+            [Decimal("50.00"), Decimal("50.00")],
+        )
+        owner = Owner.objects.get(tc_no=TC_A)
+        self.assertIn("ayse", owner.search_text)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.unit_count, 2)
+        self.assertEqual(self.project.owner_count, 2)
+
+    def test_reimport_updates_instead_of_duplicating(self):
+        self._import(_csv(ROWS))
+        changed = [
+            ["101", "5", "12", "1", "Lale Sok.", "Ayşe", "Yılmaz-Kara", TC_A, "1/4"],
+            ["101", "5", "12", "1", "Lale Sok.", "Mehmet", "Öz", TC_B, "3/4"],
+        ]
+        summary = self._import(_csv(changed))
+        self.assertEqual(summary["rejected"], 0)
+        self.assertEqual(Unit.objects.count(), 2)
+        self.assertEqual(Owner.objects.count(), 2)
+        self.assertEqual(Ownership.objects.count(), 3)
+        unit = Unit.objects.get(door_inside="1")
+        self.assertEqual(unit.address, "Lale Sok.")
+        self.assertIn("lale", unit.search_text)
+        self.assertEqual(Owner.objects.get(tc_no=TC_A).last_name, "Yılmaz-Kara")
+        self.assertEqual(
+            Ownership.objects.get(unit=unit, owner__tc_no=TC_B).share_percent, Decimal("75.00")
+        )
+
+    def test_rejected_rows_are_written_to_report(self):
+        rows = ROWS + [
+            ["", "5", "1", "", "", "", "", "", ""],
+            ["102", "6", "1", "", "", "Ali", "Can", "12345678901", ""],
+        ]
+        summary = self._import(_csv(rows))
+        self.assertEqual(summary["processed"], 5)
+        self.assertEqual(summary["rejected"], 2)
+        self.assertEqual(Unit.objects.count(), 2)
+        report = Path(summary["report_file"])
+        self.assertTrue(report.is_relative_to(Path(self.media)))
+        with report.open(newline="", encoding="utf-8") as fh:
+            rejected = list(csv.DictReader(fh))
+        self.assertEqual([row["line"] for row in rejected], ["5", "6"])
+        self.assertIn("ada and parsel", rejected[0]["error"])
+        self.assertIn("tc_no", rejected[1]["error"])
+
+    def test_report_lines_count_blank_lines(self):
+        lines = _csv(ROWS[:2]).decode().splitlines()
+        data = "\r\n".join(lines + ["", ";;;;;;;;", "101;;;;;;;;"]) + "\r\n"
+        summary = self._import(data.encode())
+        self.assertEqual(summary["rejected"], 1)
+        with Path(summary["report_file"]).open(newline="", encoding="utf-8") as fh:
+            self.assertEqual([row["line"] for row in csv.DictReader(fh)], ["6"])
+
+    def test_owners_without_tc_are_keyed_on_name_and_unit(self):
+        rows = [
+            ["101", "5", "12", "1", "", "Hazine", "", "", "1/2"],
+            ["101", "5", "12", "2", "", "Hazine", "", "", "100"],
+            ["101", "5", "12", "1", "", "Ayşe", "Yılmaz", TC_A, "1/2"],
+        ]
+        summary = self._import(_csv(rows))
+        self.assertEqual(summary["rejected"], 0)
+        treasury = Owner.objects.filter(first_name="Hazine")
+        self.assertEqual(treasury.count(), 2)
+        self.assertTrue(all(key.startswith("ad:") for key in treasury.values_list("import_key", flat=True)))
+        self.assertEqual(set(treasury.values_list("tc_no", flat=True)), {""})
+
+        owner = treasury.get(ownership__unit__door_inside="1")
+        owner.phone = "0312"
+        owner.save()
+        rows[0][8] = "1/4"
+        self.assertEqual(self._import(_csv(rows))["rejected"], 0)
+        self.assertEqual(Owner.objects.count(), 3)
+        self.assertEqual(Ownership.objects.get(owner=owner).share_percent, Decimal("25.00"))
+
+    def test_dry_run_writes_nothing(self):
+        summary = self._import(_csv(ROWS), dry_run=True)
+        self.assertEqual(summary["processed"], 3)
+        self.assertFalse(Unit.objects.exists())
+        self.assertFalse(Owner.objects.exists())
+
+    def test_existing_rows_keep_columns_missing_from_file(self):
+        self._import(_csv(ROWS))
+        Unit.objects.filter(door_inside="1").update(m2=Decimal("90"))
+        self._import(_csv([["101", "5", "12", "1"]], header=["ada", "parsel", "door_outside", "door_inside"]))
+        unit = Unit.objects.get(door_inside="1")
+        self.assertEqual(unit.m2, Decimal("90.00"))
+        self.assertEqual(unit.address, "Gül Sok.")
+
+    def test_chunks_are_processed_independently(self):
+        engine = RegistryImportEngine(self.project, chunk_size=1)
+        rejected = list(engine.run([dict(zip(
+            ["ada", "parsel", "first_name", "last_name", "tc_no"], ["1", "2", "A", "B", TC_A]
+        ))] * 3))
+        self.assertEqual(rejected, [])
+        self.assertEqual(engine.processed, 3)
+        self.assertEqual(Unit.objects.count(), 1)
+        self.assertEqual(Ownership.objects.count(), 1)
+
+    def test_saving_a_unit_refreshes_its_key(self):
+        self._import(_csv(ROWS))
+        unit = Unit.objects.get(door_inside="2")
+        unit.door_inside = "3"
+        unit.save()
+        self.assertEqual(unit.import_key, "101|5|12|3")
+        manual = Unit.objects.create(project=self.project, ada="9", parsel="9")
+        self.assertEqual(manual.import_key, "9|9||")
+        # a key held by another unit of the project is not taken over
+        duplicate = Unit.objects.create(project=self.project, ada="9", parsel="9")
+        self.assertIsNone(duplicate.import_key)
+
+    @unittest.skipUnless(openpyxl, "openpyxl is not installed")
+    def test_xlsx_import(self):
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(HEADER)
+        for row in ROWS:
+            sheet.append(row)
+        path = Path(self.media) / "registry.xlsx"
+        workbook.save(path)
+        summary = import_registry_file(self.project, path)
+        self.assertEqual(summary["rejected"], 0)
+        self.assertEqual(Ownership.objects.count(), 3)
+
+        sheet.append([None] * len(HEADER))
+        sheet.append(["", "7"])
+        workbook.save(path)
+        summary = import_registry_file(self.project, path, report_file="reports/x.csv")
+        with Path(summary["report_file"]).open(newline="", encoding="utf-8") as fh:
+            self.assertEqual([row["line"] for row in csv.DictReader(fh)], ["6"])
+
+    def test_management_command(self):
+        path = Path(self.media) / "registry.csv"
+        path.write_bytes(_csv(ROWS))
+        out = io.StringIO()
+        call_command("import_registry", str(path), project=self.project.code, stdout=out)
+        self.assertIn("Processed 3 rows", out.getvalue())
+        self.assertEqual(Ownership.objects.count(), 3)
+
+
+@override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+class RegistryImportAdminTests(TestCase):
+    """The Project admin import page runs the (eager) import task."""
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        override = override_settings(MEDIA_ROOT=self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.project = Project.objects.create(name="R", code="R1")
+        self.admin = User.objects.create_superuser("root", "root@example.com", "pw")
+        User.objects.filter(pk=self.admin.pk).update(is_active=True)
+        self.client.login(username="root", password="pw")
+        self.url = reverse("admin:proje_project_import_registry")
+
+    def test_page_renders(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "İçe Aktar")
+
+    def test_upload_imports_and_removes_file(self):
+        rows = ROWS + [["", "", "", "", "", "", "", "", ""], ["x", "", "", "", "", "", "", "", ""]]
+        upload = SimpleUploadedFile("tapu.csv", _csv(rows), content_type="text/csv")
+        response = self.client.post(
+            self.url, {"project": self.project.pk, "file": upload}, follow=True
+        )
+        self.assertRedirects(response, reverse("admin:proje_project_changelist"))
+        self.assertEqual(Ownership.objects.count(), 3)
+        self.assertContains(response, "reddedilen satırlar")
+        self.assertEqual(list((Path(self.media) / "imports").glob("*")), [])
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=False)
+    def test_upload_is_queued_without_eager_celery(self):
+        upload = SimpleUploadedFile("tapu.csv", _csv(ROWS), content_type="text/csv")
+        with mock.patch("proje.tasks.import_registry_task.delay") as delay:
+            response = self.client.post(
+                self.url, {"project": self.project.pk, "file": upload}, follow=True
+            )
+        delay.assert_called_once()
+        delay.return_value.successful.assert_not_called()
+        self.assertContains(response, "R1 için içe aktarma kuyruğa alındı")
+        self.assertFalse(Ownership.objects.exists())
+
+    def test_other_formats_are_rejected(self):
+        upload = SimpleUploadedFile("tapu.txt", b"ada;parsel\n1;2\n")
+        response = self.client.post(self.url, {"project": self.project.pk, "file": upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Unit.objects.exists())
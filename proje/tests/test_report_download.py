@@ -0,0 +1,76 @@
+"""Tests for `proje.views.report_download` delivery modes."""
+# pylint: disable=missing-function-docstring
+
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+User = get_user_model()
+
+BODY = b"0123456789" * 10
+
+
+class ReportDownloadTests(TestCase):
+    """Conditional, range and offloaded downloads after the access checks."""
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        (Path(self.media) / "reports").mkdir()
+        (Path(self.media) / "reports" / "r.csv").write_bytes(BODY)
+        self.settings_override = override_settings(MEDIA_ROOT=self.media)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        staff = User.objects.create_user("staff", password="pw", is_staff=True)
+        # profiles start inactive (accounts signal); re-activate for login
+        User.objects.filter(pk=staff.pk).update(is_active=True)
+        self.client.force_login(User.objects.get(pk=staff.pk))
+        self.url = reverse("proje:report_download", args=["reports/r.csv"])
+
+    def test_full_download_then_not_modified(self):
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(b"".join(resp.streaming_content), BODY)
+        self.assertEqual(resp["Accept-Ranges"], "bytes")
+        etag = resp["ETag"]
+
+        resp = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+
+    def test_range_requests(self):
+        resp = self.client.get(self.url, HTTP_RANGE="bytes=10-19")
+        self.assertEqual(resp.status_code, 206)
+        self.assertEqual(resp["Content-Range"], "bytes 10-19/100")
+        self.assertEqual(resp["Content-Length"], "10")
+        self.assertEqual(b"".join(resp.streaming_content), BODY[10:20])
+
+        resp = self.client.get(self.url, HTTP_RANGE="bytes=-5")
+        self.assertEqual(b"".join(resp.streaming_content), BODY[-5:])
+
+        resp = self.client.get(self.url, HTTP_RANGE="bytes=500-")
+        self.assertEqual(resp.status_code, 416)
+        self.assertEqual(resp["Content-Range"], "bytes */100")
+
+    def test_stale_if_range_sends_full_file(self):
+        resp = self.client.get(self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(b"".join(resp.streaming_content), BODY)
+
+    @override_settings(
+        PROJE_DOWNLOAD_OFFLOAD="x-accel-redirect", PROJE_DOWNLOAD_ACCEL_PREFIX="/protected/"
+    )
+    def test_accel_redirect_offload(self):
+        resp = self.client.get(self.url)
+        self.assertEqual(resp["X-Accel-Redirect"], "/protected/reports/r.csv")
+        self.assertEqual(resp.content, b"")
+        self.assertIn("attachment", resp["Content-Disposition"])
+
+    @override_settings(PROJE_DOWNLOAD_OFFLOAD="x-sendfile")
+    def test_sendfile_offload_and_traversal_still_checked(self):
+        resp = self.client.get(self.url)
+        self.assertEqual(resp["X-Sendfile"], str((Path(self.media) / "reports" / "r.csv").resolve()))
+
+        resp = self.client.get(reverse("proje:report_download", args=["../etc/passwd"]))
+        self.assertEqual(resp.status_code, 404)
@@ -0,0 +1,83 @@
+"""Tests for the streaming report writers in `proje.reports`."""
+# pylint: disable=missing-function-docstring
+
+import csv
+import gzip
+import json
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from proje.reports import ReportSink, peek_rows, write_report
+
+ROWS = [
+    {"ident": "a@x", "user": "a", "group": "G", "status": "assigned"},
+    {"ident": "ğüş@x", "group": "", "status": "not_found", "extra": 1},
+]
+
+
+class ReportSinkTests(SimpleTestCase):
+    """Each format round-trips rows produced lazily by a generator."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def _generate(self):
+        yield from ROWS
+
+    def test_csv_keeps_only_fieldnames(self):
+        path, count = write_report(
+            self._generate(), Path(self.tmpdir) / "r.csv", "csv",
+            fieldnames=["ident", "user", "group", "status"],
+        )
+        self.assertEqual(count, 2)
+        with path.open(encoding="utf-8", newline="") as fh:
+            rows = list(csv.DictReader(fh))
+        self.assertEqual(rows[1], {"ident": "ğüş@x", "user": "", "group": "", "status": "not_found"})
+
+    def test_json_array_and_json_lines(self):
+        path, _ = write_report(self._generate(), Path(self.tmpdir) / "r.json", "json")
+        self.assertEqual(json.loads(path.read_text(encoding="utf-8")), ROWS)
+
+        path, _ = write_report(self._generate(), Path(self.tmpdir) / "r.jsonl", "jsonl")
+        lines = path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual([json.loads(line) for line in lines], ROWS)
+
+    def test_empty_json_array(self):
+        path, count = write_report(iter(()), Path(self.tmpdir) / "e.json", "json")
+        self.assertEqual(count, 0)
+        self.assertEqual(json.loads(path.read_text(encoding="utf-8")), [])
+
+    def test_gzip_appends_suffix(self):
+        path, _ = write_report(
+            self._generate(), Path(self.tmpdir) / "r.jsonl", "jsonl", compress=True
+        )
+        self.assertEqual(path.name, "r.jsonl.gz")
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            self.assertEqual([json.loads(line) for line in fh], ROWS)
+
+    def test_relative_paths_go_under_media_root(self):
+        with override_settings(MEDIA_ROOT=self.tmpdir):
+            with ReportSink("reports/x.jsonl", "jsonl") as sink:
+                sink.write(ROWS[0])
+        self.assertEqual(sink.path, Path(self.tmpdir) / "reports" / "x.jsonl")
+        self.assertTrue(sink.path.exists())
+
+    def test_invalid_format_and_missing_csv_fields(self):
+        with self.assertRaises(ValueError):
+            ReportSink(Path(self.tmpdir) / "r.xml", "xml")
+        with self.assertRaises(ValueError):
+            ReportSink(Path(self.tmpdir) / "r.csv", "csv")
+
+    def test_peek_rows_preserves_first_row(self):
+        has_rows, rows = peek_rows(self._generate())
+        self.assertTrue(has_rows)
+        self.assertEqual(list(rows), ROWS)
+        has_rows, rows = peek_rows(iter(()))
+        self.assertFalse(has_rows)
+        self.assertEqual(list(rows), [])
+        listed = list(ROWS)
+        self.assertEqual(peek_rows(listed), (True, listed))
+        self.assertIs(peek_rows(listed)[1], listed)
+        self.assertEqual(peek_rows([]), (False, []))
@@ -0,0 +1,97 @@
+"""Tests for the shared S3 client and batch uploads in `proje.utils`.
+
+Uploads run against botocore's `Stubber`, a local stand-in that answers
+API calls on the shared client without any network access.
+"""
+# pylint: disable=missing-function-docstring
+
+import os
+import tempfile
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+from botocore.stub import ANY, Stubber
+from django.test import SimpleTestCase, override_settings
+
+from proje import utils
+
+FAKE_ENV = {
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "AWS_DEFAULT_REGION": "eu-central-1",
+}
+
+
+@override_settings(S3_ENDPOINT_URL="http://s3.local:9000", S3_REGION_NAME="eu-central-1")
+class S3UtilsTests(SimpleTestCase):
+    """The client is shared process-wide and batch uploads run in parallel."""
+
+    def setUp(self):
+        self._env = patch.dict(os.environ, FAKE_ENV)
+        self._env.start()
+        utils.reset_s3_client()
+        self.addCleanup(utils.reset_s3_client)
+        self.addCleanup(self._env.stop)
+        self.tmpdir = Path(tempfile.mkdtemp())
+
+    def _files(self, count):
+        paths = []
+        for i in range(count):
+            path = self.tmpdir / f"report_{i}.csv"
+            path.write_text(f"row,{i}\n", encoding="utf-8")
+            paths.append(path)
+        return paths
+
+    @staticmethod
+    def _put_params():
+        params = {"Bucket": "reports", "Key": ANY, "Body": ANY, "ACL": "public-read"}
+        # newer botocore adds a default checksum to every PutObject
+        params["ChecksumAlgorithm"] = ANY
+        return params
+
+    def test_client_is_created_once_across_threads(self):
+        seen = []
+        threads = [
+            threading.Thread(target=lambda: seen.append(utils.get_s3_client()))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len({id(c) for c in seen}), 1)
+        self.assertEqual(seen[0].meta.endpoint_url, "http://s3.local:9000")
+
+    @override_settings(S3_MULTIPART_THRESHOLD=1024, S3_MAX_CONCURRENCY=3)
+    def test_transfer_config_follows_settings(self):
+        config = utils.get_transfer_config()
+        self.assertEqual(config.multipart_threshold, 1024)
+        self.assertEqual(config.max_concurrency, 3)
+
+    def test_upload_files_to_s3_in_parallel(self):
+        paths = self._files(5)
+        client = utils.get_s3_client()
+        with Stubber(client) as stubber:
+            for _ in paths:
+                stubber.add_response("put_object", {}, self._put_params())
+            results = utils.upload_files_to_s3(
+                paths, bucket="reports", prefix="owners/", public=True, max_workers=3
+            )
+            stubber.assert_no_pending_responses()
+
+        self.assertEqual([r["path"] for r in results], [str(p) for p in paths])
+        self.assertEqual(results[0]["key"], "owners/report_0.csv")
+        self.assertEqual(
+            results[0]["url"], "http://s3.local:9000/reports/owners/report_0.csv"
+        )
+
+    def test_failed_upload_is_reported_per_file(self):
+        missing = self.tmpdir / "missing.csv"
+        results = utils.upload_files_to_s3([missing], bucket="reports")
+        self.assertEqual(results[0]["path"], str(missing))
+        self.assertIn("error", results[0])
+
+    def test_bucket_is_required(self):
+        with self.assertRaises(ValueError):
+            utils.upload_files_to_s3(self._files(1))
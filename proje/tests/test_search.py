@@ -0,0 +1,117 @@
+"""Tests for the folded search index in `proje.search`."""
+# pylint: disable=missing-function-docstring
+
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from proje.admin_helpers import SearchIndexAdminMixin
+from proje.models import Document, Owner, Project, Unit
+from proje.search import fold, fts_available, rebuild_search_text, search
+
+User = get_user_model()
+
+
+class FoldTests(TestCase):
+    """Turkish letters fold to the same ASCII form in any case."""
+
+    def test_turkish_case_and_letters(self):
+        self.assertEqual(fold("  IŞIK  İĞDE  "), "isik igde")
+        self.assertEqual(fold("ışık"), fold("Işık"))
+        self.assertEqual(fold("ÇÖMLEKÇİ Ümit"), "comlekci umit")
+        self.assertEqual(fold("Café"), "cafe")
+
+
+class SearchTests(TestCase):
+    """search_text is maintained on save and matched on every backend."""
+
+    def setUp(self):
+        media = override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+        media.enable()
+        self.addCleanup(media.disable)
+        self.project = Project.objects.create(name="Arama", code="S1")
+        self.other = Project.objects.create(name="Diğer", code="S2")
+        self.owner = Owner.objects.create(
+            project=self.project, first_name="Şükrü", last_name="IŞIKLI", tc_no="12345678901"
+        )
+        Owner.objects.create(project=self.other, first_name="Ayşe", last_name="Işık")
+        self.unit = Unit.objects.create(project=self.project, ada="101", parsel="7", address="Çınar Sok.")
+
+    def test_owner_found_with_folded_and_partial_terms(self):
+        if connection.vendor == "sqlite":
+            self.assertTrue(fts_available("default", Owner))
+        owners = Owner.objects.all()
+        self.assertEqual(list(search(owners, "sukru isik")), [self.owner])
+        self.assertEqual(list(search(owners, "ŞÜKRÜ")), [self.owner])
+        self.assertEqual(search(owners, "ışık").count(), 2)
+        self.assertEqual(search(owners, "mehmet").count(), 0)
+        self.assertEqual(search(owners, "  ").count(), 2)
+
+    def test_terms_match_inside_words_on_every_backend(self):
+        owners = Owner.objects.all()
+        self.assertEqual(list(search(owners, "sikli")), [self.owner])
+        self.assertEqual(list(search(owners, "krü")), [self.owner])
+        # too short for the trigram index
+        self.assertEqual(list(search(owners, "kl")), [self.owner])
+        self.assertEqual(search(owners, "ş ı").count(), 2)
+
+    def test_tc_numbers_are_not_in_the_search_text(self):
+        self.assertEqual(self.owner.search_text, "sukru isikli")
+        self.assertEqual(search(Owner.objects.all(), "1234567").count(), 0)
+
+    def test_updates_and_deletes_reach_the_index(self):
+        self.owner.last_name = "Yıldız"
+        self.owner.save()
+        self.assertEqual(list(search(Owner.objects.all(), "yildiz")), [self.owner])
+        self.assertEqual(search(Owner.objects.all(), "sukru isikli").count(), 0)
+        self.owner.delete()
+        self.assertEqual(search(Owner.objects.all(), "yildiz").count(), 0)
+
+    def test_units_and_documents(self):
+        self.assertEqual(list(search(Unit.objects.all(), "cinar 101")), [self.unit])
+        doc = Document.objects.create(
+            project=self.project,
+            label="Tapu Örneği",
+            file=SimpleUploadedFile("kira_sozlesmesi.pdf", b"%PDF"),
+        )
+        self.assertEqual(list(search(Document.objects.all(), "ornegi")), [doc])
+        self.assertEqual(list(search(Document.objects.all(), "kira")), [doc])
+
+    def test_rebuild_repairs_rows_written_without_signals(self):
+        Owner.objects.filter(pk=self.owner.pk).update(search_text="")
+        self.assertEqual(search(Owner.objects.all(), "sukru").count(), 0)
+        self.assertEqual(rebuild_search_text(Owner), 1)
+        self.assertEqual(list(search(Owner.objects.all(), "sukru")), [self.owner])
+        out = StringIO()
+        call_command("rebuild_search_index", stdout=out)
+        self.assertIn("0 rows updated", out.getvalue())
+
+    def test_admin_search_uses_index(self):
+        results, may_have_duplicates = SearchIndexAdminMixin().get_search_results(
+            None, Owner.objects.all(), "işıklı"
+        )
+        self.assertEqual(list(results), [self.owner])
+        self.assertFalse(may_have_duplicates)
+
+    def test_global_search_endpoint_is_scoped_to_membership(self):
+        user = User.objects.create_user("arayan", password="pw")
+        User.objects.filter(pk=user.pk).update(is_active=True)
+        self.project.staff.add(user)
+        self.client.login(username="arayan", password="pw")
+        resp = self.client.get(reverse("proje:search"), {"q": "isik"})
+        self.assertEqual(resp.status_code, 200)
+        owners = resp.json()["results"]["owners"]
+        self.assertEqual([row["id"] for row in owners], [self.owner.pk])
+        self.assertEqual(owners[0]["project"], "S1")
+
+        # a valid TC number is an exact lookup
+        self.owner.tc_no = "10000000146"
+        self.owner.save()
+        resp = self.client.get(reverse("proje:search"), {"q": "100 000 001 46"})
+        self.assertEqual([row["id"] for row in resp.json()["results"]["owners"]], [self.owner.pk])
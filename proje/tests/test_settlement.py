@@ -0,0 +1,165 @@
+"""Tests for the settlement calculation engine in `proje.settlement`."""
+# pylint: disable=missing-function-docstring
+
+import csv
+import io
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from proje.models import Owner, Ownership, Project, Unit
+from proje.settlement import (Scenario, compute_settlement, project_settlement,
+                              scenario_digest)
+
+User = get_user_model()
+
+SCENARIOS = [
+    {"name": "1:1", "ratio": 1},
+    {"name": "1:1,5", "ratio": 1.5, "price_per_m2": 1000},
+]
+
+
+@override_settings(PROJE_SETTLEMENT_SCENARIOS=SCENARIOS)
+class SettlementTests(TestCase):
+    """Per-owner entitlements come from grouped sums scaled per scenario."""
+
+    def setUp(self):
+        # membership and settlement results are cached per (reused) primary key
+        cache.clear()
+        self.project = Project.objects.create(name="U", code="U1")
+        self.ayse = Owner.objects.create(project=self.project, first_name="Ayşe", last_name="A")
+        self.mehmet = Owner.objects.create(project=self.project, first_name="Mehmet", last_name="B")
+        flat = Unit.objects.create(
+            project=self.project, ada="1", parsel="1",
+            current_m2=Decimal("100"), share_m2=Decimal("40"),
+        )
+        # no current area recorded: falls back to m2
+        shop = Unit.objects.create(
+            project=self.project, ada="1", parsel="2", m2=Decimal("60"), share_m2=Decimal("20"),
+        )
+        Unit.objects.create(project=self.project, ada="1", parsel="3")
+        Ownership.objects.create(unit=flat, owner=self.ayse, share_percent=Decimal("75"))
+        Ownership.objects.create(unit=flat, owner=self.mehmet, share_percent=Decimal("25"))
+        Ownership.objects.create(unit=shop, owner=self.ayse, share_percent=Decimal("100"))
+        other = Project.objects.create(name="X", code="X1")
+        Unit.objects.create(project=other, ada="9", parsel="9", current_m2=Decimal("500"))
+
+    def test_per_owner_entitlements(self):
+        with CaptureQueriesContext(connection) as ctx:
+            settlement = compute_settlement(self.project)
+        self.assertEqual(len(ctx.captured_queries), 2)
+        self.assertEqual(settlement.owner_ids, [self.ayse.pk, self.mehmet.pk])
+        self.assertEqual(settlement.unit_counts, [2, 1])
+        self.assertEqual(settlement.land_m2, [Decimal("50.00"), Decimal("10.00")])
+        self.assertEqual(settlement.current_m2, [Decimal("135.00"), Decimal("25.00")])
+        self.assertEqual(
+            settlement.offered,
+            [[Decimal("135.00"), Decimal("25.00")], [Decimal("202.50"), Decimal("37.50")]],
+        )
+        self.assertEqual(settlement.payouts, [None, [Decimal("202500.00"), Decimal("37500.00")]])
+        self.assertTrue(all(isinstance(value, Decimal) for value in settlement.offered[1]))
+        self.assertEqual(settlement.units, 3)
+        self.assertEqual(settlement.units_without_area, 1)
+        self.assertEqual(settlement.units_unbalanced, 1)
+
+    def test_scenario_totals_and_comparison(self):
+        totals = compute_settlement(self.project).totals()
+        self.assertEqual([row["offered_m2"] for row in totals], [Decimal("160.00"), Decimal("240.00")])
+        self.assertEqual(totals[1]["ratio"], Decimal("1.5"))
+        self.assertEqual(totals[1]["delta_m2"], Decimal("80.00"))
+        self.assertEqual(totals[1]["delta_percent"], Decimal("50.00"))
+        self.assertEqual(totals[1]["payout"], Decimal("240000.00"))
+        self.assertIsNone(totals[0]["payout"])
+
+    def test_explicit_scenarios(self):
+        settlement = compute_settlement(self.project, [Scenario("2x", Decimal("2"))])
+        self.assertEqual(settlement.offered, [[Decimal("270.00"), Decimal("50.00")]])
+
+    def test_amounts_are_rounded_to_cents(self):
+        third = Unit.objects.create(project=self.project, ada="2", parsel="1", current_m2=Decimal("10"))
+        Ownership.objects.create(unit=third, owner=self.mehmet, share_percent=Decimal("33.33"))
+        settlement = compute_settlement(self.project, [Scenario("1:1,1", Decimal("1.1"), Decimal("0.7"))])
+        # 25 + 10 x 0.3333 = 28.333 -> 28.33; x 1.1 = 31.163 -> 31.16; x 0.7 = 21.812 -> 21.81
+        self.assertEqual(settlement.current_m2[1], Decimal("28.33"))
+        self.assertEqual(settlement.offered[0][1], Decimal("31.16"))
+        self.assertEqual(settlement.payouts[0][1], Decimal("21.81"))
+
+    def test_empty_project(self):
+        empty = Project.objects.create(name="E", code="E9")
+        settlement = compute_settlement(empty)
+        self.assertEqual(settlement.owner_count, 0)
+        self.assertEqual([row["offered_m2"] for row in settlement.totals()], [0, 0])
+
+    def test_results_are_cached_until_the_project_changes(self):
+        project_settlement(self.project)
+        with CaptureQueriesContext(connection) as ctx:
+            project_settlement(self.project)
+        self.assertEqual(len(ctx.captured_queries), 0)
+        Ownership.objects.filter(owner=self.mehmet).update(share_percent=Decimal("10"))
+        self.assertEqual(project_settlement(self.project).current_m2[1], Decimal("25.00"))
+        # a signalled write bumps the project's version after commit
+        ownership = Ownership.objects.get(owner=self.mehmet)
+        with self.captureOnCommitCallbacks(execute=True):
+            ownership.save()
+        self.assertEqual(project_settlement(self.project).current_m2[1], Decimal("10.00"))
+
+    def test_detail_page_and_export(self):
+        user = User.objects.create_user("member", password="pw")
+        User.objects.filter(pk=user.pk).update(is_active=True)
+        self.project.staff.add(user)
+        self.client.login(username="member", password="pw")
+
+        response = self.client.get(reverse("proje:project_detail", args=[self.project.pk]))
+        self.assertContains(response, "Uzlaşma Hesabı")
+        self.assertContains(response, "240")
+
+        url = reverse("proje:settlement_export", args=[self.project.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        body = b"".join(response.streaming_content).decode("utf-8-sig")
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(rows[0]["first_name"], "Ayşe")
+        self.assertEqual(rows[0]["payout [1:1,5]"], "202500.00")
+        self.assertNotIn("payout [1:1]", rows[0])
+
+        response = self.client.get(url, {"format": "xlsx"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"PK"))
+
+        other = Project.objects.get(code="X1")
+        response = self.client.get(reverse("proje:settlement_export", args=[other.pk]))
+        self.assertEqual(response.status_code, 403)
+
+    def test_detail_page_hides_settlement_from_non_members(self):
+        url = reverse("proje:project_detail", args=[self.project.pk])
+        user = User.objects.create_user("outsider", password="pw")
+        User.objects.filter(pk=user.pk).update(is_active=True)
+        for login in (False, True):
+            if login:
+                self.client.login(username="outsider", password="pw")
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotContains(response, "Uzlaşma Hesabı")
+            self.assertFalse(any("SUM(" in q["sql"].upper() for q in ctx.captured_queries))
+
+    def test_detail_fragment_follows_the_scenarios(self):
+        user = User.objects.create_user("viewer", password="pw")
+        User.objects.filter(pk=user.pk).update(is_active=True)
+        self.project.staff.add(user)
+        self.client.login(username="viewer", password="pw")
+        url = reverse("proje:project_detail", args=[self.project.pk])
+
+        self.assertContains(self.client.get(url), "1:1,5")
+        digest = scenario_digest()
+        scenarios = [{"name": "1:2", "ratio": 2}]
+        with override_settings(PROJE_SETTLEMENT_SCENARIOS=scenarios):
+            self.assertNotEqual(scenario_digest(), digest)
+            response = self.client.get(url)
+        self.assertContains(response, "1:2")
+        self.assertNotContains(response, "1:1,5")
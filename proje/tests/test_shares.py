@@ -0,0 +1,129 @@
+"""Tests for the ownership share integrity engine in `proje.shares`."""
+# pylint: disable=missing-function-docstring
+
+import io
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from proje.models import Owner, Ownership, Project, Unit
+from proje.registry_import import import_registry_file
+from proje.shares import recompute_share_totals, validate_project_shares
+
+User = get_user_model()
+
+
+class ShareTotalTests(TestCase):
+    """`Unit.share_total` follows ownership writes incrementally."""
+
+    def setUp(self):
+        self.project = Project.objects.create(name="S", code="S1")
+        self.unit = Unit.objects.create(project=self.project, ada="1", parsel="1")
+        self.other = Unit.objects.create(project=self.project, ada="1", parsel="2")
+        self.owners = [
+            Owner.objects.create(project=self.project, first_name="A", last_name=str(i))
+            for i in range(3)
+        ]
+
+    def _total(self, unit):
+        return Unit.objects.values_list("share_total", flat=True).get(pk=unit.pk)
+
+    def test_create_update_move_and_delete(self):
+        first = Ownership.objects.create(unit=self.unit, owner=self.owners[0], share_percent=60)
+        Ownership.objects.create(unit=self.unit, owner=self.owners[1], share_percent="40.00")
+        self.assertEqual(self._total(self.unit), Decimal("100.00"))
+
+        first.share_percent = Decimal("50")
+        first.save()
+        self.assertEqual(self._total(self.unit), Decimal("90.00"))
+
+        first.unit = self.other
+        first.save()
+        self.assertEqual(self._total(self.unit), Decimal("40.00"))
+        self.assertEqual(self._total(self.other), Decimal("50.00"))
+
+        first.delete()
+        self.assertEqual(self._total(self.other), Decimal("0.00"))
+        self.owners[1].delete()
+        self.assertEqual(self._total(self.unit), Decimal("0.00"))
+
+    def test_saving_a_stale_unit_keeps_the_total(self):
+        stale = Unit.objects.get(pk=self.unit.pk)
+        Ownership.objects.create(unit=self.unit, owner=self.owners[0], share_percent=100)
+        stale.address = "Yeni"
+        stale.save()
+        self.assertEqual(self._total(self.unit), Decimal("100.00"))
+
+    def test_recompute_fixes_drift(self):
+        Ownership.objects.create(unit=self.unit, owner=self.owners[0], share_percent=100)
+        Unit.objects.filter(pk=self.unit.pk).update(share_total=7)
+        self.assertEqual(recompute_share_totals(dry_run=True), [self.unit.pk])
+        self.assertEqual(self._total(self.unit), Decimal("7.00"))
+        self.assertEqual(recompute_share_totals(), [self.unit.pk])
+        self.assertEqual(self._total(self.unit), Decimal("100.00"))
+        self.assertEqual(recompute_share_totals(), [])
+
+    def test_registry_import_maintains_totals(self):
+        data = (
+            "ada;parsel;ad;soyad;tc;hisse\n"
+            "3;4;Ayşe;Yılmaz;10000000146;1/2\n"
+            "3;4;Mehmet;Öz;12345678950;1/4\n"
+        ).encode()
+        import_registry_file(self.project, io.BytesIO(data), file_format="csv")
+        unit = Unit.objects.get(ada="3", parsel="4")
+        self.assertEqual(unit.share_total, Decimal("75.00"))
+
+
+class ValidateProjectSharesTests(TestCase):
+    """Live share sums are checked with one grouped query per project."""
+
+    def setUp(self):
+        self.project = Project.objects.create(name="V", code="V1")
+        owners = [
+            Owner.objects.create(project=self.project, first_name="A", last_name=str(i))
+            for i in range(3)
+        ]
+        self.units = {}
+        for name, shares in (
+            ("tam", ["33.33", "33.33", "33.33"]),
+            ("eksik", ["50"]),
+            ("fazla", ["80", "40"]),
+            ("yok", []),
+        ):
+            unit = Unit.objects.create(project=self.project, ada=name, parsel="1")
+            for owner, share in zip(owners, shares):
+                Ownership.objects.create(unit=unit, owner=owner, share_percent=Decimal(share))
+            self.units[name] = unit
+
+    def test_flags_under_over_and_unowned_units(self):
+        with CaptureQueriesContext(connection) as ctx:
+            flagged = {unit.ada: (unit.share_status, unit.computed_total)
+                       for unit in validate_project_shares(self.project)}
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(
+            flagged,
+            {
+                "eksik": ("eksik", Decimal("50")),
+                "fazla": ("fazla", Decimal("120")),
+                "yok": ("yok", Decimal("0")),
+            },
+        )
+
+    @override_settings(PROJE_SHARE_TOLERANCE="0")
+    def test_tolerance_is_configurable(self):
+        flagged = {unit.ada for unit in validate_project_shares(self.project)}
+        self.assertIn("tam", flagged)
+
+    def test_admin_filter(self):
+        admin = User.objects.create_superuser("root", "root@example.com", "pw")
+        User.objects.filter(pk=admin.pk).update(is_active=True)
+        self.client.login(username="root", password="pw")
+        url = reverse("admin:proje_unit_changelist")
+        for status, unit in self.units.items():
+            response = self.client.get(url, {"share_status": status})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(list(response.context["cl"].result_list), [unit])
@@ -0,0 +1,78 @@
+"""Tests for daily project statistics and the KPI dashboard."""
+# pylint: disable=missing-function-docstring
+
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from proje.models import Document, Owner, Project, ProjectDailyStats, Unit
+from proje.stats import build_daily_stats
+from proje.tasks import build_daily_stats_task
+
+User = get_user_model()
+
+
+class DailyStatsTests(TestCase):
+    """Snapshots aggregate per project and the dashboard reads only them."""
+
+    def setUp(self):
+        self.manager = User.objects.create_user("mgr", password="pw", first_name="Ada")
+        # profiles start inactive (accounts signal); re-activate for login
+        User.objects.filter(pk=self.manager.pk).update(is_active=True)
+        self.project = Project.objects.create(name="Kuzey", code="K1", manager=self.manager)
+        self.hidden = Project.objects.create(name="Güney", code="G1")
+        Unit.objects.create(project=self.project, type="daire", agreement_status="saglandi")
+        Unit.objects.create(project=self.project, type="dukkan", occupancy="kiraci")
+        Unit.objects.create(project=self.hidden)
+        Owner.objects.create(project=self.project, first_name="A", last_name="B")
+        Document.objects.create(project=self.project, file="proje_documents/x.pdf")
+
+    def test_build_daily_stats_upserts_one_row_per_project(self):
+        self.assertEqual(build_daily_stats(), 2)
+        self.assertEqual(build_daily_stats_task.apply().get(), 2)
+        self.assertEqual(ProjectDailyStats.objects.count(), 2)
+
+        snap = ProjectDailyStats.objects.get(project=self.project)
+        self.assertEqual(
+            (snap.unit_count, snap.owner_count, snap.document_count, snap.documents_added),
+            (2, 1, 1, 1),
+        )
+        self.assertEqual((snap.unit_saglandi_count, snap.agreement_percent), (1, 50))
+        self.assertEqual(snap.unit_types, {"daire": 1, "dukkan": 1})
+        self.assertEqual(snap.occupancy, {"bos": 1, "kiraci": 1})
+        self.assertEqual(snap.member_ids, [self.manager.pk])
+
+    def test_only_today_can_be_built(self):
+        out = StringIO()
+        today = timezone.localdate()
+        call_command("build_project_stats", "--date", today.isoformat(), stdout=out)
+        self.assertIn("Wrote 2 project snapshots", out.getvalue())
+        with self.assertRaisesMessage(CommandError, "only be built for today"):
+            call_command("build_project_stats", "--date", "2026-01-02")
+        with self.assertRaises(ValueError):
+            build_daily_stats(today - datetime.timedelta(days=1))
+        self.assertEqual(set(ProjectDailyStats.objects.values_list("date", flat=True)), {today})
+
+    def test_dashboard_renders_member_projects_from_snapshots(self):
+        self.client.force_login(User.objects.get(pk=self.manager.pk))
+        resp = self.client.get(reverse("core:dashboard"))
+        self.assertContains(resp, "build_project_stats")
+
+        # an older snapshot, as yesterday's beat run would have left it
+        build_daily_stats()
+        ProjectDailyStats.objects.update(
+            date=timezone.localdate() - datetime.timedelta(days=1), documents_added=0
+        )
+        build_daily_stats()
+        with self.assertNumQueries(6):  # session, user, 3 snapshot reads, team users
+            resp = self.client.get(reverse("core:dashboard"))
+        self.assertContains(resp, "Kuzey")
+        self.assertNotContains(resp, "Güney")
+        self.assertEqual(resp.context["totals"]["agreement_percent"], 50)
+        self.assertEqual(resp.context["project_stats"][0].documents_recent, 1)
+        self.assertEqual(resp.context["staff_workload"][0]["units"], 2)
@@ -0,0 +1,95 @@
+"""Tests for content-addressed upload storage in `proje.storage`."""
+# pylint: disable=missing-function-docstring
+
+import hashlib
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from proje.ingest import ingest_documents
+from proje.models import Document, Owner, Project
+from proje.storage import discard_blob, is_blob_name
+
+
+class ContentAddressedStorageTests(TestCase):
+    """Identical uploads share one blob that is deleted with its last row."""
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        override = override_settings(MEDIA_ROOT=self.media, PROJE_CONTENT_ADDRESSED_UPLOADS=True)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def _exists(self, name):
+        return (Path(self.media) / name).exists()
+
+    def test_identical_uploads_share_one_blob(self):
+        first = Document.objects.create(file=SimpleUploadedFile("scan.pdf", b"same bytes"))
+        second, = ingest_documents([SimpleUploadedFile("copy.pdf", b"same bytes")])
+        digest = hashlib.sha256(b"same bytes").hexdigest()
+
+        self.assertEqual(first.file.name, f"proje_documents/{digest[:2]}/{digest}/scan.pdf")
+        self.assertEqual(second.file.name, first.file.name)
+        self.assertTrue(is_blob_name(first.file.name))
+        self.assertEqual(len(list(Path(self.media).rglob("*.pdf"))), 1)
+
+    def test_blob_deleted_with_last_reference(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = Document.objects.create(file=SimpleUploadedFile("a.txt", b"shared"))
+            second = Document.objects.create(file=SimpleUploadedFile("b.txt", b"shared"))
+        name = first.file.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(self._exists(name))
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(self._exists(name))
+
+    def test_blob_reused_after_delete_request_is_kept(self):
+        doc = Document.objects.create(file=SimpleUploadedFile("a.txt", b"raced"))
+        name, storage = doc.file.name, doc.file.storage
+        Document.objects.filter(pk=doc.pk).delete()
+        requested_at = time.time() - 1
+        # an upload in another transaction reuses the blob before the
+        # deleting transaction's cleanup runs
+        self.assertEqual(storage.save("proje_documents/b.txt", SimpleUploadedFile("b.txt", b"raced")), name)
+        self.assertFalse(discard_blob(storage, name, requested_at))
+        self.assertTrue(self._exists(name))
+        self.assertTrue(discard_blob(storage, name, time.time() + 1))
+        self.assertFalse(self._exists(name))
+
+    def test_replaced_owner_file_is_released(self):
+        owner = Owner.objects.create(
+            project=Project.objects.create(name="S", code="S1"),
+            first_name="A",
+            last_name="B",
+            id_scan=SimpleUploadedFile("id.pdf", b"old scan"),
+        )
+        old = owner.id_scan.name
+        with self.captureOnCommitCallbacks(execute=True):
+            owner.id_scan = SimpleUploadedFile("id.pdf", b"new scan")
+            owner.save()
+        self.assertFalse(self._exists(old))
+        self.assertTrue(self._exists(owner.id_scan.name))
+
+    def test_dedup_command_merges_legacy_copies(self):
+        with override_settings(PROJE_CONTENT_ADDRESSED_UPLOADS=False):
+            docs = [
+                Document.objects.create(file=SimpleUploadedFile("demo_readme.txt", b"readme"))
+                for _ in range(2)
+            ]
+        self.assertNotEqual(docs[0].file.name, docs[1].file.name)
+
+        out = StringIO()
+        call_command("proje_dedup_documents", stdout=out)
+        self.assertIn("Repointed 1 documents, deleted 1 files", out.getvalue())
+        self.assertEqual(
+            set(Document.objects.values_list("file", flat=True)), {docs[0].file.name}
+        )
+        self.assertFalse(self._exists(docs[1].file.name))
@@ -0,0 +1,97 @@
+"""Tests for TC kimlik normalisation, hashing and the admin fast path."""
+# pylint: disable=missing-function-docstring
+
+from io import StringIO
+
+from django.contrib.admin.sites import site
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import Profile
+from core.tc_kimlik import (is_valid_tc, normalize_tc, rebuild_tc_index, tc_hash,
+                            validate_tc)
+from proje.models import Owner, Project
+
+User = get_user_model()
+
+VALID_TC = "10000000146"
+
+
+class TCValidationTests(TestCase):
+    """Normalisation strips formatting; the checksum rejects typos."""
+
+    def test_normalise_and_checksum(self):
+        self.assertEqual(normalize_tc(" 100 000-001.46 "), VALID_TC)
+        self.assertEqual(normalize_tc(None), "")
+        self.assertTrue(is_valid_tc("100 000 001 46"))
+        self.assertFalse(is_valid_tc("10000000147"))  # wrong last digit
+        self.assertFalse(is_valid_tc("01000000146"))  # leading zero
+        self.assertFalse(is_valid_tc("1000000014"))
+        validate_tc("")
+        with self.assertRaises(ValidationError):
+            validate_tc("12345678901")
+
+    def test_hash_requires_key(self):
+        self.assertEqual(tc_hash(VALID_TC), "")
+        with override_settings(TC_HASH_KEY="k1"):
+            first = tc_hash("100 000 001 46")
+            self.assertEqual(len(first), 64)
+            self.assertEqual(first, tc_hash(VALID_TC))
+        with override_settings(TC_HASH_KEY="k2"):
+            self.assertNotEqual(tc_hash(VALID_TC), first)
+
+
+class TCLookupTests(TestCase):
+    """Saved values are normalised and admin TC searches hit one index."""
+
+    def setUp(self):
+        self.project = Project.objects.create(name="TC", code="TC1")
+        self.owner = Owner.objects.create(
+            project=self.project, first_name="A", last_name="B", tc_no="100 000 001 46"
+        )
+        Owner.objects.create(project=self.project, first_name="C", last_name="D")
+        self.admin = User.objects.create_superuser("tcadmin", password="pw")
+        self.request = RequestFactory().get("/")
+        self.request.user = self.admin
+
+    def _search(self, model, term):
+        model_admin = site._registry[model]  # pylint: disable=protected-access
+        return model_admin.get_search_results(self.request, model.objects.all(), term)
+
+    def test_saved_values_are_normalised(self):
+        self.owner.refresh_from_db()
+        self.assertEqual(self.owner.tc_no, VALID_TC)
+        self.assertEqual(self.owner.tc_hash, "")
+
+    def test_owner_admin_exact_lookup(self):
+        with CaptureQueriesContext(connection) as ctx:
+            results, may_have_duplicates = self._search(Owner, "100 000 001 46")
+            self.assertEqual(list(results), [self.owner])
+        self.assertFalse(may_have_duplicates)
+        self.assertIn("tc_no", ctx.captured_queries[-1]["sql"])
+        self.assertNotIn("LIKE", ctx.captured_queries[-1]["sql"].upper())
+        # partial numbers go to the generic search, which holds no TC numbers
+        results, _ = self._search(Owner, "1000000")
+        self.assertEqual(list(results), [])
+
+    def test_profile_admin_uses_hash_when_keyed(self):
+        profile = self.admin.profile
+        with override_settings(TC_HASH_KEY="secret"):
+            profile.tc_no = VALID_TC
+            profile.save()
+            self.assertEqual(profile.tc_hash, tc_hash(VALID_TC))
+            results, _ = self._search(Profile, VALID_TC)
+            self.assertEqual(list(results), [profile])
+            self.assertIn("tc_hash", str(results.query))
+
+            # rows hashed with another (or no) key are repaired by the rebuild
+            Owner.objects.filter(pk=self.owner.pk).update(tc_hash="")
+            self.assertEqual(rebuild_tc_index(Owner), 1)
+            self.assertEqual(list(self._search(Owner, VALID_TC)[0]), [self.owner])
+            out = StringIO()
+            call_command("rebuild_tc_index", stdout=out)
+            self.assertIn("0 rows updated", out.getvalue())
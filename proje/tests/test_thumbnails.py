@@ -0,0 +1,88 @@
+"""Tests for WebP document thumbnails in `proje.thumbnails`."""
+# pylint: disable=missing-function-docstring
+
+import tempfile
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from proje import admin_helpers
+from proje.models import Document
+from proje.thumbnails import get_thumbnail_urls, thumbnail_sizes
+
+
+def _png(name="photo.png", size=(1200, 900), color=(200, 30, 30)):
+    buf = BytesIO()
+    Image.new("RGB", size, color).save(buf, "PNG")
+    return SimpleUploadedFile(name, buf.getvalue(), content_type="image/png")
+
+
+class ThumbnailTests(TestCase):
+    """Derivatives are WebP, content-addressed and used by the previews."""
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        override = override_settings(MEDIA_ROOT=self.media, MEDIA_URL="/media/")
+        override.enable()
+        self.addCleanup(override.disable)
+        cache.clear()
+
+    def _thumbs(self):
+        return sorted(p.name for p in Path(self.media, "proje_documents", "thumbs").rglob("*.webp"))
+
+    def test_preview_uses_small_webp_thumbnail(self):
+        doc = Document.objects.create(file=_png(), label="Foto")
+        html = str(admin_helpers.format_preview_html(doc))
+
+        urls = get_thumbnail_urls(doc.file)
+        self.assertIn(f'src="{urls["sm"]}"', html)
+        self.assertIn(f'{urls["md"]} 2x', html)
+        self.assertIn(f'data-full="{doc.file.url}"', html)
+        self.assertTrue(urls["sm"].endswith(f"_{thumbnail_sizes()['sm']}.webp"))
+
+        with Image.open(Path(self.media) / urls["lg"].removeprefix("/media/")) as img:
+            self.assertEqual(img.format, "WEBP")
+            self.assertEqual(max(img.size), thumbnail_sizes()["lg"])
+
+    def test_identical_content_shares_thumbnails(self):
+        first = Document.objects.create(file=_png("a.png"))
+        second = Document.objects.create(file=_png("b.png"))
+        self.assertEqual(get_thumbnail_urls(first.file), get_thumbnail_urls(second.file))
+        self.assertEqual(len(self._thumbs()), len(thumbnail_sizes()))
+
+    def test_unreadable_image_falls_back_to_original(self):
+        doc = Document.objects.create(
+            file=SimpleUploadedFile("broken.jpg", b"not an image"), label="Bozuk"
+        )
+        self.assertEqual(get_thumbnail_urls(doc.file), {})
+        self.assertIn(f'src="{doc.file.url}"', str(admin_helpers.format_preview_html(doc)))
+
+    def test_transient_errors_are_not_remembered(self):
+        doc = Document.objects.create(file=_png("later.png"))
+        cache.clear()
+        with mock.patch("proje.thumbnails.Image.open", side_effect=OSError("disk")):
+            self.assertEqual(get_thumbnail_urls(doc.file), {})
+        self.assertEqual(set(get_thumbnail_urls(doc.file)), set(thumbnail_sizes()))
+
+    @override_settings(PROJE_THUMBNAIL_SIZES={"xs": 64, "xl": 1024})
+    def test_preview_follows_configured_sizes(self):
+        doc = Document.objects.create(file=_png("sizes.png"), label="Foto")
+        html = str(admin_helpers.format_preview_html(doc))
+        urls = get_thumbnail_urls(doc.file)
+        self.assertEqual(set(urls), {"xs", "xl"})
+        self.assertIn(f'src="{urls["xs"]}"', html)
+        self.assertIn(f'{urls["xl"]} 2x', html)
+
+    def test_backfill_command(self):
+        Document.objects.create(file=_png("x.png"))
+        Document.objects.create(file=SimpleUploadedFile("notes.txt", b"text"))
+        out = StringIO()
+        call_command("proje_thumbnails", stdout=out)
+        self.assertIn("Thumbnails ready for 1 documents", out.getvalue())
+        self.assertEqual(len(self._thumbs()), len(thumbnail_sizes()))
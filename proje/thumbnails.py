@@ -0,0 +1,144 @@
+"""WebP thumbnail derivatives for image documents.
+
+Thumbnails are stored next to the originals under
+``proje_documents/thumbs/`` and keyed by the SHA-256 of the original
+content, so identical uploads share derivatives and a replaced file never
+serves a stale thumbnail. They are created in the upload worker threads
+(`proje.ingest`), lazily on the first preview, or in bulk by the
+``proje_thumbnails`` management command.
+
+Sizes are the longest edge in pixels and can be overridden with
+`settings.PROJE_THUMBNAIL_SIZES`.
+"""
+
+import hashlib
+import logging
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp")
+THUMBNAIL_DIR = "proje_documents/thumbs"
+DEFAULT_THUMBNAIL_SIZES = {"sm": 160, "md": 320, "lg": 800}
+THUMBNAIL_QUALITY = 80
+# digests are cached per stored file name; names are unique per upload
+DIGEST_CACHE_TIMEOUT = 60 * 60 * 24 * 30
+
+_READ_CHUNK = 1024 * 1024
+
+
+def thumbnail_sizes():
+    """Return the configured `{size_key: longest_edge_px}` mapping."""
+    return getattr(settings, "PROJE_THUMBNAIL_SIZES", None) or DEFAULT_THUMBNAIL_SIZES
+
+
+def is_image_name(name):
+    """Return True when `name` has an image extension we derive thumbnails for."""
+    return str(name or "").lower().endswith(IMAGE_EXTENSIONS)
+
+
+def file_sha256(fileobj):
+    """Return the hex SHA-256 of a Django `File`/`FieldFile`, read in chunks."""
+    digest = hashlib.sha256()
+    fileobj.open("rb")
+    try:
+        fileobj.seek(0)
+        for chunk in fileobj.chunks(_READ_CHUNK):
+            digest.update(chunk)
+    finally:
+        fileobj.close()
+    return digest.hexdigest()
+
+
+def thumbnail_name(digest, size_key):
+    """Return the storage name of the `size_key` derivative for `digest`."""
+    px = thumbnail_sizes()[size_key]
+    return f"{THUMBNAIL_DIR}/{digest[:2]}/{digest}_{px}.webp"
+
+
+def _render_webp(image, px):
+    thumb = image.copy()
+    thumb.thumbnail((px, px), Image.Resampling.LANCZOS)
+    buf = BytesIO()
+    thumb.save(buf, "WEBP", quality=THUMBNAIL_QUALITY, method=4)
+    return buf.getvalue()
+
+
+def generate_thumbnails(fieldfile, digest=None, force=False):
+    """Create missing WebP derivatives for `fieldfile` and return their names.
+
+    Returns `{size_key: storage_name}`, or an empty dict when the file is
+    not a decodable image; only that outcome is remembered. Other I/O and
+    storage errors propagate so a transient failure is retried on the next
+    preview. Existing derivatives are reused unless `force`.
+    """
+    storage = fieldfile.storage
+    digest = digest or file_sha256(fieldfile)
+    names = {key: thumbnail_name(digest, key) for key in thumbnail_sizes()}
+    missing = [key for key, name in names.items() if force or not storage.exists(name)]
+    if missing:
+        try:
+            fieldfile.open("rb")
+            try:
+                with Image.open(fieldfile) as img:
+                    img = ImageOps.exif_transpose(img)
+                    if img.mode not in ("RGB", "RGBA"):
+                        img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+                    rendered = {
+                        key: _render_webp(img, thumbnail_sizes()[key]) for key in missing
+                    }
+            finally:
+                fieldfile.close()
+        except (UnidentifiedImageError, Image.DecompressionBombError):
+            logger.info("No thumbnails for %s: not a readable image", fieldfile.name)
+            # remember the failure so previews do not re-read the file
+            cache.set(_digest_cache_key(fieldfile.name), "", DIGEST_CACHE_TIMEOUT)
+            return {}
+        for key, data in rendered.items():
+            if force and storage.exists(names[key]):
+                storage.delete(names[key])
+            if not storage.exists(names[key]):
+                storage.save(names[key], ContentFile(data))
+    cache.set(_digest_cache_key(fieldfile.name), digest, DIGEST_CACHE_TIMEOUT)
+    return names
+
+
+def _digest_cache_key(name):
+    return "proje:thumbdigest:" + hashlib.md5(name.encode("utf-8")).hexdigest()
+
+
+def get_thumbnail_urls(fieldfile, create=True):
+    """Return `{size_key: url}` for an image `fieldfile`.
+
+    The digest is cached per file name once the derivatives exist, so
+    repeat previews neither re-read the original nor query the storage.
+    Missing derivatives are generated when `create` is true; otherwise (or
+    when the file is not a readable image) an empty dict is returned.
+    """
+    name = getattr(fieldfile, "name", None)
+    if not name or not is_image_name(name):
+        return {}
+    storage = fieldfile.storage
+    digest = cache.get(_digest_cache_key(name))
+    if digest == "":
+        return {}
+    if digest:
+        return {
+            key: storage.url(thumbnail_name(digest, key)) for key in thumbnail_sizes()
+        }
+    if not create:
+        return {}
+    # documents carry their content hash (proje.file_metadata); no re-read
+    known_digest = getattr(getattr(fieldfile, "instance", None), "sha256", "") or None
+    try:
+        names = generate_thumbnails(fieldfile, digest=known_digest)
+    except (OSError, ValueError):
+        # not cached: the next preview tries again
+        logger.warning("Thumbnail generation failed for %s", name, exc_info=True)
+        return {}
+    return {key: storage.url(n) for key, n in names.items()}
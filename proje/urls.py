@@ -1,7 +1,8 @@
 """URL patterns for the `proje` application.
 
 Defines public-facing views for project CRUD, owner/unit/agreement creation,
-document upload and report download endpoints.
+document upload, global search, registry and settlement exports and report
+download endpoints.
 """
 
 from django.urls import path
@@ -27,7 +28,18 @@ urlpatterns = [
         views.document_upload,
         name="document_upload",
     ),
+    path(
+        "<int:pk>/export/<slug:kind>/",
+        views.project_export,
+        name="project_export",
+    ),
+    path(
+        "<int:pk>/settlement/export/",
+        views.settlement_export,
+        name="settlement_export",
+    ),
     path("documents/", views.DocumentListView.as_view(), name="documents"),
+    path("search/", views.search, name="search"),
     path(
         "reports/download/<path:filename>/",
         views.report_download,
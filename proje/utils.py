@@ -1,13 +1,86 @@
 """Utility helpers for `proje` app.
 
-Small helpers for generating report paths and uploading files to S3.
+Small helpers for generating report paths and uploading files to S3
+through a shared, pooled client.
 """
 
 import re
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
 from typing import Optional
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config as BotoConfig
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+
+_S3_CLIENT = None
+_S3_CLIENT_LOCK = threading.Lock()
+
+
+def _s3_setting(name, default):
+    return getattr(settings, name, None) or default
+
+
+def get_s3_client():
+    """Return the process-wide S3 client, creating it on first use.
+
+    boto3 clients are thread-safe but expensive to build (credential and
+    endpoint resolution), so one client with a pooled HTTP connection
+    manager is shared by all threads. `S3_ENDPOINT_URL` points it at a
+    local stand-in (MinIO, moto server) and `S3_MAX_POOL_CONNECTIONS`
+    sizes the connection pool.
+    """
+    global _S3_CLIENT  # pylint: disable=global-statement
+    if _S3_CLIENT is None:
+        with _S3_CLIENT_LOCK:
+            if _S3_CLIENT is None:
+                session = boto3.session.Session()
+                _S3_CLIENT = session.client(
+                    "s3",
+                    endpoint_url=_s3_setting("S3_ENDPOINT_URL", None),
+                    region_name=_s3_setting("S3_REGION_NAME", None),
+                    config=BotoConfig(
+                        max_pool_connections=int(
+                            _s3_setting("S3_MAX_POOL_CONNECTIONS", 20)
+                        ),
+                        retries={"max_attempts": 5, "mode": "standard"},
+                    ),
+                )
+    return _S3_CLIENT
+
+
+def reset_s3_client():
+    """Drop the cached S3 client (e.g. after changing settings in tests)."""
+    global _S3_CLIENT  # pylint: disable=global-statement
+    with _S3_CLIENT_LOCK:
+        _S3_CLIENT = None
+
+
+def get_transfer_config():
+    """Return the `TransferConfig` used for uploads, built from settings.
+
+    Files above `S3_MULTIPART_THRESHOLD` bytes are uploaded in
+    `S3_MULTIPART_CHUNKSIZE` parts using up to `S3_MAX_CONCURRENCY` threads.
+    """
+    mib = 1024 * 1024
+    return TransferConfig(
+        multipart_threshold=int(_s3_setting("S3_MULTIPART_THRESHOLD", 8 * mib)),
+        multipart_chunksize=int(_s3_setting("S3_MULTIPART_CHUNKSIZE", 8 * mib)),
+        max_concurrency=int(_s3_setting("S3_MAX_CONCURRENCY", 10)),
+        use_threads=True,
+    )
+
+
+def _public_url(bucket_name, object_key):
+    endpoint = _s3_setting("S3_ENDPOINT_URL", None)
+    if endpoint:
+        return f"{endpoint.rstrip('/')}/{bucket_name}/{object_key}"
+    # Construct public URL using virtual-hosted-style URL; let caller override if needed.
+    return f"https://{bucket_name}.s3.amazonaws.com/{object_key}"
 
 
 def upload_file_to_s3(
@@ -24,14 +97,15 @@ def upload_file_to_s3(
     the object key in S3; when omitted the filename is used. When
     `public` is True the uploaded object will be public-read and the
     returned `url` is a public URL; otherwise a presigned URL is returned
-    valid for `expire_seconds` seconds.
+    valid for `expire_seconds` seconds. Uses the shared client from
+    `get_s3_client` and multipart settings from `get_transfer_config`.
     """
-    s3 = boto3.client("s3")
     bucket_name = bucket
     if not bucket_name:
         # let boto3 fail if no default bucket provided
         raise ValueError("S3 bucket must be provided to upload reports")
 
+    s3 = get_s3_client()
     path = str(path)
     filename = os.path.basename(path)
     object_key = key or filename
@@ -40,11 +114,16 @@ def upload_file_to_s3(
     if public:
         extra_args["ACL"] = "public-read"
 
-    s3.upload_file(path, bucket_name, object_key, ExtraArgs=extra_args or None)
+    s3.upload_file(
+        path,
+        bucket_name,
+        object_key,
+        ExtraArgs=extra_args or None,
+        Config=get_transfer_config(),
+    )
 
     if public:
-        # Construct public URL using virtual-hosted-style URL; let caller override if needed.
-        url = f"https://{bucket_name}.s3.amazonaws.com/{object_key}"
+        url = _public_url(bucket_name, object_key)
     else:
         url = s3.generate_presigned_url(
             "get_object",
@@ -55,6 +134,60 @@ def upload_file_to_s3(
     return {"bucket": bucket_name, "key": object_key, "url": url}
 
 
+def upload_files_to_s3(
+    paths,
+    bucket: Optional[str] = None,
+    prefix: str = "",
+    public: bool = False,
+    expire_seconds: int = 3600,
+    max_workers: Optional[int] = None,
+):
+    """Upload many local files to S3 in parallel using the shared client.
+
+    Returns one dict per input path, in input order. Successful entries
+    have the keys of `upload_file_to_s3` plus `path`; failed entries have
+    `path` and `error` so one failing file does not abort the batch. Keys
+    are `prefix` + filename. `max_workers` defaults to `S3_UPLOAD_WORKERS`.
+    """
+    if not bucket:
+        raise ValueError("S3 bucket must be provided to upload reports")
+    paths = [str(p) for p in paths]
+    workers = max_workers or int(_s3_setting("S3_UPLOAD_WORKERS", 4))
+
+    def _upload(path):
+        try:
+            result = upload_file_to_s3(
+                path,
+                bucket=bucket,
+                key=f"{prefix}{os.path.basename(path)}",
+                public=public,
+                expire_seconds=expire_seconds,
+            )
+        except (OSError, ValueError, BotoCoreError, ClientError) as exc:
+            return {"path": path, "error": str(exc)}
+        result["path"] = path
+        return result
+
+    if not paths:
+        return []
+    with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        return list(pool.map(_upload, paths))
+
+
+def chunked(iterable, size: int):
+    """Yield successive lists of at most `size` items from `iterable`.
+
+    Consumes the iterable lazily, so it can be fed a queryset iterator or a
+    file reader without materialising the whole input.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
 def _sanitize_label(label: str) -> str:
     # keep only alphanumerics, dash and underscore
     return re.sub(r"[^A-Za-z0-9_-]", "_", (label or "").strip())
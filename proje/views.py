@@ -1,46 +1,49 @@
 """Views for the `proje` application.
 
 Contains class-based and function-based views used by the `proje` app,
-including project CRUD, owner/unit/agreement creation and helper utilities
-like report file downloads.
+including project CRUD, owner/unit/agreement creation, streaming registry
+exports and helper utilities like report file downloads.
 """
 
+from functools import partial
 from pathlib import Path
 
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.http import FileResponse, Http404, HttpResponseForbidden
+from django.core.paginator import Paginator
+from django.http import Http404, HttpResponseForbidden, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
+from django.utils.functional import SimpleLazyObject
 from django.views import generic
 
+from proje.downloads import serve_protected_file
+from proje.exports import EXPORT_FORMATS, EXPORTS, export_response, stream_response
 from proje.forms import (AgreementForm, DocumentForm, OwnerForm, ProjectForm,
                          UnitForm)
+from proje.fragment_cache import fragment_timeout, project_fragment_version
+from proje.membership import is_member
 from proje.models import Document, Project, Unit
+from proje.pagination import KeysetPaginationMixin
+from proje.replica import ReplicaReadMixin, replica_reads
+from proje.search import global_search
+from proje.settlement import project_settlement, scenario_digest
 
 
-def user_is_project_member(user, project_id):
-    """Return True if `user` is a manager or staff member of the project.
-
-    Superusers bypass the check.
-    """
-    if user.is_superuser:
-        return True
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return False
-    return user == project.manager or user in project.staff.all()
-
-
-class ProjectListView(generic.ListView):
+class ProjectListView(ReplicaReadMixin, KeysetPaginationMixin, generic.ListView):
     """Display a paginated list of `Project` instances for the current user.
 
     The view renders `proje/project_list.html` and provides the usual
-    context variables used by generic list views.
+    context variables used by generic list views. Pages are keyset-paginated
+    on `(code, id)` via the `cursor` query parameter.
     """
     model = Project
     template_name = "proje/project_list.html"
+    paginate_by = 50
+    keyset_ordering = ("code", "id")
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("manager")
 
 
 class ProjectCreateView(generic.CreateView):
@@ -70,11 +73,69 @@ class ProjectUpdateView(generic.UpdateView):
     success_url = reverse_lazy("proje:project_list")
 
 
+def paginate_section(request, queryset, page_param, per_page):
+    """Return a `Page` of `queryset` for the page number in `page_param`.
+
+    Invalid or out-of-range page numbers fall back to the first/last page
+    so a stale link never produces an error.
+    """
+    paginator = Paginator(queryset, per_page)
+    return paginator.get_page(request.GET.get(page_param))
+
+
 class ProjectDetailView(generic.DetailView):
-    """DetailView that shows full information about a single `Project`."""
+    """DetailView that shows full information about a single `Project`.
+
+    Owners, units and documents are rendered as independently paginated
+    sections (`owners_page`, `units_page`, `documents_page` query params)
+    with column projections, so the number of queries does not depend on
+    project size. Each section is a cached template fragment keyed by the
+    project's fragment version (`proje.fragment_cache`) and its own page
+    parameter, so other query parameters never add cache entries and its
+    page links carry only that parameter. The pages and the
+    settlement summary (`proje.settlement`) are lazy, so a cache hit runs
+    no section queries at all. The settlement fragment is also keyed by a
+    digest of the configured scenarios and, like the settlement export, is
+    shown to project members only. Since the fragments are shared by
+    every request, the view reads from the primary database rather than
+    the read replica (`proje.replica`).
+    """
     model = Project
     template_name = "proje/project_detail.html"
 
+    def get_queryset(self):
+        return super().get_queryset().select_related("manager")
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        project = self.object
+        per_page = getattr(settings, "PROJE_DETAIL_PAGE_SIZE", 50)
+
+        owners = project.owners.only("pk", "project_id", "first_name", "last_name")
+        owners = owners.order_by("last_name", "first_name", "pk")
+        units = project.units.only(
+            "pk", "project_id", "ada", "parsel", "agreement_status"
+        ).order_by("ada", "parsel", "pk")
+        documents = project.documents.only(
+            "pk", "project_id", "file", "uploaded_at"
+        ).order_by("-uploaded_at", "-pk")
+
+        for name, queryset in (
+            ("owners_page", owners),
+            ("units_page", units),
+            ("documents_page", documents),
+        ):
+            context[name] = SimpleLazyObject(
+                partial(paginate_section, self.request, queryset, name, per_page)
+            )
+        context["export_kinds"] = [(kind, spec[0]) for kind, spec in EXPORTS.items()]
+        if is_member(self.request.user, project.pk):
+            context["settlement"] = SimpleLazyObject(partial(project_settlement, project))
+            context["settlement_digest"] = scenario_digest()
+        context["fragment_version"] = project_fragment_version(project)
+        context["fragment_timeout"] = fragment_timeout()
+        return context
+
 
 @login_required
 def owner_create(request, project_pk):
@@ -84,7 +145,7 @@ def owner_create(request, project_pk):
     """
     project = get_object_or_404(Project, pk=project_pk)
     # Only project members (or superuser) can add owners
-    if not user_is_project_member(request.user, project.pk):
+    if not is_member(request.user, project.pk):
         return HttpResponseForbidden("Bu proje için yetkiniz yok.")
     if request.method == "POST":
         form = OwnerForm(request.POST, request.FILES)
@@ -103,7 +164,7 @@ def unit_create(request, project_pk):
     """Create a `Unit` within a `Project` (protected to project members)."""
     project = get_object_or_404(Project, pk=project_pk)
     # Only project members (or superuser) can add units
-    if not user_is_project_member(request.user, project.pk):
+    if not is_member(request.user, project.pk):
         return HttpResponseForbidden("Bu proje için yetkiniz yok.")
     if request.method == "POST":
         form = UnitForm(request.POST)
@@ -123,15 +184,15 @@ def agreement_create(request, unit_pk):
 
     Access is restricted to project members or superusers.
     """
-    unit = get_object_or_404(Unit, pk=unit_pk)
+    unit = get_object_or_404(Unit.objects.select_related("project"), pk=unit_pk)
     # Only project members (or superuser) can add agreements
-    if not user_is_project_member(request.user, unit.project.pk):
+    if not is_member(request.user, unit.project_id):
         return HttpResponseForbidden("Bu proje için yetkiniz yok.")
     if request.method == "POST":
         form = AgreementForm(request.POST)
         if form.is_valid():
             form.save()
-            return redirect("proje:project_detail", pk=unit.project.pk)
+            return redirect("proje:project_detail", pk=unit.project_id)
     else:
         form = AgreementForm(initial={"unit": unit})
     return render(request, "proje/agreement_form.html", {"form": form, "unit": unit})
@@ -145,14 +206,14 @@ def document_upload(request, project_pk=None, unit_pk=None):
     """
     # Check membership based on project or unit
     if project_pk:
-        if not user_is_project_member(request.user, project_pk):
+        if not is_member(request.user, project_pk):
             return HttpResponseForbidden("Bu proje için yetkiniz yok.")
     if unit_pk:
         try:
-            unit = Unit.objects.get(pk=unit_pk)
+            project_id = Unit.objects.values_list("project_id", flat=True).get(pk=unit_pk)
         except (Unit.DoesNotExist, ValueError, TypeError):
-            unit = None
-        if unit and not user_is_project_member(request.user, unit.project.pk):
+            project_id = None
+        if project_id and not is_member(request.user, project_id):
             return HttpResponseForbidden("Bu proje için yetkiniz yok.")
     if request.method == "POST":
         form = DocumentForm(request.POST, request.FILES)
@@ -162,7 +223,7 @@ def document_upload(request, project_pk=None, unit_pk=None):
             doc.save()
             return redirect(
                 "proje:project_detail",
-                pk=doc.project.pk if doc.project else doc.unit.project.pk,
+                pk=doc.project_id if doc.project_id else doc.unit.project_id,
             )
     else:
         form = DocumentForm(initial={"project": project_pk, "unit": unit_pk})
@@ -170,11 +231,56 @@ def document_upload(request, project_pk=None, unit_pk=None):
 
 
 @login_required
+@replica_reads
+def project_export(request, pk, kind):
+    """Stream a project's units, owners, ownerships or agreements as CSV/XLSX.
+
+    `kind` is a key of `proje.exports.EXPORTS`; the `format` query parameter
+    selects ``csv`` (default) or ``xlsx``. Only project members (or
+    superusers) may export.
+    """
+    project = get_object_or_404(Project, pk=pk)
+    if not is_member(request.user, project.pk):
+        return HttpResponseForbidden("Bu proje için yetkiniz yok.")
+    file_format = request.GET.get("format", "csv")
+    if kind not in EXPORTS or file_format not in EXPORT_FORMATS:
+        raise Http404("Unknown export")
+    return export_response(project, kind, file_format)
+
+
+@login_required
+@replica_reads
+def settlement_export(request, pk):
+    """Export the per-owner settlement (`proje.settlement`) as CSV/XLSX.
+
+    The `format` query parameter selects ``csv`` (default) or ``xlsx``.
+    Only project members (or superusers) may export.
+    """
+    project = get_object_or_404(Project, pk=pk)
+    if not is_member(request.user, project.pk):
+        return HttpResponseForbidden("Bu proje için yetkiniz yok.")
+    file_format = request.GET.get("format", "csv")
+    if file_format not in EXPORT_FORMATS:
+        raise Http404("Unknown export")
+    settlement = project_settlement(project)
+    return stream_response(
+        f"{project.code}_settlement",
+        settlement.headers(),
+        settlement.rows(),
+        file_format,
+        "Uzlaşma",
+    )
+
+
+@login_required
+@replica_reads
 def report_download(request, filename):
     """Serve a report file from MEDIA_ROOT/reports/ for staff users.
 
     URL pattern passes a relative `filename` (may include subdirs). We ensure the
-    resolved path is under MEDIA_ROOT/reports to prevent traversal.
+    resolved path is under MEDIA_ROOT/reports to prevent traversal. Delivery
+    (proxy offload, conditional and range requests) is handled by
+    `proje.downloads.serve_protected_file`.
     """
     if not (request.user.is_staff or request.user.is_superuser):
         return HttpResponseForbidden()
@@ -206,16 +312,39 @@ def report_download(request, filename):
     if not target_resolved.exists() or not target_resolved.is_file():
         raise Http404("File not found")
 
-    return FileResponse(
-        open(target_resolved, "rb"), as_attachment=True, filename=target_resolved.name
+    return serve_protected_file(
+        request, target_resolved, target_resolved.relative_to(base_resolved)
     )
 
 
-class DocumentListView(generic.ListView):
+class DocumentListView(ReplicaReadMixin, KeysetPaginationMixin, generic.ListView):
     """ListView showing documents for a given project or unit.
 
     The template `proje/document_list.html` should expect the standard
-    `object_list` context variable produced by Django generic views.
+    `object_list` context variable produced by Django generic views. Pages
+    are keyset-paginated newest first on `(uploaded_at, id)`.
     """
     model = Document
     template_name = "proje/document_list.html"
+    paginate_by = 50
+    keyset_ordering = ("-uploaded_at", "-id")
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("project", "unit", "uploaded_by")
+
+
+@login_required
+@replica_reads
+def search(request):
+    """JSON global search over owners, units and documents (`proje.search`).
+
+    Query parameters: `q` (search terms) and optional `limit` per kind
+    (default 10, at most 50). Results are limited to the projects the user
+    may see.
+    """
+    query = request.GET.get("q", "")
+    try:
+        limit = min(max(int(request.GET.get("limit", 10)), 1), 50)
+    except ValueError:
+        limit = 10
+    return JsonResponse({"query": query, "results": global_search(query, request.user, limit)})